@@ -0,0 +1,50 @@
+# Время сверки выгрузки маркетплейса с проектами на синтетических данных с маленьким словарём,
+# где у названий много общих триграмм. Запуск из корня репозитория:
+# python benchmarks/bench_reconcile.py [число строк] [число проектов]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import RECONCILE_PROFILES, Reconciler
+
+WORDS = ["logo", "reveal", "glitch", "titles", "slideshow", "promo", "intro", "opener", "minimal", "clean",
+         "modern", "corporate", "photo", "lower", "thirds", "transitions", "text", "typography"]
+CATEGORIES = ["AET", "PPT", "MGT", "DR"]
+
+
+def main():
+    rows_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    names_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    rng = random.Random(1)
+    names = set()
+    while len(names) < names_count:
+        names.add(" ".join(rng.sample(WORDS, 3)) + f" {rng.randint(1, 99)}")
+    names = sorted(names)
+    projects = {name: {"year": 2024, "month": 1,
+                       "Envato": {category: {"status": "Not Uploaded", "date": "2024-01-01"}
+                                  for category in CATEGORIES}}
+                for name in names}
+    rows = []
+    for _ in range(rows_count):
+        title = rng.choice(names)
+        if rng.random() < 0.3:
+            # Опечатка: пропущенная буква
+            position = rng.randrange(len(title))
+            title = title[:position] + title[position + 1:]
+        rows.append((title, rng.choice(["Approved", "Pending", "Rejected"]), "After Effects"))
+
+    start = time.perf_counter()
+    reconciler = Reconciler(projects, {"Envato": CATEGORIES}, RECONCILE_PROFILES["Envato"])
+    built = time.perf_counter()
+    changes, unmatched = reconciler.propose("Envato", rows)
+    done = time.perf_counter()
+    print(f"Строк: {rows_count}, проектов: {names_count}")
+    print(f"Индекс: {(built - start) * 1000:.0f} мс, сверка: {(done - built) * 1000:.0f} мс")
+    print(f"Изменений: {len(changes)}, не сопоставлено: {len(unmatched)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# Время генерации HTML-отчётов: холодный прогон и повторный без изменений (всё из кэша).
+# Запуск из корня репозитория: python benchmarks/bench_reports.py [число месяцев] [проектов в месяце]
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import generate_reports
+
+PLATFORMS = {"Envato": ["AET", "PPT", "MGT"], "Pond5": ["AET"], "Adobe Stock": ["MGT"], "Motion Array": ["AET", "PPT"]}
+STATUS_COLORS = {"Uploaded": "#90EE90", "Not Uploaded": "#FFB6C1", "Pending": "#FFFFE0", "Rejected": "#FF6347"}
+
+
+def main():
+    months_count = int(sys.argv[1]) if len(sys.argv) > 1 else 72
+    per_month = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(1)
+    months = {}
+    for i in range(months_count):
+        year, month = 2019 + i // 12, i % 12 + 1
+        months[(year, month)] = {
+            f"Project {i}-{j}": {"year": year, "month": month,
+                                 **{platform: {category: {"status": rng.choice(list(STATUS_COLORS)),
+                                                          "date": f"{year}-{month:02d}-01"}
+                                               for category in categories}
+                                    for platform, categories in PLATFORMS.items()}}
+            for j in range(per_month)
+        }
+    with tempfile.TemporaryDirectory() as directory:
+        for label in ("Холодный прогон", "Повторный прогон"):
+            start = time.perf_counter()
+            rendered, total, errors = generate_reports(months, PLATFORMS, STATUS_COLORS, directory)
+            print(f"{label}: {time.perf_counter() - start:.2f} с, обновлено {rendered} из {total}, "
+                  f"ошибок {len(errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Сравнение бинарного снимка проектов с JSON (indent=4) на синтетических данных.
+# Запуск из корня репозитория: python benchmarks/bench_snapshot.py [число проектов]
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import ProjectSnapshot
+
+PLATFORMS = {"Envato": ["AET", "PPT", "MGT", "DR"], "Pond5": ["AET"], "Adobe Stock": ["MGT"],
+             "Motion Array": ["AET", "PPT"]}
+STATUSES = ["Not Uploaded", "Uploaded", "Pending", "Rejected"]
+
+
+def make_projects(count):
+    rng = random.Random(1)
+    projects = {}
+    for i in range(count):
+        project = {"year": rng.randint(2018, 2025), "month": rng.randint(1, 12)}
+        for platform, categories in PLATFORMS.items():
+            project[platform] = {category: {"status": rng.choice(STATUSES),
+                                            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+                                 for category in categories}
+        projects[f"Project {i}"] = project
+    return projects
+
+
+def measure(function, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    projects = make_projects(count)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "projects_data.json")
+        bin_path = os.path.join(directory, "projects_data.bin")
+
+        def save_json():
+            with open(json_path, "w", encoding='utf-8') as file:
+                json.dump(projects, file, ensure_ascii=False, indent=4)
+
+        def load_json():
+            with open(json_path, "r", encoding='utf-8') as file:
+                return json.load(file)
+
+        def load_snapshot():
+            with ProjectSnapshot(bin_path) as snapshot:
+                return snapshot.to_projects()
+
+        save_json_time = measure(save_json)
+        save_bin_time = measure(lambda: ProjectSnapshot.write(bin_path, projects))
+        load_json_time = measure(load_json)
+        load_bin_time = measure(load_snapshot)
+        assert load_snapshot() == projects
+        print(f"Проектов: {count}")
+        print(f"Сохранение: JSON {save_json_time * 1000:.1f} мс, снимок {save_bin_time * 1000:.1f} мс")
+        print(f"Загрузка:   JSON {load_json_time * 1000:.1f} мс, снимок {load_bin_time * 1000:.1f} мс")
+        print(f"Размер:     JSON {os.path.getsize(json_path)} байт, снимок {os.path.getsize(bin_path)} байт")
+
+
+if __name__ == "__main__":
+    main()
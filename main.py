@@ -2,22 +2,2250 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import tkinter.filedialog as fd
+import tkinter.simpledialog as sd
 import json
 import csv
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import os
+import shutil
+import tempfile
 import ast
-
+import bisect
+import struct
+import mmap
+import zlib
+import gc
+import sys
+import tracemalloc
+import unicodedata
+import hashlib
+import base64
+import html
+import io
+import multiprocessing
+import threading
+import queue
+import heapq
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from collections import Counter, OrderedDict, deque
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import numpy as np
 import matplotlib
 matplotlib.use('TkAgg')
 
+# Названия месяцев, под которыми старые версии сохраняли данные через %B
+MONTH_ALIASES = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "январь": 1, "февраль": 2, "март": 3, "апрель": 4, "май": 5, "июнь": 6,
+    "июль": 7, "август": 8, "сентябрь": 9, "октябрь": 10, "ноябрь": 11, "декабрь": 12,
+}
+
+
+def parse_month(value):
+    # Приводит месяц к числу 1..12 независимо от локали, в которой он был записан
+    if isinstance(value, int):
+        return value if 1 <= value <= 12 else None
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return parse_month(int(value))
+    month = MONTH_ALIASES.get(value.lower())
+    if month is not None:
+        return month
+    try:
+        return datetime.strptime(value, '%B').month
+    except ValueError:
+        return None
+
+
+def month_name(month):
+    return datetime(2000, month, 1).strftime('%B')
+
+
+def read_projects_csv(file_path, check_cancelled=None):
+    # Читает экспорт трекера. Возвращает (строки, отклонённые), где отклонённая строка —
+    # (номер строки файла, причина): без года или месяца проект нельзя показать в матрице
+    rows = []
+    rejected = []
+    with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            if check_cancelled and len(rows) % 1000 == 0:
+                check_cancelled()
+            try:
+                year = int(row['Year'])
+            except (TypeError, ValueError):
+                rejected.append((reader.line_num, f"неверный год '{row['Year']}'"))
+                continue
+            month = parse_month(row['Month'])
+            if month is None:
+                rejected.append((reader.line_num, f"неверный месяц '{row['Month']}'"))
+                continue
+            rows.append((row['Project'], year, month,
+                         row['Platform'], row['Category'], row['Status'], row['Date']))
+    return rows, rejected
+
+
+def migrate_months(projects):
+    # Миграция месяцев из строк %B в числа. Возвращает (были ли изменения, {проект: исходная строка})
+    # для месяцев, которые распознать не удалось: у них месяц сбрасывается в None
+    migrated = False
+    unparsed = {}
+    for name, project_data in projects.items():
+        month = project_data.get('month')
+        if isinstance(month, str):
+            project_data['month'] = parse_month(month)
+            if project_data['month'] is None and month.strip():
+                unparsed[name] = month
+            migrated = True
+    return migrated, unparsed
+
+
+class MonthIndex:
+    # Отсортированный индекс (год, месяц) -> множество имён проектов
+    def __init__(self):
+        self.keys = []
+        self.projects = {}
+
+    def rebuild(self, projects):
+        self.keys = []
+        self.projects = {}
+        for name, data in projects.items():
+            self.add(name, data.get('year'), data.get('month'))
+
+    def add(self, name, year, month):
+        if not year or not month:
+            return
+        key = (year, month)
+        names = self.projects.get(key)
+        if names is None:
+            names = self.projects[key] = set()
+            bisect.insort(self.keys, key)
+        names.add(name)
+
+    def remove(self, name, year, month):
+        key = (year, month)
+        names = self.projects.get(key)
+        if names is None:
+            return
+        names.discard(name)
+        if not names:
+            del self.projects[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def years(self):
+        years = []
+        for year, _ in reversed(self.keys):
+            if not years or years[-1] != year:
+                years.append(year)
+        return years
+
+    def months(self, year):
+        start = bisect.bisect_left(self.keys, (year, 0))
+        end = bisect.bisect_left(self.keys, (year + 1, 0))
+        return [month for _, month in reversed(self.keys[start:end])]
+
+
+class MonthOrder:
+    # Порядок проектов внутри месяца для постраничного показа: для каждого ключа сортировки
+    # отсортированный список ключей (…, проект). Изменение проекта переставляет только его.
+    SORTS = {"Название": "name", "Последнее изменение": "changed", "Не загружено": "pending"}
+
+    def __init__(self):
+        self.orders = {}
+        self.entries = {}
+
+    def rebuild(self, projects):
+        self.orders = {}
+        self.entries = {}
+        for project, project_data in projects.items():
+            month_key = (project_data.get('year'), project_data.get('month'))
+            if not all(month_key):
+                continue
+            keys = self.sort_keys(project, project_data)
+            self.entries[project] = (month_key, keys)
+            order = self.orders.setdefault(month_key, {sort: [] for sort in self.SORTS.values()})
+            for sort, key in keys.items():
+                order[sort].append(key)
+        for order in self.orders.values():
+            for keys in order.values():
+                keys.sort()
+        return self
+
+    @staticmethod
+    def sort_keys(project, project_data):
+        # Новые и требующие работы идут первыми, поэтому дата и счётчик хранятся со знаком минус
+        latest = 0
+        pending = 0
+        for platform, categories in project_data.items():
+            if platform in ['year', 'month']:
+                continue
+            for details in categories.values():
+                if details.get('status') != "Uploaded":
+                    pending += 1
+                try:
+                    latest = max(latest, int((details.get('date') or "").replace('-', '')[:8]))
+                except ValueError:
+                    pass
+        return {"name": (project,), "changed": (-latest, project), "pending": (-pending, project)}
+
+    def update_project(self, project, project_data):
+        month_key, keys = (None, {})
+        if project_data is not None:
+            month_key = (project_data.get('year'), project_data.get('month'))
+            if all(month_key):
+                keys = self.sort_keys(project, project_data)
+        old_month, old_keys = self.entries.pop(project, (None, {}))
+        if old_month == month_key and old_keys == keys:
+            if keys:
+                self.entries[project] = (month_key, keys)
+            return
+        if old_keys:
+            order = self.orders[old_month]
+            for sort, key in old_keys.items():
+                keys_list = order[sort]
+                del keys_list[bisect.bisect_left(keys_list, key)]
+            if not order["name"]:
+                del self.orders[old_month]
+        if keys:
+            order = self.orders.setdefault(month_key, {sort: [] for sort in self.SORTS.values()})
+            for sort, key in keys.items():
+                bisect.insort(order[sort], key)
+            self.entries[project] = (month_key, keys)
+
+    def page(self, year, month, sort, offset, limit, predicate=None):
+        # Возвращает (проекты страницы, всего подходящих). Без фильтра — срез списка,
+        # с фильтром — проход только по проектам этого месяца
+        order = self.orders.get((year, month))
+        if not order:
+            return [], 0
+        keys = order[sort]
+        if predicate is None:
+            end = offset + limit if limit else len(keys)
+            return [key[-1] for key in keys[offset:end]], len(keys)
+        matched = [key[-1] for key in keys if predicate(key[-1])]
+        end = offset + limit if limit else len(matched)
+        return matched[offset:end], len(matched)
+
+
+class StatusHistory:
+    # Журнал переходов статусов: записи фиксированной ширины дописываются в бинарный файл,
+    # а имена ячеек и статусов интернируются в отдельный файл строк
+    RECORD_DTYPE = np.dtype([('cell', '<u4'), ('from', 'u1'), ('to', 'u1'), ('time', '<u4')])
+    WEEK = 7 * 24 * 3600
+    # 1970-01-01 — четверг, сдвиг до понедельника
+    WEEK_OFFSET = 3 * 24 * 3600
+
+    def __init__(self, path="status_history.bin", names_path="status_history_names.jsonl", submit=None):
+        self.path = path
+        self.names_path = names_path
+        # Запись файлов: по умолчанию сразу, в приложении — через фоновую очередь ввода-вывода
+        self.submit = submit or self._write_now
+        self.cells = []
+        self.cell_ids = {}
+        self.statuses = [""]
+        self.status_ids = {"": 0}
+        self.records = np.zeros(0, dtype=self.RECORD_DTYPE)
+        self.pending = []
+        self.unwritten = []
+        self.unwritten_names = []
+        self.cell_order = None
+        self.time_order = None
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.names_path):
+                with open(self.names_path, "r", encoding='utf-8') as file:
+                    for line in file:
+                        if not line.strip():
+                            continue
+                        entry = json.loads(line)
+                        if entry[0] == "c":
+                            self.cell_ids[tuple(entry[1:])] = len(self.cells)
+                            self.cells.append(tuple(entry[1:]))
+                        else:
+                            self.status_ids[entry[1]] = len(self.statuses)
+                            self.statuses.append(entry[1])
+            if os.path.exists(self.path):
+                records = np.fromfile(self.path, dtype=self.RECORD_DTYPE)
+                # Отбрасываем записи, ссылающиеся на имена, которые не успели попасть в файл строк
+                valid = (records['cell'] < len(self.cells)) & \
+                        (records['from'] < len(self.statuses)) & (records['to'] < len(self.statuses))
+                self.records = records[valid]
+        except Exception as e:
+            print(f"Ошибка загрузки истории статусов: {e}")
+
+    def _intern(self, names, ids, key, entry, new_lines):
+        index = ids.get(key)
+        if index is None:
+            index = ids[key] = len(names)
+            names.append(key)
+            new_lines.append(json.dumps(entry, ensure_ascii=False))
+        return index
+
+    def record(self, project, platform, category, old_status, new_status, timestamp=None):
+        new_lines = []
+        cell = (project, platform, category)
+        cell_id = self._intern(self.cells, self.cell_ids, cell, ["c", *cell], new_lines)
+        from_id = self._intern(self.statuses, self.status_ids, old_status or "", ["s", old_status or ""], new_lines)
+        to_id = self._intern(self.statuses, self.status_ids, new_status, ["s", new_status], new_lines)
+
+        # Записи хранятся с настоящим временем в порядке поступления (часы могут идти назад,
+        # импорт приносит прошлые даты); порядок по времени строится при запросах
+        timestamp = max(int(timestamp if timestamp is not None else datetime.now().timestamp()), 0)
+        record = (cell_id, from_id, to_id, timestamp)
+        self.pending.append(record)
+        self.unwritten.append(record)
+        self.unwritten_names.extend(new_lines)
+
+    @staticmethod
+    def _write_now(write):
+        try:
+            write()
+        except Exception as e:
+            print(f"Ошибка записи истории статусов: {e}")
+
+    def flush(self):
+        # Дописывает накопленные записи в конец файлов; сам файл никогда не переписывается
+        if not self.unwritten:
+            return
+        names = self.unwritten_names
+        data = np.array(self.unwritten, dtype=self.RECORD_DTYPE).tobytes()
+        self.unwritten_names = []
+        self.unwritten = []
+
+        def write():
+            if names:
+                with open(self.names_path, "a", encoding='utf-8') as file:
+                    file.write("\n".join(names) + "\n")
+            with open(self.path, "ab") as file:
+                file.write(data)
+
+        self.submit(write)
+
+    def rename_platforms(self, mapping):
+        # Переименование платформ переписывает только небольшой файл строк, записи не меняются.
+        # Отображение старое имя -> новое применяется за один проход, поэтому обмен именами
+        # и цепочки переименований не смешивают ячейки разных платформ. Имя None помечает ячейки
+        # удалённой платформы: их записи остаются в файле, но ни к одной платформе больше не относятся
+        self.flush()
+        self.cells = [(project, mapping.get(platform, platform), category)
+                      for project, platform, category in self.cells]
+        self.cell_ids = {cell: index for index, cell in enumerate(self.cells)}
+        lines = [json.dumps(["s", status], ensure_ascii=False) for status in self.statuses[1:]]
+        lines += [json.dumps(["c", *cell], ensure_ascii=False) for cell in self.cells]
+        data = ("\n".join(lines) + "\n" if lines else "").encode('utf-8')
+        self.submit(lambda: write_file_atomic(self.names_path, data))
+
+    def _columns(self):
+        if self.pending:
+            self.records = np.concatenate([self.records, np.array(self.pending, dtype=self.RECORD_DTYPE)])
+            self.pending = []
+            self.cell_order = None
+            self.time_order = None
+        return self.records
+
+    def _by_time(self):
+        records = self._columns()
+        if self.time_order is None:
+            self.time_order = np.argsort(records['time'], kind='stable')
+        return records[self.time_order]
+
+    def _by_cell(self):
+        # Записи, сгруппированные по ячейке, внутри ячейки — по времени
+        records = self._columns()
+        if self.cell_order is None:
+            self.cell_order = np.lexsort((records['time'], records['cell']))
+        return records[self.cell_order]
+
+    def _time_slice(self, records, start=None, end=None):
+        # records упорядочены по времени, поэтому диапазон ищется бинарным поиском
+        times = records['time']
+        lo = 0 if start is None else int(np.searchsorted(times, int(start.timestamp()), side='left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, int(end.timestamp()), side='left'))
+        return lo, hi
+
+    def _platform_mask(self, cell_column, platform):
+        cell_platforms = np.array([cell[1] == platform for cell in self.cells], dtype=bool)
+        return cell_platforms[cell_column]
+
+    def cell_history(self, project, platform, category):
+        cell_id = self.cell_ids.get((project, platform, category))
+        if cell_id is None:
+            return []
+        ordered = self._by_cell()
+        lo = np.searchsorted(ordered['cell'], cell_id, side='left')
+        hi = np.searchsorted(ordered['cell'], cell_id, side='right')
+        return [(self.statuses[r['from']] or None, self.statuses[r['to']], datetime.fromtimestamp(int(r['time'])))
+                for r in ordered[lo:hi]]
+
+    def time_in_status(self, status, platform=None, start=None, end=None, now=None):
+        # Длительности (в секундах) пребывания ячеек в статусе, для входов в статус в диапазоне времени.
+        # Если ячейка всё ещё в статусе, интервал закрывается моментом now
+        status_id = self.status_ids.get(status)
+        if status_id is None or not len(self._columns()):
+            return np.zeros(0, dtype=np.int64)
+        ordered = self._by_cell()
+        times = ordered['time'].astype(np.int64)
+        leave = np.empty_like(times)
+        leave[:-1] = times[1:]
+        last_in_cell = np.ones(len(ordered), dtype=bool)
+        last_in_cell[:-1] = ordered['cell'][:-1] != ordered['cell'][1:]
+        leave[last_in_cell] = int((now or datetime.now()).timestamp())
+        mask = ordered['to'] == status_id
+        if start is not None:
+            mask &= times >= int(start.timestamp())
+        if end is not None:
+            mask &= times < int(end.timestamp())
+        if platform is not None:
+            mask &= self._platform_mask(ordered['cell'], platform)
+        return np.maximum(leave[mask] - times[mask], 0)
+
+    def transitions_per_week(self, to_status=None, platform=None, start=None, end=None):
+        records = self._by_time()
+        lo, hi = self._time_slice(records, start, end)
+        records = records[lo:hi]
+        if to_status is not None:
+            records = records[records['to'] == self.status_ids.get(to_status, -1)]
+        if platform is not None:
+            records = records[self._platform_mask(records['cell'], platform)]
+        if not len(records):
+            return {}
+        weeks = (records['time'].astype(np.int64) + self.WEEK_OFFSET) // self.WEEK
+        first = int(weeks.min())
+        counts = np.bincount(weeks - first)
+        return {datetime.fromtimestamp((first + i) * self.WEEK - self.WEEK_OFFSET).date(): int(count)
+                for i, count in enumerate(counts) if count}
+
+
+def write_file_atomic(path, data):
+    # Запись во временный файл и атомарная замена: при сбое остаётся прежняя версия
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+class ProjectSnapshot:
+    # Бинарный снимок проектов: заголовок с версией и CRC32, таблицы строк хранятся один раз,
+    # проекты и ячейки — упакованные записи фиксированной ширины. Файл читается через mmap
+    # и декодируется целыми столбцами.
+    # Версия 2: даты вынесены из общей таблицы строк в отдельную таблицу с 32-битными кодами,
+    # иначе несколько десятков тысяч различных дат переполняли 16-битные коды.
+    MAGIC = b'STPS'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHII')
+    COUNTS = {1: struct.Struct('<IIII'), 2: struct.Struct('<IIIII')}
+    PROJECT_DTYPE = np.dtype([('year', '<u2'), ('month', 'u1'), ('flags', 'u1'), ('first', '<u4'), ('count', '<u4')])
+    CELL_DTYPES = {
+        1: np.dtype([('platform', '<u2'), ('category', '<u2'), ('status', '<u2'), ('date', '<u2')]),
+        2: np.dtype([('platform', '<u2'), ('category', '<u2'), ('status', '<u2'), ('date', '<u4')]),
+    }
+    NONE = 0xFFFF
+    DATE_NONE = 0xFFFFFFFF
+
+    def __init__(self, path, verify=True):
+        self.file = open(path, "rb")
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError("Пустой файл снимка")
+        try:
+            self._parse(verify)
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self, verify):
+        if len(self.buffer) < self.HEADER.size:
+            raise ValueError("Файл снимка обрезан")
+        magic, version, _, size, crc = self.HEADER.unpack_from(self.buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Неизвестный формат снимка")
+        if version not in self.COUNTS:
+            raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+        if self.HEADER.size + size != len(self.buffer):
+            raise ValueError("Файл снимка обрезан")
+        if verify:
+            with memoryview(self.buffer) as view, view[self.HEADER.size:] as payload:
+                if zlib.crc32(payload) != crc:
+                    raise ValueError("Контрольная сумма снимка не совпадает")
+
+        offset = self.HEADER.size
+        counts = self.COUNTS[version]
+        if len(self.buffer) < offset + counts.size:
+            raise ValueError("Файл снимка обрезан")
+        if version == 1:
+            n_names, n_symbols, n_projects, n_cells = counts.unpack_from(self.buffer, offset)
+            n_dates = 0
+        else:
+            n_names, n_symbols, n_dates, n_projects, n_cells = counts.unpack_from(self.buffer, offset)
+        offset += counts.size
+        self.name_offsets = np.frombuffer(self.buffer, dtype='<u4', count=n_names + 1, offset=offset)
+        offset += self.name_offsets.nbytes
+        self.symbol_offsets = np.frombuffer(self.buffer, dtype='<u4', count=n_symbols + 1, offset=offset)
+        offset += self.symbol_offsets.nbytes
+        if version >= 2:
+            self.date_offsets = np.frombuffer(self.buffer, dtype='<u4', count=n_dates + 1, offset=offset)
+            offset += self.date_offsets.nbytes
+        self.project_table = np.frombuffer(self.buffer, dtype=self.PROJECT_DTYPE, count=n_projects, offset=offset)
+        offset += self.project_table.nbytes
+        self.cells = np.frombuffer(self.buffer, dtype=self.CELL_DTYPES[version], count=n_cells, offset=offset)
+        offset += self.cells.nbytes
+        self.names_start = offset
+        self.symbols_start = offset + int(self.name_offsets[-1])
+        self.symbols = self._strings(self.symbols_start, self.symbol_offsets)
+        if version >= 2:
+            self.dates = self._strings(self.symbols_start + int(self.symbol_offsets[-1]), self.date_offsets)
+        else:
+            # В версии 1 даты кодировались общей таблицей строк
+            self.dates = self.symbols
+        self._names = None
+
+    def _strings(self, start, offsets):
+        blob = self.buffer[start:start + int(offsets[-1])]
+        bounds = offsets.tolist()
+        return [blob[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)]
+
+    def close(self):
+        # Массивы numpy держат ссылки на mmap, их нужно отпустить до закрытия
+        self.name_offsets = self.symbol_offsets = self.date_offsets = self.project_table = self.cells = None
+        if getattr(self, 'buffer', None) is not None:
+            self.buffer.close()
+            self.buffer = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.project_table)
+
+    def names(self):
+        if self._names is None:
+            self._names = self._strings(self.names_start, self.name_offsets)
+        return self._names
+
+    @staticmethod
+    def _lookup(column, strings):
+        # Коды переводятся в строки целыми столбцами; максимальный код столбца (NONE) превращается в None
+        codes = np.where(column == np.iinfo(column.dtype).max, len(strings), column)
+        return list(map((strings + [None]).__getitem__, codes.tolist()))
+
+    @staticmethod
+    def _decode(year, month, platforms, categories, statuses, dates, first, count):
+        data = {'year': year or None, 'month': month or None}
+        end = first + count
+        for platform, category, status, date in zip(platforms[first:end], categories[first:end],
+                                                    statuses[first:end], dates[first:end]):
+            platform_data = data.get(platform)
+            if platform_data is None:
+                platform_data = data[platform] = {}
+            if category is not None:
+                platform_data[category] = {"status": status, "date": date}
+        return data
+
+    def to_projects(self):
+        platforms = self._lookup(self.cells['platform'], self.symbols)
+        categories = self._lookup(self.cells['category'], self.symbols)
+        statuses = self._lookup(self.cells['status'], self.symbols)
+        dates = self._lookup(self.cells['date'], self.dates)
+        # Сборщик мусора отключается на время создания множества мелких словарей без циклов
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return {
+                name: self._decode(year, month, platforms, categories, statuses, dates, first, count)
+                for name, (year, month, _, first, count) in zip(self.names(), self.project_table.tolist())
+            }
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    @staticmethod
+    def _pack_strings(strings):
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return offsets, b''.join(encoded)
+
+    @classmethod
+    def write(cls, path, projects):
+        write_file_atomic(path, cls.encode(projects))
+
+    @classmethod
+    def encode(cls, projects):
+        symbol_ids = {}
+        symbols = []
+        date_ids = {}
+        date_strings = []
+
+        def intern(value, ids=symbol_ids, strings=symbols):
+            index = ids.get(value)
+            if index is None:
+                index = ids[value] = len(strings)
+                strings.append(value)
+            return index
+
+        names = list(projects.keys())
+        project_table = np.zeros(len(names), dtype=cls.PROJECT_DTYPE)
+        platforms, categories, statuses, dates = [], [], [], []
+        for i, name in enumerate(names):
+            project_data = projects[name]
+            project_table[i] = (project_data.get('year') or 0, project_data.get('month') or 0, 0,
+                                len(platforms), 0)
+            for platform, platform_data in project_data.items():
+                if platform in ['year', 'month']:
+                    continue
+                platform_id = intern(platform)
+                if not platform_data:
+                    # Пустая платформа сохраняется маркером без категории
+                    platforms.append(platform_id)
+                    categories.append(cls.NONE)
+                    statuses.append(cls.NONE)
+                    dates.append(cls.DATE_NONE)
+                for category, details in platform_data.items():
+                    platforms.append(platform_id)
+                    categories.append(intern(category))
+                    status = details.get('status')
+                    statuses.append(intern(status) if status is not None else cls.NONE)
+                    date = details.get('date')
+                    dates.append(intern(date, date_ids, date_strings) if date is not None else cls.DATE_NONE)
+            project_table[i]['count'] = len(platforms) - project_table[i]['first']
+        if len(symbols) >= cls.NONE:
+            raise ValueError("Слишком много различных строк для снимка")
+
+        cells = np.zeros(len(platforms), dtype=cls.CELL_DTYPES[cls.VERSION])
+        cells['platform'] = platforms
+        cells['category'] = categories
+        cells['status'] = statuses
+        cells['date'] = dates
+
+        name_offsets, name_blob = cls._pack_strings(names)
+        symbol_offsets, symbol_blob = cls._pack_strings(symbols)
+        date_offsets, date_blob = cls._pack_strings(date_strings)
+        payload = b''.join([
+            cls.COUNTS[cls.VERSION].pack(len(names), len(symbols), len(date_strings), len(names), len(cells)),
+            name_offsets.tobytes(), symbol_offsets.tobytes(), date_offsets.tobytes(),
+            project_table.tobytes(), cells.tobytes(),
+            name_blob, symbol_blob, date_blob
+        ])
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(payload), zlib.crc32(payload))
+        return header + payload
+
+
+def normalize_name(name):
+    # Регистр, диакритика и пунктуация не влияют на сравнение названий
+    name = unicodedata.normalize('NFKD', name).casefold()
+    name = ''.join(ch if ch.isalnum() else ' ' for ch in name if not unicodedata.combining(ch))
+    return ' '.join(name.split())
+
+
+class NameIndex:
+    # Индекс названий проектов: точные совпадения по нормализованному имени
+    # и инвертированный индекс триграмм для нечёткого поиска кандидатов
+    MAX_POSTING = 1000
+    PROBE_GRAMS = 6
+
+    def __init__(self, names=()):
+        self.exact = {}
+        self.grams = {}
+        self.name_grams = {}
+        self.name_tokens = {}
+        for name in names:
+            self.add(name)
+
+    @staticmethod
+    def trigrams(normalized):
+        padded = f"  {normalized} "
+        return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    def add(self, name):
+        if name in self.name_grams:
+            return
+        normalized = normalize_name(name)
+        grams = self.trigrams(normalized)
+        self.name_grams[name] = grams
+        self.name_tokens[name] = frozenset(normalized.split())
+        self.exact.setdefault(normalized, set()).add(name)
+        for gram in grams:
+            self.grams.setdefault(gram, set()).add(name)
+
+    def remove(self, name):
+        grams = self.name_grams.pop(name, None)
+        if grams is None:
+            return
+        del self.name_tokens[name]
+        normalized = normalize_name(name)
+        self.exact[normalized].discard(name)
+        if not self.exact[normalized]:
+            del self.exact[normalized]
+        for gram in grams:
+            self.grams[gram].discard(name)
+            if not self.grams[gram]:
+                del self.grams[gram]
+
+    @staticmethod
+    def similarity(grams_a, grams_b):
+        if not grams_a or not grams_b:
+            return 0.0
+        return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+    def _candidates(self, grams, candidates, probes=None):
+        # Кандидаты набираются по самым редким триграммам: частые почти не различают
+        # названия, а их списки самые длинные
+        postings = sorted((self.grams[gram] for gram in grams if gram in self.grams), key=len)
+        counts = Counter()
+        for posting in postings[:probes or max(self.PROBE_GRAMS, len(postings) // 2)]:
+            if len(posting) > self.MAX_POSTING:
+                break
+            counts.update(posting)
+        return [name for name, _ in counts.most_common(candidates)]
+
+    def lookup(self, title, threshold=0.6, limit=1, candidates=20):
+        # Возвращает до limit пар (имя, сходство), лучшие первыми
+        normalized = normalize_name(title)
+        exact = self.exact.get(normalized)
+        if exact:
+            return [(name, 1.0) for name in sorted(exact)[:limit]]
+
+        grams = self.trigrams(normalized)
+        scored = []
+        for name in self._candidates(grams, candidates):
+            score = self.similarity(grams, self.name_grams[name])
+            if score >= threshold:
+                scored.append((name, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def _features(self, name):
+        if name in self.name_grams:
+            return self.name_grams[name], self.name_tokens[name]
+        normalized = normalize_name(name)
+        return self.trigrams(normalized), frozenset(normalized.split())
+
+    def duplicate_score(self, name_a, name_b):
+        # Сходство триграмм или вложенность слов: "Glitch Logo" входит в "Glitch Logo Reveal v2".
+        # Вложенность никогда не даёт 1.0: чем больше лишних слов у длинного названия, тем ниже
+        # оценка, так что "Logo Reveal" не равен каждому "... Logo Reveal"
+        grams_a, tokens_a = self._features(name_a)
+        grams_b, tokens_b = self._features(name_b)
+        score = self.similarity(grams_a, grams_b)
+        shorter, longer = sorted((len(tokens_a), len(tokens_b)))
+        if shorter >= 2:
+            containment = len(tokens_a & tokens_b) / shorter
+            score = max(score, containment * (0.6 + 0.3 * shorter / longer))
+        return score
+
+    def similar(self, title, threshold=0.75, limit=5, candidates=20):
+        # Похожие на title названия, кроме самого title; для предупреждений при добавлении
+        grams = self.trigrams(normalize_name(title))
+        scored = [(name, self.duplicate_score(title, name))
+                  for name in self._candidates(grams, candidates) if name != title]
+        scored = [item for item in scored if item[1] >= threshold]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def duplicates(self, threshold=0.75, candidates=10):
+        # Группы похожих названий: [(названия группы, {(a, b): сходство})], крупные первыми.
+        # Каждое имя сравнивается только с кандидатами по нескольким редким триграммам,
+        # поэтому работа растёт почти линейно с числом проектов. У дубликата общих триграмм
+        # большинство, так что хотя бы одна из самых редких почти наверняка общая
+        pairs = {}
+        for name, grams in self.name_grams.items():
+            for other in self._candidates(grams, candidates + 1, probes=self.PROBE_GRAMS):
+                if other == name:
+                    continue
+                key = (name, other) if name < other else (other, name)
+                if key not in pairs:
+                    score = self.duplicate_score(name, other)
+                    pairs[key] = score if score >= threshold else None
+
+        # Группы — клики: название входит в группу, только если похоже на каждого её участника.
+        # Пары просматриваются от самых похожих, каждое название попадает не больше чем в одну
+        # группу, поэтому цепочка A~B~C не склеивает непохожие A и C
+        edges = {key: score for key, score in pairs.items() if score is not None}
+        group_of = {}
+        groups = []
+        for (name_a, name_b), score in sorted(edges.items(), key=lambda item: (-item[1], item[0])):
+            group_a, group_b = group_of.get(name_a), group_of.get(name_b)
+            if group_a is not None and group_b is not None:
+                continue
+            if group_a is None and group_b is None:
+                group = ([name_a, name_b], {(name_a, name_b): score})
+                groups.append(group)
+                group_of[name_a] = group_of[name_b] = group
+                continue
+            group, name = (group_a, name_b) if group_a is not None else (group_b, name_a)
+            links = {}
+            for member in group[0]:
+                key = (name, member) if name < member else (member, name)
+                if key not in pairs:
+                    # Пару могли не сравнить: кандидаты набираются только по редким триграммам
+                    score = self.duplicate_score(name, member)
+                    pairs[key] = score if score >= threshold else None
+                if pairs[key] is None:
+                    break
+                links[key] = pairs[key]
+            else:
+                group[0].append(name)
+                group[1].update(links)
+                group_of[name] = group
+        result = [(sorted(names), group_pairs) for names, group_pairs in groups]
+        result.sort(key=lambda item: (-len(item[0]), item[0]))
+        return result
+
+
+# Профили сопоставления столбцов для выгрузок маркетплейсов. Любой профиль можно
+# переопределить или добавить в reconcile_profiles.json рядом с данными.
+RECONCILE_PROFILES = {
+    "Adobe Stock": {
+        "title": ["Title", "Original Name", "Name"],
+        "status": ["Status"],
+        "category": [],
+        "status_map": {"approved": "Uploaded", "accepted": "Uploaded", "published": "Uploaded",
+                       "rejected": "Rejected", "not accepted": "Rejected",
+                       "in review": "Pending", "under review": "Pending", "pending": "Pending"}
+    },
+    "Envato": {
+        "title": ["Item Name", "Name", "Title"],
+        "status": ["Status", "Item Status"],
+        "category": ["Category", "Item Type"],
+        "status_map": {"approved": "Uploaded", "live": "Uploaded", "published": "Uploaded",
+                       "soft rejected": "Rejected", "hard rejected": "Rejected", "rejected": "Rejected",
+                       "pending": "Pending", "awaiting review": "Pending", "in review": "Pending"}
+    },
+    "Pond5": {
+        "title": ["Title", "Item Title"],
+        "status": ["Status"],
+        "category": [],
+        "status_map": {"online": "Uploaded", "approved": "Uploaded", "for sale": "Uploaded",
+                       "rejected": "Rejected", "declined": "Rejected",
+                       "pending": "Pending", "in review": "Pending", "processing": "Pending"}
+    },
+    "Motion Array": {
+        "title": ["Title", "Name"],
+        "status": ["Status"],
+        "category": ["Category", "Type"],
+        "status_map": {"approved": "Uploaded", "published": "Uploaded",
+                       "rejected": "Rejected", "pending": "Pending", "in review": "Pending"}
+    }
+}
+
+# Общие соответствия значений столбца категории кодам категорий
+CATEGORY_ALIASES = {
+    "after effects": "AET", "after effects template": "AET", "after effects project": "AET",
+    "premiere pro": "PPT", "premiere pro template": "PPT",
+    "after effects fx": "AEFX", "after effects preset": "AEFX",
+    "premiere pro fx": "PPFX", "premiere pro preset": "PPFX",
+    "motion graphics template": "MGT", "motion graphics": "MGT", "mogrt": "MGT",
+    "davinci resolve": "DRT", "davinci template": "DRT", "davinci resolve template": "DRT",
+    "davinci macros": "DRM", "davinci resolve macro": "DRM",
+    "final cut pro": "FCPX", "final cut pro x": "FCPX", "apple motion": "FCPX"
+}
+
+
+def load_reconcile_profiles(path="reconcile_profiles.json"):
+    profiles = {platform: dict(profile) for platform, profile in RECONCILE_PROFILES.items()}
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding='utf-8') as file:
+                for platform, profile in json.load(file).items():
+                    profiles[platform] = {**profiles.get(platform, {}), **profile}
+    except Exception as e:
+        print(f"Ошибка загрузки профилей сверки: {e}")
+    return profiles
+
+
+def read_marketplace_export(file_path, profile):
+    # Читает выгрузку маркетплейса в список (название, статус, категория) по профилю
+    with open(file_path, "r", newline='', encoding='utf-8-sig') as csvfile:
+        sample = csvfile.read(8192)
+        csvfile.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(csvfile, dialect=dialect)
+        headers = {header.strip().casefold(): header for header in reader.fieldnames or []}
+
+        def pick(candidates):
+            for candidate in candidates:
+                if candidate.casefold() in headers:
+                    return headers[candidate.casefold()]
+            return None
+
+        title_column = pick(profile.get("title", []))
+        if title_column is None:
+            raise ValueError(f"В файле нет столбца с названием ({', '.join(profile.get('title', []))})")
+        status_column = pick(profile.get("status", []))
+        category_column = pick(profile.get("category", []))
+
+        rows = []
+        for row in reader:
+            title = (row.get(title_column) or "").strip()
+            if not title:
+                continue
+            status = (row.get(status_column) or "").strip() if status_column else ""
+            category = (row.get(category_column) or "").strip() if category_column else ""
+            rows.append((title, status, category))
+        return rows
+
+
+class Reconciler:
+    # Сопоставляет строки выгрузки маркетплейса с проектами и предлагает изменения статусов
+    def __init__(self, projects, platform_categories, profile):
+        self.projects = projects
+        self.platform_categories = platform_categories
+        self.profile = profile
+        self.status_map = {key.casefold(): value for key, value in profile.get("status_map", {}).items()}
+        self.category_map = {key.casefold(): value for key, value in
+                              {**CATEGORY_ALIASES, **profile.get("category_map", {})}.items()}
+        self.index = NameIndex(projects.keys())
+
+    def map_status(self, value):
+        # Без столбца статуса наличие строки в портфолио означает, что ассет загружен
+        if not value:
+            return "Uploaded"
+        return self.status_map.get(value.casefold())
+
+    def map_category(self, value, categories, cells):
+        # cells — ячейки проекта на платформе. Без столбца категории строка однозначна,
+        # только если у проекта одна рабочая ячейка; иначе её разрешает пользователь
+        if not value:
+            existing = [category for category in categories
+                        if category in cells and cells[category].get('status') != "Disabled"]
+            return existing if len(existing) == 1 else []
+        code = value.upper() if value.upper() in categories else self.category_map.get(value.casefold())
+        return [code] if code in categories else []
+
+    def propose(self, platform, rows, threshold=0.8):
+        # Возвращает (изменения, несопоставленные названия); изменение —
+        # (проект, категория, текущий статус, новый статус, название в файле, сходство)
+        categories = self.platform_categories[platform]
+        matches = {}
+        proposals = {}
+        unmatched = []
+        for title, status_value, category_value in rows:
+            status = self.map_status(status_value)
+            if status is None:
+                continue
+            normalized = normalize_name(title)
+            if normalized not in matches:
+                found = self.index.lookup(title, threshold=threshold)
+                matches[normalized] = found[0] if found else None
+            match = matches[normalized]
+            if match is None:
+                unmatched.append(title)
+                continue
+            project, score = match
+            mapped = self.map_category(category_value, categories, self.projects[project].get(platform, {}))
+            if not mapped:
+                unmatched.append(title)
+            for category in mapped:
+                proposals[(project, category)] = (status, title, score)
+
+        changes = []
+        for (project, category), (status, title, score) in sorted(proposals.items()):
+            cell = self.projects[project].get(platform, {}).get(category)
+            # Несуществующие и отключённые вручную ячейки сверка не трогает
+            if cell is None:
+                continue
+            current = cell.get('status')
+            if current == status or current == "Disabled":
+                continue
+            changes.append((project, category, current, status, title, score))
+        return changes, unmatched
+
+
+class SchemaMigration:
+    # Набор изменений схемы платформ, применяемый ко всем проектам за один проход.
+    # Операции сразу проверяются на рабочей копии схемы, исходные данные не меняются до apply.
+    def __init__(self, platform_categories, platform_colors):
+        self.platform_categories = {platform: list(categories) for platform, categories in platform_categories.items()}
+        self.platform_colors = dict(platform_colors)
+        # Текущее имя платформы -> исходное имя (None для новых платформ)
+        self.origins = {platform: platform for platform in platform_categories}
+        self.removed_categories = {}
+        self.operations = []
+
+    def _require(self, platform):
+        if platform not in self.platform_categories:
+            raise ValueError(f"Платформа '{platform}' не существует.")
+
+    def add_platform(self, name, categories, color):
+        if not name:
+            raise ValueError("Название платформы не может быть пустым.")
+        if name in self.platform_categories:
+            raise ValueError("Платформа уже существует.")
+        if not categories:
+            raise ValueError("Необходимо выбрать хотя бы одну категорию.")
+        self.platform_categories[name] = list(categories)
+        self.platform_colors[name] = color
+        self.origins[name] = None
+        self.operations.append(f"+ {name}")
+
+    def rename_platform(self, old_name, new_name):
+        self._require(old_name)
+        if not new_name:
+            raise ValueError("Название платформы не может быть пустым.")
+        if new_name in self.platform_categories:
+            raise ValueError("Платформа уже существует.")
+        # Переименование сохраняет позицию платформы в порядке
+        self.platform_categories = {new_name if platform == old_name else platform: categories
+                                    for platform, categories in self.platform_categories.items()}
+        self.platform_colors[new_name] = self.platform_colors.pop(old_name, "#FFFFFF")
+        self.origins[new_name] = self.origins.pop(old_name)
+        if old_name in self.removed_categories:
+            self.removed_categories[new_name] = self.removed_categories.pop(old_name)
+        self.operations.append(f"{old_name} → {new_name}")
+
+    def remove_platform(self, name):
+        self._require(name)
+        del self.platform_categories[name]
+        self.platform_colors.pop(name, None)
+        self.origins.pop(name)
+        self.removed_categories.pop(name, None)
+        self.operations.append(f"− {name}")
+
+    def move_platform(self, name, offset):
+        self._require(name)
+        order = list(self.platform_categories)
+        index = order.index(name)
+        new_index = min(max(index + offset, 0), len(order) - 1)
+        if new_index == index:
+            return
+        order.insert(new_index, order.pop(index))
+        self.platform_categories = {platform: self.platform_categories[platform] for platform in order}
+        self.operations.append(f"{name} {'↑' if offset < 0 else '↓'}")
+
+    def set_color(self, name, color):
+        self._require(name)
+        self.platform_colors[name] = color
+        self.operations.append(f"{name}: {color}")
+
+    def add_category(self, platform, category):
+        self._require(platform)
+        if category in self.platform_categories[platform]:
+            raise ValueError(f"Категория {category} уже есть у платформы {platform}.")
+        self.platform_categories[platform].append(category)
+        self.removed_categories.get(platform, set()).discard(category)
+        self.operations.append(f"{platform} + {category}")
+
+    def remove_category(self, platform, category):
+        self._require(platform)
+        if category not in self.platform_categories[platform]:
+            raise ValueError(f"У платформы {platform} нет категории {category}.")
+        if len(self.platform_categories[platform]) == 1:
+            raise ValueError("У платформы должна остаться хотя бы одна категория.")
+        self.platform_categories[platform].remove(category)
+        self.removed_categories.setdefault(platform, set()).add(category)
+        self.operations.append(f"{platform} − {category}")
+
+    def platform_mapping(self):
+        # Исходное имя -> итоговое; удалённые платформы в отображение не попадают
+        return {origin: platform for platform, origin in self.origins.items() if origin is not None}
+
+    def removed_platforms(self, original_platforms):
+        mapping = self.platform_mapping()
+        return [platform for platform in original_platforms if platform not in mapping]
+
+    def apply_to_projects(self, projects, original_platforms, added=None):
+        # Один проход по всем проектам: переименование ключей, удаление платформ и категорий,
+        # добавление недостающих категорий со статусом "Not Uploaded". В список added
+        # попадают (проект, платформа, категория) добавленных ячеек — для истории статусов
+        mapping = self.platform_mapping()
+        removed = set(self.removed_platforms(original_platforms))
+        today = datetime.now().strftime("%Y-%m-%d")
+        migrated = {}
+        for name, project_data in projects.items():
+            new_data = {}
+            for key, value in project_data.items():
+                if key in ['year', 'month']:
+                    new_data[key] = value
+                    continue
+                if key in removed:
+                    continue
+                platform = mapping.get(key, key)
+                dropped = self.removed_categories.get(platform, ())
+                categories = {category: details for category, details in value.items() if category not in dropped}
+                for category in self.platform_categories.get(platform, ()):
+                    if category not in categories:
+                        categories[category] = {"status": "Not Uploaded", "date": today}
+                        if added is not None:
+                            added.append((name, platform, category))
+                new_data[platform] = categories
+            migrated[name] = new_data
+        return migrated
+
+
+def aggregate_status(counts, total):
+    # Сводный статус платформы по числу категорий в каждом статусе
+    if counts["Uploaded"] == total:
+        return "Uploaded"
+    if counts["Rejected"]:
+        return "Rejected"
+    if counts["Pending"]:
+        return "Pending"
+    if counts["Disabled"] == total:
+        return "Disabled"
+    return "Not Uploaded"
+
+
+REPORT_VERSION = 1
+
+
+def _report_chart(platform_counts, platforms, status_colors):
+    # Горизонтальная диаграмма с накоплением: число категорий каждого статуса по платформам
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(8, 0.4 * len(platforms) + 1.2), dpi=100)
+    axes = figure.add_subplot(111)
+    left = [0] * len(platforms)
+    for status, color in status_colors.items():
+        values = [platform_counts[platform][status] for platform in platforms]
+        axes.barh(platforms, values, left=left, color=color, edgecolor="#808080", label=status)
+        left = [a + b for a, b in zip(left, values)]
+    axes.invert_yaxis()
+    axes.legend(loc="lower right", fontsize=7)
+    axes.tick_params(labelsize=8)
+    figure.tight_layout()
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def render_month_report(job):
+    # Выполняется в отдельном процессе: строит HTML-отчёт за один месяц
+    year, month = job["year"], job["month"]
+    projects = job["projects"]
+    platform_categories = job["platform_categories"]
+    status_colors = job["status_colors"]
+    platforms = [platform for platform in platform_categories
+                 if any(platform in project_data for project_data in projects.values())]
+
+    platform_counts = {platform: Counter() for platform in platforms}
+    rows = []
+    for name in sorted(projects):
+        project_data = projects[name]
+        cells = []
+        for platform in platforms:
+            if platform not in project_data:
+                cells.append("<td></td>")
+                continue
+            categories = platform_categories[platform]
+            counts = Counter(project_data[platform].get(category, {}).get("status", "Not Uploaded")
+                             for category in categories)
+            platform_counts[platform].update(counts)
+            status = aggregate_status(counts, len(categories))
+            cells.append(f'<td style="background:{status_colors.get(status, "#FFFFFF")}" title="{status}"></td>')
+        rows.append(f"<tr><td>{html.escape(name)}</td>{''.join(cells)}</tr>")
+
+    summary_rows = []
+    for platform in platforms:
+        counts = "".join(f"<td>{platform_counts[platform][status]}</td>" for status in status_colors)
+        summary_rows.append(f"<tr><td>{html.escape(platform)}</td>{counts}</tr>")
+
+    chart = _report_chart(platform_counts, platforms, status_colors) if platforms else ""
+    title = f"{month_name(month)} {year}"
+    page = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>body{{font-family:Arial,sans-serif;font-size:13px}} table{{border-collapse:collapse;margin:10px 0}}
+td,th{{border:1px solid #ccc;padding:2px 6px}} td[title]{{min-width:18px}}</style></head>
+<body><p><a href="index.html">← Все месяцы</a></p>
+<h1>{html.escape(title)}</h1>
+<p>Проектов: {len(projects)}</p>
+{f'<img src="data:image/png;base64,{chart}" alt="Статусы по платформам">' if chart else ''}
+<h2>Статусы по платформам</h2>
+<table><tr><th>Платформа</th>{"".join(f"<th>{html.escape(status)}</th>" for status in status_colors)}</tr>
+{"".join(summary_rows)}</table>
+<h2>Проекты</h2>
+<table><tr><th>Проект</th>{"".join(f"<th>{html.escape(platform)}</th>" for platform in platforms)}</tr>
+{"".join(rows)}</table>
+</body></html>
+"""
+    with open(job["path"], "w", encoding="utf-8") as file:
+        file.write(page)
+    return year, month
+
+
+def report_hash(month_projects, platform_categories, status_colors):
+    # Порядок платформ, категорий и статусов задаёт порядок столбцов отчёта, поэтому
+    # они хэшируются списками пар, а не словарями с сортировкой ключей
+    payload = json.dumps([REPORT_VERSION, month_projects, list(platform_categories.items()),
+                          list(status_colors.items())], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def generate_reports(months, platform_categories, status_colors, output_dir="reports", max_workers=None):
+    # months: {(год, месяц): {проект: данные}}. Перестраиваются только месяцы, данные которых
+    # изменились с прошлого запуска; остальные берутся из кэша по хэшу содержимого.
+    # Возвращает (обновлено, всего месяцев, [(месяц, ошибка)]).
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, "report_cache.json")
+    try:
+        with open(cache_path, "r", encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        cache = {}
+
+    jobs = []
+    hashes = {}
+    for (year, month), month_projects in months.items():
+        key = f"{year}-{month:02d}"
+        path = os.path.join(output_dir, f"{key}.html")
+        hashes[key] = report_hash(month_projects, platform_categories, status_colors)
+        if cache.get(key) != hashes[key] or not os.path.exists(path):
+            jobs.append({"year": year, "month": month, "projects": month_projects,
+                         "platform_categories": platform_categories, "status_colors": status_colors,
+                         "path": path})
+
+    rendered = 0
+    errors = []
+    if jobs:
+        # Процессы запускаются через spawn: fork процесса с Tk и живыми потоками ввода-вывода небезопасен
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(render_month_report, job): f"{job['year']}-{job['month']:02d}" for job in jobs}
+            for future in as_completed(futures):
+                key = futures[future]
+                # Ошибка одного месяца не отменяет уже готовые: они попадут в кэш
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append((key, e))
+                    cache.pop(key, None)
+                    continue
+                cache[key] = hashes[key]
+                rendered += 1
+
+    # Отчёты о месяцах, которых больше нет, удаляются из кэша
+    cache = {key: value for key, value in cache.items() if key in hashes}
+    links = "".join(f'<li><a href="{key}.html">{html.escape(month_name(int(key[5:])))} {key[:4]}</a></li>'
+                    for key in sorted(hashes, reverse=True))
+    with open(os.path.join(output_dir, "index.html"), "w", encoding="utf-8") as file:
+        file.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Отчёты</title></head>
+<body style="font-family:Arial,sans-serif"><h1>Отчёты по месяцам</h1><ul>{links}</ul></body></html>
+""")
+    with open(cache_path, "w", encoding="utf-8") as file:
+        json.dump(cache, file, indent=4)
+    return rendered, len(hashes), sorted(errors)
+
+
+class AgingIndex:
+    # Упорядоченный по дате индекс ячеек: (статус, платформа) -> отсортированный список
+    # (дата, проект, категория). Запрос "старше N дней" — бинарный поиск по границе.
+    TRACKED_STATUSES = ("Pending", "Not Uploaded", "Rejected")
+
+    def __init__(self, statuses=TRACKED_STATUSES):
+        self.statuses = set(statuses)
+        self.entries = {}
+        self.locations = {}
+        self.project_cells = {}
+
+    @staticmethod
+    def _valid_date(value):
+        # Дата приводится к виду ГГГГ-ММ-ДД: индекс сравнивает даты как строки, а fromisoformat
+        # в Python 3.11+ принимает и другие записи ISO, например "20240105"
+        try:
+            return date.fromisoformat(value).isoformat()
+        except (TypeError, ValueError):
+            return None
+
+    def rebuild(self, projects):
+        self.entries = {}
+        self.locations = {}
+        self.project_cells = {}
+        for project, project_data in projects.items():
+            for platform, platform_data in project_data.items():
+                if platform in ['year', 'month']:
+                    continue
+                for category, details in platform_data.items():
+                    status = details.get('status')
+                    day = self._valid_date(details.get('date'))
+                    if status in self.statuses and day:
+                        self.entries.setdefault((status, platform), []).append((day, project, category))
+                        self.locations[(project, platform, category)] = (status, day)
+                        self.project_cells.setdefault(project, set()).add((platform, category))
+        for entries in self.entries.values():
+            entries.sort()
+        return self
+
+    def _remove(self, project, platform, category):
+        location = self.locations.pop((project, platform, category), None)
+        if location is None:
+            return
+        status, day = location
+        entries = self.entries[(status, platform)]
+        index = bisect.bisect_left(entries, (day, project, category))
+        if index < len(entries) and entries[index] == (day, project, category):
+            del entries[index]
+        self.project_cells[project].discard((platform, category))
+
+    def update(self, project, platform, category, status, day):
+        self._remove(project, platform, category)
+        day = self._valid_date(day)
+        if status in self.statuses and day:
+            bisect.insort(self.entries.setdefault((status, platform), []), (day, project, category))
+            self.locations[(project, platform, category)] = (status, day)
+            self.project_cells.setdefault(project, set()).add((platform, category))
+
+    def update_project(self, project, project_data):
+        # Переиндексирует все ячейки проекта; project_data=None удаляет проект из индекса
+        for platform, category in list(self.project_cells.get(project, ())):
+            self._remove(project, platform, category)
+        self.project_cells.pop(project, None)
+        for platform, platform_data in (project_data or {}).items():
+            if platform in ['year', 'month']:
+                continue
+            for category, details in platform_data.items():
+                self.update(project, platform, category, details.get('status'), details.get('date'))
+
+    def older_than(self, status, days, platform=None, limit=None, today=None):
+        # Ячейки в статусе status, не менявшиеся больше days дней, самые старые первыми
+        cutoff = ((today or date.today()) - timedelta(days=days)).isoformat()
+        if platform is None:
+            lists = [entries for (entry_status, _), entries in self.entries.items() if entry_status == status]
+            platforms = [entry_platform for (entry_status, entry_platform) in self.entries if entry_status == status]
+        else:
+            lists = [self.entries.get((status, platform), [])]
+            platforms = [platform]
+
+        def stream(entries, entry_platform):
+            end = bisect.bisect_left(entries, (cutoff,))
+            for index in range(end):
+                day, project, category = entries[index]
+                yield day, project, entry_platform, category
+
+        merged = heapq.merge(*(stream(entries, entry_platform) for entries, entry_platform in zip(lists, platforms)))
+        return list(merged) if limit is None else [item for _, item in zip(range(limit), merged)]
+
+    def count_older_than(self, status, days, platform=None, today=None):
+        cutoff = ((today or date.today()) - timedelta(days=days)).isoformat()
+        return sum(bisect.bisect_left(entries, (cutoff,))
+                   for (entry_status, entry_platform), entries in self.entries.items()
+                   if entry_status == status and platform in (None, entry_platform))
+
+
+class MetricsStore:
+    # Столбцовое хранилище числовых метрик ячеек (продажи, выручка, цена, ID товара).
+    # Ключи — те же (проект, платформа, категория), что и у статусов; пустая категория
+    # означает метрику платформы в целом. Каждое измерение хранится кодами в массиве,
+    # поэтому группировки считаются через np.bincount.
+    COLUMNS = ("sales", "revenue", "price")
+    DIMENSIONS = ("project", "platform", "category")
+
+    def __init__(self, path="metrics_data.npz", submit=None):
+        self.path = path
+        self.submit = submit or self._write_now
+        self.size = 0
+        self.rows = {}
+        self.platform_rows = {}
+        self.item_ids = []
+        self.values = {column: np.zeros(0) for column in self.COLUMNS}
+        self.codes = {dimension: np.zeros(0, dtype=np.int32) for dimension in self.DIMENSIONS}
+        self.tables = {dimension: [] for dimension in self.DIMENSIONS}
+        self.table_ids = {dimension: {} for dimension in self.DIMENSIONS}
+        self.max_cache = {}
+        self.dirty = False
+        self.load()
+
+    def __len__(self):
+        return self.size
+
+    def _code(self, dimension, value):
+        ids = self.table_ids[dimension]
+        code = ids.get(value)
+        if code is None:
+            code = ids[value] = len(self.tables[dimension])
+            self.tables[dimension].append(value)
+        return code
+
+    def _reserve(self, size):
+        capacity = len(self.values[self.COLUMNS[0]])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+        for column, array in self.values.items():
+            grown = np.zeros(capacity)
+            grown[:self.size] = array[:self.size]
+            self.values[column] = grown
+        for dimension, array in self.codes.items():
+            grown = np.zeros(capacity, dtype=np.int32)
+            grown[:self.size] = array[:self.size]
+            self.codes[dimension] = grown
+
+    def set(self, project, platform, category, sales=None, revenue=None, price=None, item_id=None):
+        key = (project, platform, category or "")
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = self.size
+            self._reserve(row + 1)
+            for dimension, value in zip(self.DIMENSIONS, key):
+                self.codes[dimension][row] = self._code(dimension, value)
+            self.item_ids.append("")
+            self.platform_rows.setdefault((project, platform), []).append(row)
+            self.size += 1
+        for column, value in zip(self.COLUMNS, (sales, revenue, price)):
+            if value is not None:
+                self.values[column][row] = value
+        if item_id is not None:
+            self.item_ids[row] = item_id
+        self.max_cache = {}
+        self.dirty = True
+
+    def cell_value(self, project, platform, category, metric):
+        row = self.rows.get((project, platform, category))
+        return float(self.values[metric][row]) if row is not None else 0.0
+
+    def platform_value(self, project, platform, metric):
+        # Заданное значение строки уровня платформы (пустая категория) — итог платформы и побеждает.
+        # Иначе продажи и выручка складываются по категориям, цена — средняя по заданным ценам
+        rows = self.platform_rows.get((project, platform))
+        if not rows:
+            return 0.0
+        platform_row = self.rows.get((project, platform, ""))
+        if platform_row is not None:
+            value = float(self.values[metric][platform_row])
+            if value:
+                return value
+        values = self.values[metric][[row for row in rows if row != platform_row]]
+        if metric == "price":
+            values = values[values > 0]
+            return float(values.mean()) if len(values) else 0.0
+        return float(values.sum())
+
+    def _counted(self, metric):
+        # Строки, которые входят в итоги: строки категорий не учитываются там, где у той же
+        # пары (проект, платформа) задано значение строки уровня платформы, как в platform_value
+        counted = np.ones(self.size, dtype=bool)
+        empty = self.table_ids["category"].get("")
+        if empty is None or not self.size:
+            return counted
+        pairs = self.codes["project"][:self.size].astype(np.int64) * len(self.tables["platform"]) \
+            + self.codes["platform"][:self.size]
+        platform_level = self.codes["category"][:self.size] == empty
+        overriding = platform_level & (self.values[metric][:self.size] != 0)
+        counted[~platform_level & np.isin(pairs, pairs[overriding])] = False
+        return counted
+
+    def max_value(self, metric):
+        # Шкала общая для ячеек и свёрнутых платформ, поэтому максимум берётся по обоим
+        if metric not in self.max_cache:
+            cell_max = float(self.values[metric][:self.size].max()) if self.size else 0.0
+            platform_max = max((self.platform_value(project, platform, metric)
+                                for project, platform in self.platform_rows), default=0.0)
+            self.max_cache[metric] = max(cell_max, platform_max)
+        return self.max_cache[metric]
+
+    def aggregate(self, metric, by, projects=None):
+        # Сумма метрики по платформам, категориям, проектам или месяцам (для месяцев нужны projects).
+        # По категориям учитываются все строки: строки уровня платформы попадают в пустую категорию
+        values = self.values[metric][:self.size]
+        if by != "category":
+            values = np.where(self._counted(metric), values, 0.0)
+        if by in self.DIMENSIONS:
+            table = self.tables[by]
+            sums = np.bincount(self.codes[by][:self.size], weights=values, minlength=len(table))
+            return {table[i]: float(total) for i, total in enumerate(sums) if total}
+        if by != "month":
+            raise ValueError(f"Неизвестная группировка: {by}")
+        # Месяц проекта вычисляется один раз на проект, а не на строку
+        project_months = np.array([
+            (projects[name].get('year') or 0) * 12 + (projects[name].get('month') or 1) - 1
+            if name in projects and projects[name].get('year') else -1
+            for name in self.tables["project"]
+        ], dtype=np.int64)
+        months = project_months[self.codes["project"][:self.size]] if self.size else np.zeros(0, dtype=np.int64)
+        mask = months >= 0
+        keys, inverse = np.unique(months[mask], return_inverse=True)
+        sums = np.bincount(inverse, weights=values[mask], minlength=len(keys))
+        return {(int(key) // 12, int(key) % 12 + 1): float(total) for key, total in zip(keys, sums) if total}
+
+    def rename_platforms(self, mapping):
+        # Отображение старое имя -> новое применяется за один проход: обмен именами и цепочки
+        # переименований не смешивают строки разных платформ. Строки платформ с именем None удаляются
+        removed = {platform for platform, name in mapping.items() if name is None}
+        if removed:
+            self._drop_rows([row for (_, platform, _), row in self.rows.items() if platform in removed])
+            mapping = {platform: name for platform, name in mapping.items() if name is not None}
+        table = []
+        ids = {}
+        remap = np.zeros(len(self.tables["platform"]), dtype=np.int32)
+        for code, platform in enumerate(self.tables["platform"]):
+            name = mapping.get(platform, platform)
+            if name not in ids:
+                ids[name] = len(table)
+                table.append(name)
+            remap[code] = ids[name]
+        self.tables["platform"] = table
+        self.table_ids["platform"] = ids
+        if self.size:
+            self.codes["platform"][:self.size] = remap[self.codes["platform"][:self.size]]
+        self.rows = {(project, mapping.get(platform, platform), category): row
+                     for (project, platform, category), row in self.rows.items()}
+        self.platform_rows = {}
+        for (project, platform, _), row in self.rows.items():
+            self.platform_rows.setdefault((project, platform), []).append(row)
+        self.dirty = True
+
+    def remove_project(self, project):
+        self._drop_rows([row for (name, _, _), row in self.rows.items() if name == project])
+
+    def merge_project(self, source, target):
+        # Метрики источника переносятся в target: заданные значения target сохраняются,
+        # источник заполняет только незаданные (нулевые), затем строки источника удаляются
+        rows = [(key, row) for key, row in self.rows.items() if key[0] == source]
+        for (_, platform, category), row in rows:
+            target_row = self.rows.get((target, platform, category))
+            values = {column: float(self.values[column][row]) for column in self.COLUMNS
+                      if target_row is None or not self.values[column][target_row]}
+            item_id = self.item_ids[row] if target_row is None or not self.item_ids[target_row] else None
+            self.set(target, platform, category, **values, item_id=item_id)
+        self._drop_rows([row for _, row in rows])
+
+    def _drop_rows(self, rows):
+        # Удаляет строки и сдвигает оставшиеся, сохраняя их порядок
+        if not rows:
+            return
+        keep = np.ones(self.size, dtype=bool)
+        keep[rows] = False
+        new_rows = np.cumsum(keep) - 1
+        for column in self.COLUMNS:
+            self.values[column] = self.values[column][:self.size][keep]
+        for dimension in self.DIMENSIONS:
+            self.codes[dimension] = self.codes[dimension][:self.size][keep]
+        self.item_ids = [item_id for item_id, kept in zip(self.item_ids, keep) if kept]
+        self.rows = {key: int(new_rows[row]) for key, row in self.rows.items() if keep[row]}
+        self.platform_rows = {}
+        for (project, platform, _), row in self.rows.items():
+            self.platform_rows.setdefault((project, platform), []).append(row)
+        self.size = len(self.item_ids)
+        self.max_cache = {}
+        self.dirty = True
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with np.load(self.path, allow_pickle=False) as data:
+                    columns = {column: data[column] for column in self.COLUMNS}
+                    keys = zip(data["project"].tolist(), data["platform"].tolist(), data["category"].tolist())
+                    item_ids = data["item_id"].tolist()
+                    for i, (project, platform, category) in enumerate(keys):
+                        self.set(project, platform, category,
+                                 *(float(columns[column][i]) for column in self.COLUMNS), item_id=item_ids[i])
+                self.dirty = False
+        except Exception as e:
+            print(f"Ошибка загрузки метрик: {e}")
+
+    @staticmethod
+    def _write_now(write):
+        try:
+            write()
+        except Exception as e:
+            print(f"Ошибка сохранения метрик: {e}")
+
+    def save(self):
+        if not self.dirty:
+            return
+        # Массивы копируются сейчас: запись может выполняться в фоне, пока метрики меняются
+        keys = sorted(self.rows.items(), key=lambda item: item[1])
+        arrays = dict(project=np.array([key[0] for key, _ in keys], dtype=str),
+                      platform=np.array([key[1] for key, _ in keys], dtype=str),
+                      category=np.array([key[2] for key, _ in keys], dtype=str),
+                      item_id=np.array(self.item_ids, dtype=str),
+                      **{column: self.values[column][:self.size].copy() for column in self.COLUMNS})
+        self.dirty = False
+
+        def write():
+            buffer = io.BytesIO()
+            np.savez(buffer, **arrays)
+            write_file_atomic(self.path, buffer.getvalue())
+
+        self.submit(write)
+
+    @staticmethod
+    def _number(value):
+        # "1,234.50" и "1.234,50" — десятичный разделитель последний из двух, "120,50" — десятичная
+        # запятая, "1.234.567" — повторяющийся разделитель разрядов. Нечисловое значение — ValueError
+        value = (value or "").strip().replace("\u00a0", "").replace(" ", "").replace("'", "").strip("$€£₽")
+        if not value:
+            return None
+        if "," in value and "." in value:
+            thousands = "," if value.rfind(",") < value.rfind(".") else "."
+            value = value.replace(thousands, "")
+        for separator in (",", "."):
+            if value.count(separator) > 1:
+                value = value.replace(separator, "")
+        return float(value.replace(",", "."))
+
+    def import_csv(self, file_path):
+        # Возвращает (число импортированных строк, отклонённые строки)
+        rows, rejected = self.read_csv(file_path)
+        return self.import_rows(rows), rejected
+
+    def import_rows(self, rows):
+        for project, platform, category, values, item_id in rows:
+            self.set(project, platform, category, **values, item_id=item_id)
+        return len(rows)
+
+    @classmethod
+    def read_csv(cls, file_path, check_cancelled=None):
+        # Столбцы: Project, Platform, Category, Sales, Revenue, Price, Item ID (регистр не важен,
+        # необязательные можно опустить). Только чтение файла, поэтому может идти в фоне.
+        # Возвращает (строки, отклонённые) как read_projects_csv: строки с нечисловыми значениями пропускаются
+        rows = []
+        rejected = []
+        with open(file_path, "r", newline='', encoding='utf-8-sig') as csvfile:
+            reader = csv.DictReader(csvfile)
+            headers = {header.strip().casefold(): header for header in reader.fieldnames or []}
+            for required in ("project", "platform"):
+                if required not in headers:
+                    raise ValueError(f"В файле нет столбца {required.title()}")
+
+            def field(row, name):
+                header = headers.get(name)
+                return row.get(header) if header else None
+
+            for row in reader:
+                if check_cancelled and len(rows) % 1000 == 0:
+                    check_cancelled()
+                project = (field(row, "project") or "").strip()
+                platform = (field(row, "platform") or "").strip()
+                if not project or not platform:
+                    continue
+                try:
+                    values = {column: cls._number(field(row, column)) for column in cls.COLUMNS}
+                except ValueError:
+                    bad = next(column for column in cls.COLUMNS if not cls._is_number(field(row, column)))
+                    rejected.append((reader.line_num, f"неверное значение {bad} '{field(row, bad)}'"))
+                    continue
+                item_id = field(row, "item id")
+                rows.append((project, platform, (field(row, "category") or "").strip(), values,
+                             item_id.strip() if item_id else None))
+        return rows, rejected
+
+    @classmethod
+    def _is_number(cls, value):
+        try:
+            cls._number(value)
+        except ValueError:
+            return False
+        return True
+
+
+# Режимы отображения матрицы: статусы или тепловая карта по метрике
+VIEW_MODES = {"Статусы": None, "Продажи": "sales", "Выручка": "revenue", "Цена": "price"}
+
+
+def metric_color(value, maximum):
+    # От белого к тёмно-зелёному; ячейки без данных — светло-серые
+    if not value or not maximum:
+        return "#F5F5F5"
+    ratio = min(value / maximum, 1.0) ** 0.5
+    start, end = (255, 255, 255), (26, 127, 55)
+    return "#%02X%02X%02X" % tuple(round(a + (b - a) * ratio) for a, b in zip(start, end))
+
+
+class Workspace:
+    # Набор данных в отдельной папке; state — данные и построенные по ним индексы
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.name = os.path.basename(self.path) or self.path
+        self.state = {}
+
+
+class WorkspaceManager:
+    # Открывает рабочие пространства лениво и держит в памяти несколько последних (LRU).
+    # loader(workspace) заполняет workspace.state, on_evict(workspace) вызывается при вытеснении.
+    def __init__(self, loader, capacity=3, on_evict=None):
+        self.loader = loader
+        self.capacity = capacity
+        self.on_evict = on_evict
+        self.cache = OrderedDict()
+        self.active = None
+
+    def get(self, path):
+        key = os.path.abspath(path)
+        workspace = self.cache.get(key)
+        if workspace is None:
+            workspace = Workspace(key)
+            self.loader(workspace)
+            self.cache[key] = workspace
+        self.cache.move_to_end(key)
+        self._evict()
+        return workspace
+
+    def add(self, workspace):
+        self.cache[workspace.path] = workspace
+        self.cache.move_to_end(workspace.path)
+        self._evict()
+
+    def _evict(self):
+        # Активное пространство не вытесняется
+        for key in list(self.cache):
+            if len(self.cache) <= self.capacity:
+                break
+            if self.active is not None and key == self.active.path:
+                continue
+            workspace = self.cache.pop(key)
+            if self.on_evict:
+                self.on_evict(workspace)
+
+    def peek(self, path):
+        # Пространство из кэша без изменения порядка LRU; незагруженное читается напрямую
+        # и в кэш не попадает, чтобы не вытеснить активное или недавние
+        key = os.path.abspath(path)
+        workspace = self.cache.get(key)
+        if workspace is None:
+            workspace = Workspace(key)
+            self.loader(workspace)
+        return workspace
+
+    def merged_view(self, paths):
+        return MergedProjectsView([self.peek(path) for path in paths])
+
+
+def workspace_labels(paths):
+    # Подписи пространств: имя папки, а при совпадении имён — столько родительских папок, сколько нужно
+    parts = {path: os.path.abspath(path).rstrip(os.sep).split(os.sep) for path in paths}
+    depth = {path: 1 for path in paths}
+    while True:
+        labels = {path: os.sep.join(parts[path][-depth[path]:]) or path for path in paths}
+        counts = Counter(labels.values())
+        clashes = [path for path in paths if counts[labels[path]] > 1 and depth[path] < len(parts[path])]
+        if not clashes:
+            return labels
+        for path in clashes:
+            depth[path] += 1
+
+
+class MergedProjectsView(Mapping):
+    # Объединённое представление проектов нескольких пространств только для чтения.
+    # Ключи — (путь пространства, имя проекта): имена папок разных пространств могут совпадать.
+    def __init__(self, workspaces):
+        self.workspaces = list(workspaces)
+        self.labels = workspace_labels([workspace.path for workspace in self.workspaces])
+
+    def __getitem__(self, key):
+        workspace_path, project = key
+        for workspace in self.workspaces:
+            if workspace.path == workspace_path and project in workspace.state['projects']:
+                return MappingProxyType(workspace.state['projects'][project])
+        raise KeyError(key)
+
+    def __iter__(self):
+        for workspace in self.workspaces:
+            for project in workspace.state['projects']:
+                yield workspace.path, project
+
+    def __len__(self):
+        return sum(len(workspace.state['projects']) for workspace in self.workspaces)
+
+    def status_totals(self):
+        # Итоги берутся из уже посчитанных счётчиков каждого пространства
+        totals = {workspace.path: +workspace.state['status_totals'] for workspace in self.workspaces}
+        totals[None] = sum(totals.values(), Counter())
+        return totals
+
+
+def read_json_file(path):
+    if os.path.exists(path):
+        with open(path, "r", encoding='utf-8') as file:
+            return json.load(file)
+    return {}
+
+
+def update_json_file(path, updates):
+    # Настройки приложения и пространства могут жить в одном settings.json, поэтому ключи дополняются
+    data = read_json_file(path)
+    data.update(updates)
+    with open(path, "w", encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=4)
+
+
+class IOCancelled(Exception):
+    pass
+
+
+class IOTask:
+    def __init__(self, fn, lane, key, on_done, on_error, description, cancellable):
+        self.fn = fn
+        self.lane = lane
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.description = description
+        self.cancellable = cancellable
+        self.cancel_event = threading.Event()
+        self.started = False
+        self.finished = False
+        # Задачи, после которых эта может начаться (см. IOExecutor.submit(after=...))
+        self.blockers = set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        # Для долгих задач: вызывается внутри fn между порциями работы
+        if self.cancel_event.is_set():
+            raise IOCancelled()
+
+
+class IOExecutor:
+    # Фоновое выполнение файловых операций. Задачи одной полосы (lane, обычно путь файла)
+    # выполняются строго по очереди, ещё не начатая задача с тем же ключом заменяется новой.
+    # Результаты возвращаются в поток Tk через очередь, которую опрашивает root.after.
+    POLL_MS = 50
+
+    def __init__(self, root, max_workers=2, on_status=None):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="io")
+        self.results = queue.Queue()
+        # Результаты чужих полос, полученные во время wait: обрабатываются следующим poll по порядку
+        self.deferred = deque()
+        self.lock = threading.Lock()
+        self.lanes = {}
+        self.tasks = set()
+        # Задачи, ждущие завершения записей своих полос; рабочий поток они не занимают
+        self.held = []
+        self.on_status = on_status
+        self.poll_job = None
+        self.error = None
+
+    def submit(self, fn, lane=None, key=None, on_done=None, on_error=None, description="", cancellable=False,
+               after=None):
+        # fn получает задачу (IOTask) и выполняется в рабочем потоке; on_done(результат)
+        # и on_error(исключение) вызываются в потоке Tk. after — префикс полос: задача начнётся
+        # после всех уже поставленных задач этих полос (чтение файлов, запись которых ещё в очереди)
+        task = IOTask(fn, lane, key, on_done, on_error, description, cancellable)
+        with self.lock:
+            if after is not None:
+                task.blockers = {other for other in self.tasks if self._matches(other, after) and not other.finished}
+            if task.blockers:
+                self.held.append(task)
+            else:
+                self._enqueue(task)
+            self.tasks.add(task)
+        self._report()
+        if self.poll_job is None:
+            self.poll_job = self.root.after(self.POLL_MS, self.poll)
+        return task
+
+    def _enqueue(self, task, coalesce=True):
+        # Вызывается под self.lock. Отложенные задачи ставятся из рабочего потока и других
+        # не заменяют: self.tasks меняется только в потоке Tk
+        if task.lane is None:
+            self._start(task)
+            return
+        waiting = self.lanes.setdefault(task.lane, deque())
+        for i, other in enumerate(waiting):
+            if coalesce and task.key is not None and other.key == task.key and not other.started:
+                # Несколько сохранений подряд: записывается только последнее
+                waiting[i] = task
+                self.tasks.discard(other)
+                for held in self.held:
+                    if other in held.blockers:
+                        held.blockers.discard(other)
+                        held.blockers.add(task)
+                break
+        else:
+            waiting.append(task)
+        if waiting[0] is task:
+            self._start(task)
+
+    def _start(self, task):
+        task.started = True
+        self.pool.submit(self._run, task)
+
+    def _run(self, task):
+        try:
+            task.check_cancelled()
+            outcome = ("done", task.fn(task))
+        except IOCancelled:
+            outcome = ("cancelled", None)
+        except Exception as e:
+            outcome = ("error", e)
+        with self.lock:
+            task.finished = True
+            if task.lane is not None:
+                waiting = self.lanes[task.lane]
+                waiting.popleft()
+                if waiting:
+                    self._start(waiting[0])
+                else:
+                    del self.lanes[task.lane]
+            for held in list(self.held):
+                held.blockers.discard(task)
+                if not held.blockers:
+                    self.held.remove(held)
+                    self._enqueue(held, coalesce=False)
+        self.results.put((task, *outcome))
+
+    def _handle(self, task, state, value):
+        self.tasks.discard(task)
+        if state == "done":
+            # Ошибка висит в строке состояния, пока та же операция не пройдёт успешно
+            if self.error and self.error[0] == task.description:
+                self.error = None
+            if task.on_done:
+                try:
+                    task.on_done(value)
+                except Exception as e:
+                    # Исключение обработчика считается ошибкой задачи и не прерывает poll
+                    self._fail(task, e)
+        elif state == "error":
+            self._fail(task, value)
+        self._report(cancelled=state == "cancelled")
+
+    def _fail(self, task, error):
+        self.error = (task.description, f"Ошибка: {task.description or 'запись файла'}: {error}")
+        print(self.error[1])
+        if task.on_error:
+            try:
+                task.on_error(error)
+            except Exception as e:
+                print(f"Ошибка обработчика ошибки ({task.description or 'запись файла'}): {e}")
+
+    def _report(self, cancelled=False):
+        if self.on_status is None:
+            return
+        cancellable = any(task.cancellable for task in self.tasks)
+        if self.error:
+            self.on_status(self.error[1], error=True, busy=bool(self.tasks), cancellable=cancellable)
+        elif self.tasks:
+            running = [task.description for task in self.tasks if task.started and task.description]
+            text = running[0] if running else "Запись на диск"
+            self.on_status(f"{text}… (в очереди: {len(self.tasks)})", busy=True, cancellable=cancellable)
+        else:
+            self.on_status("Отменено" if cancelled else "Все изменения сохранены")
+
+    def poll(self):
+        self.poll_job = None
+        try:
+            while True:
+                if self.deferred:
+                    self._handle(*self.deferred.popleft())
+                    continue
+                try:
+                    result = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                self._handle(*result)
+        finally:
+            # Опрос перезапускается, даже если обработка прервалась исключением (например, в on_status)
+            if (self.tasks or self.deferred) and self.poll_job is None:
+                self.poll_job = self.root.after(self.POLL_MS, self.poll)
+
+    def cancel(self):
+        # Отменяет импорт и экспорт; сохранения не отменяются, иначе нарушится порядок записи
+        for task in list(self.tasks):
+            if task.cancellable:
+                task.cancel_event.set()
+
+    def _matches(self, task, prefix):
+        return prefix is None or (task.lane is not None and task.lane.startswith(prefix))
+
+    def wait(self, prefix=None):
+        # Блокирующее ожидание задач, чья полоса начинается с prefix (None — всех задач): перед
+        # чтением файлов, запись которых ещё может быть в очереди. Обработчики других задач
+        # здесь не вызываются — они откладываются до poll, чтобы не выполняться внутри
+        # чужого обработчика
+        while any(self._matches(task, prefix) for task in self.tasks):
+            # Результат могла уже отложить предыдущая wait
+            for i, result in enumerate(self.deferred):
+                if self._matches(result[0], prefix):
+                    del self.deferred[i]
+                    break
+            else:
+                result = self.results.get()
+                if not self._matches(result[0], prefix):
+                    self.deferred.append(result)
+                    continue
+            self._handle(*result)
+        if self.deferred and self.poll_job is None:
+            self.poll_job = self.root.after(self.POLL_MS, self.poll)
+
+    def shutdown(self):
+        self.wait()
+        self.pool.shutdown(wait=True)
+
+
+class BackupStore:
+    # Инкрементальные резервные копии с дедупликацией. Данные режутся на шарды по месяцам,
+    # каждый шард хранится один раз как сжатый блок, адресуемый SHA-256 содержимого.
+    # Манифест точки восстановления — это только список хэшей шардов.
+    # В копии попадают проекты и схема платформ; история статусов и метрики не копируются
+    # и при восстановлении не откатываются.
+    DEFAULT_CONFIG = {"interval": 300, "keep_last": 50, "keep_days": 30}
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.chunks_dir = os.path.join(directory, "chunks")
+        self.manifests_dir = os.path.join(directory, "manifests")
+        self.config_path = os.path.join(directory, "config.json")
+        self.config = dict(self.DEFAULT_CONFIG)
+        try:
+            self.config.update(read_json_file(self.config_path))
+        except Exception as e:
+            print(f"Ошибка загрузки настроек резервного копирования: {e}")
+        self.shard_hashes = {}
+        self.dirty = set()
+        self.all_dirty = True
+        self.last_snapshot = 0.0
+
+    @staticmethod
+    def shard_key(year, month):
+        return f"{year}-{month:02d}" if year and month else "none"
+
+    def mark_dirty(self, year, month):
+        self.dirty.add(self.shard_key(year, month))
+
+    def mark_all_dirty(self):
+        self.all_dirty = True
+
+    def save_config(self, **values):
+        self.config.update(values)
+        self.write_config(self.config)
+
+    def write_config(self, config):
+        # Только запись на диск: в приложении идёт в фоне с копией настроек
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.config_path, "w", encoding='utf-8') as file:
+            json.dump(config, file, indent=4)
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    @staticmethod
+    def _encode_chunk(payload):
+        data = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return hashlib.sha256(data).hexdigest(), data
+
+    def _write_chunk(self, digest, data):
+        path = self._chunk_path(digest)
+        # Блок с тем же содержимым уже есть — повторно не пишется
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_file_atomic(path, zlib.compress(data))
+
+    def _read_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as file:
+            return json.loads(zlib.decompress(file.read()).decode('utf-8'))
+
+    def snapshot(self, projects, month_index, platform_data, force=False):
+        # Создаёт точку восстановления, перечитывая только изменившиеся шарды.
+        # Без force не чаще, чем раз в config["interval"] секунд.
+        plan = self.prepare(projects, month_index, platform_data, force)
+        return self.commit(plan) if plan else None
+
+    def prepare(self, projects, month_index, platform_data, force=False):
+        # Часть снимка, которая читает данные: сериализует изменившиеся шарды.
+        # Возвращает план для commit, который работает только с диском и может идти в фоне
+        now = datetime.now()
+        if not force and now.timestamp() - self.last_snapshot < self.config["interval"]:
+            return None
+        chunks = {}
+        if self.all_dirty:
+            self.shard_hashes = {}
+            keys = {self.shard_key(year, month) for year, month in month_index.keys} | {"none"}
+        else:
+            keys = set(self.dirty)
+        for key in keys:
+            if key == "none":
+                names = [name for name, data in projects.items()
+                         if self.shard_key(data.get('year'), data.get('month')) == "none"]
+            else:
+                names = month_index.projects.get((int(key[:4]), int(key[5:])), ())
+            if names:
+                digest, data = self._encode_chunk({name: projects[name] for name in names})
+                self.shard_hashes[key] = digest
+                chunks[digest] = data
+            else:
+                self.shard_hashes.pop(key, None)
+        platforms_hash, data = self._encode_chunk(platform_data)
+        chunks[platforms_hash] = data
+        self.dirty.clear()
+        self.all_dirty = False
+        self.last_snapshot = now.timestamp()
+
+        manifest = {"timestamp": now.isoformat(timespec='seconds'), "platforms": platforms_hash,
+                    "shards": dict(sorted(self.shard_hashes.items())), "changed": len(keys)}
+        return {"name": now.strftime("%Y%m%dT%H%M%S%f") + ".json", "manifest": manifest, "chunks": chunks}
+
+    def commit(self, plan):
+        # prepare уже считает шарды плана сохранёнными; если запись не удалась, следующий
+        # снимок перечитывает все шарды, иначе манифесты ссылались бы на ненаписанные блоки
+        try:
+            return self._commit(plan)
+        except Exception:
+            self.all_dirty = True
+            raise
+
+    def _commit(self, plan):
+        manifest = plan["manifest"]
+        for digest, data in plan["chunks"].items():
+            self._write_chunk(digest, data)
+        latest = self.manifests()
+        if latest:
+            previous = self._read_manifest(latest[-1])
+            if previous["shards"] == manifest["shards"] and previous["platforms"] == manifest["platforms"]:
+                return None
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        with open(os.path.join(self.manifests_dir, plan["name"]), "w", encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=1)
+        self.prune()
+        return plan["name"]
+
+    def manifests(self):
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        return sorted(name for name in os.listdir(self.manifests_dir) if name.endswith(".json"))
+
+    def _read_manifest(self, name):
+        with open(os.path.join(self.manifests_dir, name), "r", encoding='utf-8') as file:
+            return json.load(file)
+
+    def list_points(self):
+        # [(имя манифеста, время, число перезаписанных шардов)], новые первыми
+        points = []
+        for name in reversed(self.manifests()):
+            manifest = self._read_manifest(name)
+            points.append((name, manifest["timestamp"], manifest.get("changed", 0)))
+        return points
+
+    def find_point(self, moment, manifests=None):
+        # Последняя точка восстановления не позже moment (datetime); manifests — уже прочитанный
+        # отсортированный список имён, чтобы не обращаться к диску
+        key = moment.strftime("%Y%m%dT%H%M%S%f") + ".json"
+        if manifests is None:
+            manifests = self.manifests()
+        index = bisect.bisect_right(manifests, key)
+        return manifests[index - 1] if index else None
+
+    def restore(self, name):
+        # Возвращает (проекты, данные платформ) точки восстановления
+        manifest = self._read_manifest(name)
+        projects = {}
+        for digest in manifest["shards"].values():
+            projects.update(self._read_chunk(digest))
+        return projects, self._read_chunk(manifest["platforms"])
+
+    def restore_project(self, name, project):
+        for digest in self._read_manifest(name)["shards"].values():
+            shard = self._read_chunk(digest)
+            if project in shard:
+                return shard[project]
+        return None
+
+    def prune(self):
+        # Хранение: последние keep_last точек и по одной (последней) на день за keep_days дней;
+        # блоки, на которые больше не ссылается ни один манифест, удаляются
+        manifests = self.manifests()
+        keep = set(manifests[-self.config["keep_last"]:]) if self.config["keep_last"] > 0 else set()
+        cutoff = (datetime.now() - timedelta(days=self.config["keep_days"])).strftime("%Y%m%d")
+        days = {}
+        for name in manifests:
+            if name[:8] >= cutoff:
+                days[name[:8]] = name
+        keep.update(days.values())
+        removed = [name for name in manifests if name not in keep]
+        if not removed:
+            return
+        for name in removed:
+            os.remove(os.path.join(self.manifests_dir, name))
+
+        # Последний манифест всегда среди сохранённых, поэтому его блоки (а они же
+        # текущие шарды) не удаляются
+        referenced = set()
+        for name in keep:
+            manifest = self._read_manifest(name)
+            referenced.update(manifest["shards"].values())
+            referenced.add(manifest["platforms"])
+        for prefix in os.listdir(self.chunks_dir):
+            prefix_dir = os.path.join(self.chunks_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if digest not in referenced:
+                    os.remove(os.path.join(prefix_dir, digest))
+
+
+class Diagnostics:
+    # Замеры ресурсов долгой сессии: виджеты Tk, команды Tcl, глобальные переменные Tcl
+    # (переменные Tk), объекты Python и память по tracemalloc, если он включён.
+    # История замеров показывает, что растёт от замера к замеру.
+    HISTORY = 288
+    METRICS = ("widgets", "toplevels", "commands", "variables", "python_objects", "traced_kb")
+
+    def __init__(self, root):
+        self.root = root
+        self.samples = deque(maxlen=self.HISTORY)
+        self.previous_snapshot = None
+
+    def widget_classes(self):
+        # Обход дерева окон на стороне Tcl: учитываются и виджеты, о которых Python уже забыл
+        counts = Counter()
+        paths = ["."]
+        while paths:
+            path = paths.pop()
+            counts[self.root.tk.call("winfo", "class", path)] += 1
+            paths.extend(self.root.tk.splitlist(self.root.tk.call("winfo", "children", path)))
+        return counts
+
+    def sample(self):
+        classes = self.widget_classes()
+        sample = {
+            "time": datetime.now().strftime("%H:%M:%S"),
+            "widgets": sum(classes.values()),
+            "toplevels": classes.get("Toplevel", 0),
+            "commands": len(self.root.tk.splitlist(self.root.tk.call("info", "commands"))),
+            "variables": len(self.root.tk.splitlist(self.root.tk.call("info", "globals"))),
+            "python_objects": len(gc.get_objects()),
+            "traced_kb": tracemalloc.get_traced_memory()[0] // 1024 if tracemalloc.is_tracing() else 0,
+            "classes": classes,
+        }
+        self.samples.append(sample)
+        return sample
+
+    def growth(self, first=None, last=None):
+        first = first or (self.samples[0] if self.samples else None)
+        last = last or (self.samples[-1] if self.samples else None)
+        if first is None:
+            return {}
+        return {metric: last[metric] - first[metric] for metric in self.METRICS}
+
+    def top_allocations(self, limit=10):
+        # Крупнейшие места выделения памяти; со второго вызова — прирост с прошлого снимка
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        if self.previous_snapshot is None:
+            stats = snapshot.statistics("lineno")
+        else:
+            stats = snapshot.compare_to(self.previous_snapshot, "lineno")
+        self.previous_snapshot = snapshot
+        return stats[:limit]
+
+
 class ProjectTracker:
     def __init__(self, root):
         self.root = root
         self.root.title("Motion Projects Upload Tracker")
 
-        # Категории платформ
-        self.platform_categories = {
+        # Категории платформ (по умолчанию для новых рабочих пространств)
+        self.default_platform_categories = {
             "Motion Array": ["AET", "PPT", "AEFX", "PPFX", "FCPX", "DRT", "DRM"],
             "Adobe Stock": ["AET", "PPT", "MGT"],
             "Envato": ["AET", "PPT", "AEFX", "PPFX", "FCPX", "DRT", "DRM"],
@@ -51,7 +2279,7 @@ class ProjectTracker:
         }
 
         # Цвета платформ
-        self.platform_colors = {
+        self.default_platform_colors = {
             "Motion Array": "#F0F4FF",
             "Adobe Stock": "#FFF0F4",
             "Envato": "#F0FFF4",
@@ -63,18 +2291,46 @@ class ProjectTracker:
             "FilterGrade": "#F0FFF8"
         }
 
+        # Рабочие пространства: по умолчанию — папка запуска, как раньше
+        self.app_dir = os.getcwd()
+        self.app_settings_path = os.path.join(self.app_dir, "settings.json")
+        self.workspace_dir = self.app_dir
+        self.known_workspaces = [self.app_dir]
+        self.workspaces = WorkspaceManager(self._load_workspace, on_evict=self._close_workspace)
+        # Файлы пространств, прочитанные в фоне и ещё не собранные в Workspace; последнее запрошенное пространство
+        self.workspace_files = {}
+        self.requested_workspace = None
+        # Вся запись на диск идёт через фоновый исполнитель, окно не ждёт файловую систему
+        self.io_executor = IOExecutor(self.root)
+
         # Инициализация хранения данных
-        self.projects = {}
+        self._reset_workspace_state()
         self.load_platform_data()
         self.load_data()
+        self.workspaces.active = Workspace(self.workspace_dir)
+        self.workspaces.add(self.workspaces.active)
 
-        # Инициализация состояний сворачивания/разворачивания
-        self.platform_states = {}
-        self.year_states = {}
-        self.month_states = {}
         self.platform_header_frames = {}
         self.month_frames = {}  # Добавлено для хранения фреймов месяцев
 
+        # Клавиатурная навигация: таблица ячеек строится при каждой отрисовке
+        self.month_cells = {}
+        self.cell_grid = []
+        self.grid_months = []
+        self.cell_positions = {}
+        self.focused_cell = None
+        self.focused_widget = None
+        # Рамка фокуса постоянной толщины: меняется только её цвет, размер ячеек не прыгает
+        self.cell_border_color = ttk.Style().lookup("TFrame", "background") or "#D9D9D9"
+        self.cell_border = dict(highlightthickness=2, highlightbackground=self.cell_border_color,
+                                highlightcolor=self.cell_border_color)
+        self.scroll_target = None
+        self.scroll_job = None
+        self.persist_job = None
+
+        # Строка состояния создаётся до панелей, чтобы остаться внизу окна
+        self.create_status_bar()
+
         # Создание основных панелей
         self.main_paned = ttk.PanedWindow(self.root, orient=tk.HORIZONTAL)
         self.main_paned.pack(fill=tk.BOTH, expand=True)
@@ -97,6 +2353,7 @@ class ProjectTracker:
         }
 
         # Создание компонентов интерфейса
+        self.create_workspace_panel()
         self.create_input_panel()
         self.create_statistics_panel()
         self.create_matrix_view()
@@ -108,18 +2365,252 @@ class ProjectTracker:
         # Обработчик события изменения размера окна
         self.root.bind("<Configure>", self.on_window_resize)
 
+        # Клавиши навигации по матрице
+        self.bind_matrix_keys()
+
         # Обновление матрицы
         self.update_matrix()
 
         # Загрузка настроек
         self.root.after(100, self.load_settings)
 
+        # Периодические замеры ресурсов для окна диагностики
+        self.diagnostics = Diagnostics(self.root)
+        self.root.after(1000, self.sample_diagnostics)
+
         # Привязка события закрытия окна
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    # Атрибуты, которые относятся к набору данных и переключаются вместе с рабочим пространством
+    WORKSPACE_ATTRS = ('projects', 'platform_categories', 'platform_colors', 'month_index', 'status_history',
+                       'status_cache', 'status_totals', 'aging_index', 'month_order', 'metrics', 'backups', 'name_index',
+                       'platform_states', 'year_states', 'month_states')
+
+    def data_path(self, filename):
+        return os.path.join(self.workspace_dir, filename)
+
+    def _open_stores(self, directory):
+        # Хранилища читают свои файлы при создании, поэтому для другого пространства создаются в рабочем потоке
+        def path(filename):
+            return os.path.join(directory, filename)
+
+        return {
+            'status_history': StatusHistory(path("status_history.bin"), path("status_history_names.jsonl"),
+                                            submit=self._io_writer(path("status_history.bin"),
+                                                                   "Запись истории статусов")),
+            'metrics': MetricsStore(path("metrics_data.npz"),
+                                    submit=self._io_writer(path("metrics_data.npz"), "Сохранение метрик")),
+            'backups': BackupStore(path("backups")),
+        }
+
+    def _reset_workspace_state(self, stores=None):
+        stores = stores or self._open_stores(self.workspace_dir)
+        self.projects = {}
+        self.platform_categories = {platform: list(categories)
+                                    for platform, categories in self.default_platform_categories.items()}
+        self.platform_colors = dict(self.default_platform_colors)
+        self.month_index = MonthIndex()
+        self.status_history = stores['status_history']
+        # Кэш сводных статусов: проект -> {платформа: (сводный статус, счётчик статусов ячеек)}
+        self.status_cache = {}
+        self.status_totals = Counter()
+        self.aging_index = AgingIndex()
+        self.month_order = MonthOrder()
+        self.metrics = stores['metrics']
+        self.backups = stores['backups']
+        self.name_index = NameIndex()
+        # Состояния сворачивания/разворачивания
+        self.platform_states = {}
+        self.year_states = {}
+        self.month_states = {}
+
+    def _io_writer(self, lane, description):
+        # Функция записи для хранилищ: запись уходит в фоновую полосу своего файла
+        return lambda write: self.io_executor.submit(lambda task: write(), lane=lane, description=description)
+
+    def _capture_workspace_state(self):
+        return {attr: getattr(self, attr) for attr in self.WORKSPACE_ATTRS}
+
+    def _restore_workspace_state(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    def _read_workspace(self, directory):
+        # Выполняется в рабочем потоке: только чтение файлов пространства, без Tk и текущих данных
+        def read(filename, what):
+            try:
+                return read_json_file(os.path.join(directory, filename))
+            except Exception as e:
+                print(f"Ошибка загрузки {what}: {e}")
+                return {}
+
+        stores = self._open_stores(directory)
+        return {'stores': stores,
+                'platform_data': read("platforms_data.json", "данных платформ"),
+                'projects': self.read_projects_files(directory, stores['backups']),
+                'view_states': read("settings.json", "настроек")}
+
+    def _prefetch_workspaces(self, paths, then):
+        # Файлы ещё не открытых пространств читаются в фоне — после их незаконченных записей.
+        # then() вызывается в потоке Tk, когда чтение закончено; ошибки показываются сразу
+        missing = {path for path in map(os.path.abspath, paths)
+                   if path not in self.workspaces.cache and path not in self.workspace_files}
+        if not missing:
+            then()
+            return
+
+        def finish(path, files=None):
+            # Пространство могли открыть другим запросом, пока шло чтение
+            if files is not None and path not in self.workspaces.cache:
+                self.workspace_files[path] = files
+            missing.discard(path)
+            if not missing:
+                then()
+
+        def failed(path, error):
+            messagebox.showwarning("Рабочее пространство", f"Не удалось открыть '{path}': {error}")
+            finish(path)
+
+        for path in list(missing):
+            self.io_executor.submit(lambda task, path=path: self._read_workspace(path),
+                                    on_done=lambda files, path=path: finish(path, files),
+                                    on_error=lambda e, path=path: failed(path, e),
+                                    after=os.path.join(path, ""), description="Открытие рабочего пространства")
+
+    def _workspace_ready(self, path):
+        return path in self.workspaces.cache or path in self.workspace_files
+
+    def _load_workspace(self, workspace):
+        # Собирает неактивное пространство из прочитанных в фоне файлов теми же методами,
+        # не трогая текущие данные и интерфейс
+        files = self.workspace_files.pop(workspace.path)
+        current_state = self._capture_workspace_state()
+        current_dir = self.workspace_dir
+        try:
+            self.workspace_dir = workspace.path
+            self._reset_workspace_state(files['stores'])
+            self.load_platform_data(files['platform_data'])
+            self.load_data(files['projects'])
+            self.load_view_states(files['view_states'])
+            workspace.state = self._capture_workspace_state()
+        finally:
+            self.workspace_dir = current_dir
+            self._restore_workspace_state(current_state)
+
+    def _close_workspace(self, workspace):
+        self.workspace_files.pop(workspace.path, None)
+        state = workspace.state
+        state['status_history'].flush()
+        self.backup_snapshot(force=True, state=state)
+        state['metrics'].save()
+        self.save_view_states(workspace.path, state['platform_states'], state['year_states'], state['month_states'])
+
+    def switch_workspace(self, path):
+        # Незагруженное пространство читается в фоне; переключение происходит, когда файлы прочитаны,
+        # если за это время не запросили другое
+        path = os.path.abspath(path)
+        self.requested_workspace = path
+        if path != self.workspace_dir:
+            self._prefetch_workspaces([path], lambda: self._activate_workspace(path))
+
+    def _activate_workspace(self, path):
+        if path != self.requested_workspace or path == self.workspace_dir:
+            return
+        if not self._workspace_ready(path):
+            # Чтение не удалось, предупреждение уже показано: в списке остаётся текущее пространство
+            self.workspace_var.set(self.workspace_dir)
+            return
+        self.flush_persist()
+        self.set_focus(None)
+        active = self.workspaces.active
+        active.state = self._capture_workspace_state()
+        self.save_view_states(active.path, self.platform_states, self.year_states, self.month_states)
+
+        try:
+            workspace = self.workspaces.get(path)
+        except Exception as e:
+            messagebox.showwarning("Рабочее пространство", f"Не удалось открыть '{path}': {e}")
+            return
+        self.workspaces.active = workspace
+        self.workspace_dir = workspace.path
+        self._restore_workspace_state(workspace.state)
+        if path not in self.known_workspaces:
+            self.known_workspaces.append(path)
+        self.workspace_var.set(path)
+        self.workspace_cb.config(values=self.known_workspaces)
+        self.root.title(f"Motion Projects Upload Tracker — {workspace.name}")
+
+        self.update_platform_checkboxes()
+        self.update_platform_filter()
+        self.update_matrix()
+
+    def open_workspace_folder(self):
+        path = fd.askdirectory(title="Папка рабочего пространства")
+        if path:
+            self.switch_workspace(path)
+
+    def show_workspaces_summary(self):
+        paths = [os.path.abspath(path) for path in self.known_workspaces if os.path.isdir(path)]
+        self._prefetch_workspaces(paths, lambda: self._show_workspaces_summary(paths))
+
+    def _show_workspaces_summary(self, paths):
+        self.workspaces.active.state = self._capture_workspace_state()
+        paths = [path for path in paths if self._workspace_ready(path)]
+        view = self.workspaces.merged_view(paths)
+        totals = view.status_totals()
+
+        summary_window = tk.Toplevel(self.root)
+        summary_window.title("Сводка по рабочим пространствам")
+        columns = ["workspace", "projects"] + list(self.status_colors.keys())
+        tree = ttk.Treeview(summary_window, columns=columns, show="headings", height=len(paths) + 2)
+        for column, heading in zip(columns, ["Пространство", "Проектов"] + list(self.status_colors.keys())):
+            tree.heading(column, text=heading)
+            tree.column(column, width=100 if column != "workspace" else 180)
+        for workspace in view.workspaces:
+            counts = totals[workspace.path]
+            tree.insert("", tk.END, values=[view.labels[workspace.path], len(workspace.state['projects'])] +
+                                           [counts.get(status, 0) for status in self.status_colors])
+        tree.insert("", tk.END, values=["Всего", len(view)] +
+                                       [totals[None].get(status, 0) for status in self.status_colors])
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    def create_status_bar(self):
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.io_status_label = ttk.Label(status_frame, text="", anchor=tk.W)
+        self.io_status_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.io_cancel_button = ttk.Button(status_frame, text="Отмена", command=self.io_executor.cancel,
+                                           state=tk.DISABLED)
+        self.io_cancel_button.pack(side=tk.RIGHT, padx=5, pady=1)
+        self.io_executor.on_status = self.set_io_status
+
+    def set_io_status(self, text, error=False, busy=False, cancellable=False):
+        self.io_status_label.config(text=text, foreground="#B00020" if error else "")
+        self.io_cancel_button.config(state=tk.NORMAL if cancellable else tk.DISABLED)
+
+    def create_workspace_panel(self):
+        workspace_frame = ttk.LabelFrame(self.left_panel, text="Рабочее пространство", padding="5")
+        workspace_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.workspace_var = tk.StringVar(value=self.workspace_dir)
+        self.workspace_cb = ttk.Combobox(workspace_frame, textvariable=self.workspace_var,
+                                         values=self.known_workspaces, state="readonly")
+        self.workspace_cb.pack(fill=tk.X, pady=2)
+        self.workspace_cb.bind("<<ComboboxSelected>>", lambda e: self.switch_workspace(self.workspace_var.get()))
+
+        buttons_frame = ttk.Frame(workspace_frame)
+        buttons_frame.pack(fill=tk.X)
+        ttk.Button(buttons_frame, text="Открыть папку...",
+                   command=self.open_workspace_folder).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Сводка", command=self.show_workspaces_summary).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Копии", command=self.show_backups).pack(side=tk.LEFT, padx=2)
+
     def create_tooltip(self, widget, text):
         def enter(event):
-            tooltip = tk.Toplevel()
+            leave(event)
+            # Подсказка — дочернее окно виджета и уничтожается вместе с ним, даже если
+            # виджет перерисовали под курсором и <Leave> так и не пришёл
+            tooltip = tk.Toplevel(widget)
             tooltip.wm_overrideredirect(True)
             tooltip.wm_geometry(f"+{event.x_root + 10}+{event.y_root + 10}")
 
@@ -130,7 +2621,8 @@ class ProjectTracker:
 
         def leave(event):
             if hasattr(widget, "tooltip"):
-                widget.tooltip.destroy()
+                if widget.tooltip.winfo_exists():
+                    widget.tooltip.destroy()
                 delattr(widget, "tooltip")
 
         widget.bind("<Enter>", enter)
@@ -155,9 +2647,9 @@ class ProjectTracker:
 
         # Месяц
         ttk.Label(input_frame, text="Месяц:").pack(fill=tk.X)
-        self.month_var = tk.StringVar(value=datetime.now().strftime("%B"))
+        self.month_var = tk.StringVar(value=month_name(datetime.now().month))
         self.month_cb = ttk.Combobox(input_frame, textvariable=self.month_var,
-                                     values=[datetime(2000, m, 1).strftime('%B') for m in range(1, 13)], width=10)
+                                     values=[month_name(m) for m in range(1, 13)], width=10)
         self.month_cb.pack(fill=tk.X, padx=5, pady=2)
 
         # Флажки платформ
@@ -186,6 +2678,7 @@ class ProjectTracker:
 
         # Кнопка добавления платформы
         ttk.Button(input_frame, text="Добавить платформу", command=self.add_platform).pack(fill=tk.X, pady=5)
+        ttk.Button(input_frame, text="Схема платформ", command=self.edit_platform_schema).pack(fill=tk.X, pady=5)
 
     def set_all_platforms(self, value):
         for var in self.platform_vars.values():
@@ -254,12 +2747,37 @@ class ProjectTracker:
         ttk.Label(filters_frame, text="Фильтр по платформе:").pack(fill=tk.X, padx=5, pady=2)
         self.platform_filter_var = tk.StringVar(value="All")
         platform_values = ["All"] + list(self.platform_categories.keys())
-        platform_filter_cb = ttk.Combobox(filters_frame, textvariable=self.platform_filter_var, values=platform_values,
-                                          state="readonly")
-        platform_filter_cb.pack(fill=tk.X, padx=5, pady=2)
+        self.platform_filter_cb = ttk.Combobox(filters_frame, textvariable=self.platform_filter_var,
+                                               values=platform_values, state="readonly")
+        self.platform_filter_cb.pack(fill=tk.X, padx=5, pady=2)
+
+        # Режим отображения: статусы или тепловая карта метрик
+        ttk.Label(filters_frame, text="Режим отображения:").pack(fill=tk.X, padx=5, pady=2)
+        self.view_mode_var = tk.StringVar(value="Статусы")
+        ttk.Combobox(filters_frame, textvariable=self.view_mode_var, values=list(VIEW_MODES.keys()),
+                     state="readonly").pack(fill=tk.X, padx=5, pady=2)
+
+        # Постраничный показ больших месяцев
+        ttk.Label(filters_frame, text="Сортировка в месяце:").pack(fill=tk.X, padx=5, pady=2)
+        self.month_sort_var = tk.StringVar(value="Название")
+        month_sort_cb = ttk.Combobox(filters_frame, textvariable=self.month_sort_var,
+                                     values=list(MonthOrder.SORTS.keys()), state="readonly")
+        month_sort_cb.pack(fill=tk.X, padx=5, pady=2)
+        month_sort_cb.bind("<<ComboboxSelected>>", lambda event: self.reset_month_pages())
+        page_frame = ttk.Frame(filters_frame)
+        page_frame.pack(fill=tk.X, padx=5, pady=2)
+        ttk.Label(page_frame, text="Проектов на странице (0 — все):").pack(side=tk.LEFT)
+        self.page_size_var = tk.IntVar(value=50)
+        page_spinbox = ttk.Spinbox(page_frame, from_=0, to=1000, increment=10, textvariable=self.page_size_var,
+                                   width=5, command=self.reset_month_pages)
+        page_spinbox.pack(side=tk.LEFT, padx=5)
+        page_spinbox.bind("<Return>", lambda event: self.reset_month_pages())
+        self.month_pages = {}
 
         # Кнопка применения фильтра
         ttk.Button(filters_frame, text="Применить фильтр", command=self.update_matrix).pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(filters_frame, text="Метрики", command=self.show_metrics).pack(fill=tk.X, padx=5, pady=2)
+        ttk.Button(filters_frame, text="Диагностика", command=self.show_diagnostics).pack(fill=tk.X, padx=5, pady=2)
 
         # Кнопки импорта и экспорта
         buttons_frame = ttk.Frame(self.right_panel)
@@ -267,23 +2785,127 @@ class ProjectTracker:
 
         ttk.Button(buttons_frame, text="Импорт CSV", command=self.import_from_csv).pack(side=tk.RIGHT, padx=5)
         ttk.Button(buttons_frame, text="Экспорт CSV", command=self.export_to_csv).pack(side=tk.RIGHT)
+        ttk.Button(buttons_frame, text="Экспорт JSON", command=self.export_to_json).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(buttons_frame, text="История", command=self.show_status_history).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(buttons_frame, text="Сверка", command=self.reconcile_marketplace).pack(side=tk.RIGHT)
+        ttk.Button(buttons_frame, text="Отчёты", command=self.generate_reports).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(buttons_frame, text="Дубликаты", command=self.find_duplicates).pack(side=tk.RIGHT)
 
+        self.create_attention_panel()
         self.update_statistics()
 
-    def update_statistics(self):
-        status_counts = {status: 0 for status in self.status_colors.keys()}
-
-        for project in self.projects.values():
-            for platform in project:
-                if platform in ['year', 'month']:
-                    continue
-                for category in project[platform]:
-                    status = project[platform][category]['status']
-                    status_counts[status] += 1
+    def create_attention_panel(self):
+        attention_frame = ttk.LabelFrame(self.right_panel, text="Требует внимания", padding="5")
+        attention_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        options_frame = ttk.Frame(attention_frame)
+        options_frame.pack(fill=tk.X)
+        self.attention_status_var = tk.StringVar(value="Pending")
+        ttk.Combobox(options_frame, textvariable=self.attention_status_var, values=list(AgingIndex.TRACKED_STATUSES),
+                     state="readonly", width=12).pack(side=tk.LEFT, padx=2)
+        ttk.Label(options_frame, text="дней >").pack(side=tk.LEFT)
+        self.attention_days_var = tk.IntVar(value=14)
+        ttk.Spinbox(options_frame, from_=0, to=365, textvariable=self.attention_days_var,
+                    width=4).pack(side=tk.LEFT, padx=2)
+
+        self.attention_platform_var = tk.StringVar(value="All")
+        self.attention_platform_cb = ttk.Combobox(attention_frame, textvariable=self.attention_platform_var,
+                                                  values=["All"] + list(self.platform_categories.keys()),
+                                                  state="readonly")
+        self.attention_platform_cb.pack(fill=tk.X, padx=2, pady=2)
+
+        self.attention_count_label = ttk.Label(attention_frame, text="")
+        self.attention_count_label.pack(fill=tk.X, padx=2)
+        self.attention_list = tk.Listbox(attention_frame, height=10, font=("Arial", 8))
+        self.attention_list.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
+        self.attention_list.bind("<Double-Button-1>", self.select_attention_item)
+        self.attention_items = []
+
+        for var in (self.attention_status_var, self.attention_days_var, self.attention_platform_var):
+            var.trace_add("write", lambda *args: self.update_attention_panel())
+
+    def update_attention_panel(self, limit=100):
+        try:
+            days = self.attention_days_var.get()
+        except tk.TclError:
+            return
+        status = self.attention_status_var.get()
+        platform = self.attention_platform_var.get()
+        platform = None if platform == "All" else platform
+        self.attention_items = self.aging_index.older_than(status, days, platform, limit=limit)
+        count = self.aging_index.count_older_than(status, days, platform)
+        self.attention_count_label.config(text=f"Найдено: {count}")
+        self.attention_list.delete(0, tk.END)
+        for day, project, item_platform, category in self.attention_items:
+            self.attention_list.insert(tk.END, f"{day}  {project} — {item_platform} {category}")
+
+    def select_attention_item(self, event=None):
+        selection = self.attention_list.curselection()
+        if selection:
+            project = self.attention_items[selection[0]][1]
+            self.project_name.delete(0, tk.END)
+            self.project_name.insert(0, project)
 
+    def update_statistics(self):
         for status, label in self.stats_labels.items():
-            count = status_counts.get(status, 0)
+            count = self.status_totals.get(status, 0)
             label.config(text=f"{status}: {count}")
+        self.update_attention_panel()
+
+    def _refresh_summary(self, project, platform):
+        # Пересчитывает одну запись кэша и поправляет общие итоги на разницу.
+        # Сводный статус считается по категориям схемы (недостающая категория — "Not Uploaded"),
+        # а счётчик для итогов и фильтра — по сохранённым ячейкам, в том числе вне схемы
+        summaries = self.status_cache.get(project, {})
+        old = summaries.pop(platform, None)
+        if old is not None:
+            self.status_totals.subtract(old[1])
+        project_data = self.projects.get(project)
+        if project_data is not None and platform in project_data:
+            platform_data = project_data[platform]
+            categories = self.platform_categories.get(platform, ())
+            schema_counts = Counter(platform_data[category]['status'] if category in platform_data else "Not Uploaded"
+                                    for category in categories)
+            counts = Counter(details['status'] for details in platform_data.values())
+            summaries[platform] = (aggregate_status(schema_counts, len(categories)), counts)
+            self.status_totals.update(counts)
+        if summaries:
+            self.status_cache[project] = summaries
+        else:
+            self.status_cache.pop(project, None)
+
+    def refresh_project_summaries(self, project):
+        # Вызывается после любого изменения проекта помимо _set_cell_status. Обходятся и платформы
+        # из кэша: удалённый или перезаписанный проект мог содержать платформы вне схемы
+        self._touch_project(project)
+        project_data = self.projects.get(project, {})
+        for platform in set(self.status_cache.get(project, ())) | set(project_data):
+            if platform not in ['year', 'month']:
+                self._refresh_summary(project, platform)
+        self.aging_index.update_project(project, self.projects.get(project))
+        self.month_order.update_project(project, self.projects.get(project))
+
+    def _touch_project(self, project):
+        # Отмечает шард резервной копии, в котором сейчас лежит проект
+        project_data = self.projects.get(project)
+        if project_data is not None:
+            self.backups.mark_dirty(project_data.get('year'), project_data.get('month'))
+
+    def rebuild_status_cache(self):
+        self.status_cache = {}
+        self.status_totals = Counter()
+        for project, project_data in self.projects.items():
+            for platform in project_data:
+                if platform not in ['year', 'month']:
+                    self._refresh_summary(project, platform)
+        self.aging_index.rebuild(self.projects)
+        self.month_order.rebuild(self.projects)
+        self.name_index = NameIndex(self.projects)
+        self.backups.mark_all_dirty()
+
+    def get_platform_status(self, project, platform):
+        summary = self.status_cache.get(project, {}).get(platform)
+        return summary[0] if summary else "Not Uploaded"
 
     def create_legend(self):
         legend_frame = ttk.LabelFrame(self.left_panel, text="Обозначения", padding="5")
@@ -323,21 +2945,16 @@ class ProjectTracker:
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
 
-        grouped_projects = {}
-        for project_name, project_data in self.projects.items():
-            year = project_data.get('year')
-            month = project_data.get('month')
-            if year and month:
-                grouped_projects.setdefault(year, {}).setdefault(month, {})[project_name] = project_data
-
         row_counter = [0]
+        self.month_cells = {}
 
-        for year in sorted(grouped_projects.keys(), reverse=True):
-            self.create_year_frame(year, grouped_projects[year], row_counter)
+        for year in self.month_index.years():
+            self.create_year_frame(year, self.month_index.months(year), row_counter)
 
+        self.rebuild_cell_grid()
         self.update_statistics()
 
-    def create_year_frame(self, year, months_data, row_counter):
+    def create_year_frame(self, year, months, row_counter):
         year_header_frame = ttk.Frame(self.scrollable_frame)
         year_header_frame.grid(row=row_counter[0], column=0, sticky="nsew", padx=5, pady=5)
         self.scrollable_frame.grid_rowconfigure(row_counter[0], weight=1)
@@ -378,9 +2995,9 @@ class ProjectTracker:
         # Инициализация счетчика строк для месяцев внутри года
         month_row_counter = [0]
 
-        for month in sorted(months_data.keys(), key=lambda m: datetime.strptime(m, '%B').month,
-                            reverse=True):
-            self.create_month_frame(year, month, months_data[month], year_projects_frame, month_row_counter)
+        for month in months:
+            self.create_month_frame(year, month, self.month_index.projects[(year, month)],
+                                    year_projects_frame, month_row_counter)
 
     def create_month_frame(self, year, month, projects_data, parent_frame, row_counter):
         month_header_frame = ttk.Frame(parent_frame)
@@ -402,7 +3019,7 @@ class ProjectTracker:
         month_symbol_label = ttk.Label(month_header_frame,
                                        text="▼" if not is_month_collapsed.get() else "▶", width=2)
         month_symbol_label.pack(side=tk.LEFT)
-        month_label = ttk.Label(month_header_frame, text=month, font=("Arial", 10, "bold"))
+        month_label = ttk.Label(month_header_frame, text=month_name(month), font=("Arial", 10, "bold"))
         month_label.pack(side=tk.LEFT)
 
         def toggle_month_frame(event=None):
@@ -425,109 +3042,184 @@ class ProjectTracker:
         self.month_frames[(year, month)] = month_projects_frame
         month_projects_frame.projects_data = projects_data
 
+        # Переключатель страниц; скрыт, пока месяц помещается на одну страницу
+        pager = ttk.Frame(month_header_frame)
+        pager.pack(side=tk.LEFT, padx=10)
+        ttk.Button(pager, text="◀", width=2,
+                   command=lambda: self.change_month_page(year, month, -1)).pack(side=tk.LEFT)
+        month_projects_frame.page_label = ttk.Label(pager, text="")
+        month_projects_frame.page_label.pack(side=tk.LEFT, padx=4)
+        ttk.Button(pager, text="▶", width=2,
+                   command=lambda: self.change_month_page(year, month, 1)).pack(side=tk.LEFT)
+        month_projects_frame.pager = pager
+
         self.create_matrix_headers(month_projects_frame, year, month)
         self.populate_projects(month_projects_frame, year, month, projects_data)
 
+    def page_size(self):
+        # Пустое или нечисловое поле означает показ всех проектов
+        try:
+            return max(self.page_size_var.get(), 0)
+        except tk.TclError:
+            return 0
+
+    def platform_state(self, year, month, platform):
+        # Переменная создаётся только для нового ключа: get() с BooleanVar по умолчанию
+        # заводил новую переменную Tcl на каждый вызов
+        key = (year, month, platform)
+        state = self.platform_states.get(key)
+        if state is None:
+            state = self.platform_states[key] = tk.BooleanVar(value=True)
+        return state
+
+    def month_page(self, year, month, month_projects_frame):
+        # Проекты текущей страницы месяца берутся из упорядоченного индекса, без сортировки на лету
+        page_size = self.page_size()
+        sort = MonthOrder.SORTS.get(self.month_sort_var.get(), "name")
+        filtered = (self.filter_vars['search'].get() or self.platform_filter_var.get() != "All"
+                    or self.status_filter_var.get() != "All")
+        predicate = self.should_show_project if filtered else None
+        page = self.month_pages.get((year, month), 0)
+        projects, total = self.month_order.page(year, month, sort, page * page_size, page_size, predicate)
+        pages = max(1, -(-total // page_size)) if page_size else 1
+        if page >= pages:
+            page = self.month_pages[(year, month)] = pages - 1
+            projects, total = self.month_order.page(year, month, sort, page * page_size, page_size, predicate)
+
+        pager = getattr(month_projects_frame, 'pager', None)
+        if pager is not None:
+            if pages > 1:
+                month_projects_frame.page_label.config(text=f"{page + 1} / {pages}  ({total})")
+                pager.pack(side=tk.LEFT, padx=10)
+            else:
+                pager.pack_forget()
+        return projects
+
+    def change_month_page(self, year, month, step):
+        # Перерисовывается только этот месяц
+        self.month_pages[(year, month)] = max(self.month_pages.get((year, month), 0) + step, 0)
+        month_frame = self.month_frames.get((year, month))
+        if month_frame is None or not month_frame.winfo_exists():
+            return
+        self.populate_projects(month_frame, year, month, month_frame.projects_data)
+        self.rebuild_cell_grid()
+
+    def reset_month_pages(self):
+        self.month_pages = {}
+        self.update_matrix()
+
     def populate_projects(self, month_projects_frame, year, month, projects_data):
         # Удаляем существующие строки проектов
         for widget in month_projects_frame.winfo_children():
             if widget.grid_info().get('row', 0) >= 2:
                 widget.destroy()
 
+        # Режим определяется один раз на отрисовку, чтобы не замедлять обычный режим статусов
+        metric = VIEW_MODES.get(self.view_mode_var.get())
+        metric_max = self.metrics.max_value(metric) if metric else None
+
+        # Начальные столбцы платформ и общее число столбцов — для плотной таблицы навигации
+        # Состояния платформ читаются один раз на месяц, а не для каждой ячейки
+        platform_starts = []
+        total_columns = 0
+        expanded = {}
+        for platform, categories in self.platform_categories.items():
+            expanded[platform] = self.platform_state(year, month, platform).get()
+            platform_starts.append(total_columns)
+            total_columns += len(categories) if expanded[platform] else 1
+        month_rows = []
+        self.month_cells[(year, month)] = {'rows': month_rows, 'platform_starts': platform_starts}
+
         project_row = 2
-        for project in sorted(projects_data.keys()):
-            if self.should_show_project(project):
-                label = ttk.Label(month_projects_frame, text=project)
-                label.grid(row=project_row, column=0, sticky="nsew")
-                self.create_tooltip(label, project)
-                month_projects_frame.grid_rowconfigure(project_row, weight=1)
-
-                col = 1
-                project_data = self.projects[project]
-                for platform in self.platform_categories.keys():
-                    key = (year, month, platform)
-                    is_expanded = self.platform_states.get(key, tk.BooleanVar(value=True))
-                    self.platform_states[key] = is_expanded
-                    if platform in project_data:
-                        platform_filter = self.platform_filter_var.get()
-                        if platform_filter != "All" and platform != platform_filter:
-                            if is_expanded.get():
-                                col += len(self.platform_categories[platform])
-                            else:
-                                col += 1
-                            continue
-                        if is_expanded.get():
-                            for category in self.platform_categories[platform]:
-                                try:
-                                    status = self.get_status(project, platform, category)
-                                    if self.status_filter_var.get() != "All" and status != self.status_filter_var.get():
-                                        cell = tk.Frame(month_projects_frame, width=20, height=20)
-                                        cell.grid(row=project_row, column=col, sticky="nsew", padx=1, pady=1)
-                                        col += 1
-                                        continue
-                                    cell = tk.Frame(
-                                        month_projects_frame,
-                                        bg=self.status_colors[status],
-                                        width=20,
-                                        height=20
-                                    )
-                                    cell.grid(row=project_row, column=col, sticky="nsew", padx=1, pady=1)
-                                    cell.bind("<Button-1>",
-                                              lambda e, p=project, plf=platform, cat=category, b=cell:
-                                              self.cycle_status(p, plf, cat, b))
-                                    cell.bind("<Button-3>",
-                                              lambda e, p=project, plf=platform, cat=category, b=cell:
-                                              self.show_context_menu(e, p, plf, cat, b))
-                                except KeyError:
-                                    cell = tk.Frame(
-                                        month_projects_frame,
-                                        bg=self.status_colors["Not Uploaded"],
-                                        width=20,
-                                        height=20
-                                    )
-                                    cell.grid(row=project_row, column=col, sticky="nsew", padx=1, pady=1)
-                                col += 1
-                        else:
-                            try:
-                                statuses = [self.get_status(project, platform, category)
-                                            for category in self.platform_categories[platform]]
-                                if all(status == "Uploaded" for status in statuses):
-                                    platform_status = "Uploaded"
-                                elif any(status == "Rejected" for status in statuses):
-                                    platform_status = "Rejected"
-                                elif any(status == "Pending" for status in statuses):
-                                    platform_status = "Pending"
-                                elif all(status == "Disabled" for status in statuses):
-                                    platform_status = "Disabled"
-                                else:
-                                    platform_status = "Not Uploaded"
-                            except KeyError:
-                                platform_status = "Not Uploaded"
-
-                            if self.status_filter_var.get() != "All" and platform_status != self.status_filter_var.get():
+        for project in self.month_page(year, month, month_projects_frame):
+            month_rows.append(self._populate_project_row(month_projects_frame, project, project_row, total_columns,
+                                                         expanded, metric, metric_max))
+            project_row += 1
+
+    def _populate_project_row(self, month_projects_frame, project, project_row, total_columns, expanded,
+                              metric, metric_max):
+        # Одна строка проекта в матрице месяца; возвращает её ячейки для таблицы навигации
+        row_cells = [None] * total_columns
+        label = ttk.Label(month_projects_frame, text=project)
+        label.grid(row=project_row, column=0, sticky="nsew")
+        self.create_tooltip(label, project)
+        month_projects_frame.grid_rowconfigure(project_row, weight=1)
+
+        col = 1
+        project_data = self.projects[project]
+        for platform in self.platform_categories.keys():
+            is_expanded = expanded[platform]
+            if platform in project_data:
+                platform_filter = self.platform_filter_var.get()
+                if platform_filter != "All" and platform != platform_filter:
+                    if is_expanded:
+                        col += len(self.platform_categories[platform])
+                    else:
+                        col += 1
+                    continue
+                if is_expanded:
+                    for category in self.platform_categories[platform]:
+                        try:
+                            status = self.get_status(project, platform, category)
+                            if self.status_filter_var.get() != "All" and status != self.status_filter_var.get():
                                 cell = tk.Frame(month_projects_frame, width=20, height=20)
                                 cell.grid(row=project_row, column=col, sticky="nsew", padx=1, pady=1)
                                 col += 1
                                 continue
-
                             cell = tk.Frame(
                                 month_projects_frame,
-                                bg=self.status_colors[platform_status],
+                                bg=self.status_colors[status] if metric is None else metric_color(
+                                    self.metrics.cell_value(project, platform, category, metric), metric_max),
                                 width=20,
-                                height=20
+                                height=20,
+                                **self.cell_border
                             )
                             cell.grid(row=project_row, column=col, sticky="nsew", padx=1, pady=1)
                             cell.bind("<Button-1>",
-                                      lambda e, p=project, plf=platform, b=cell:
-                                      self.cycle_platform_status(p, plf, b))
-                            col += 1
-                    else:
-                        if is_expanded.get():
-                            col += len(self.platform_categories[platform])
-                        else:
-                            col += 1
+                                      lambda e, p=project, plf=platform, cat=category, b=cell:
+                                      self.cycle_status(p, plf, cat, b))
+                            cell.bind("<Button-3>",
+                                      lambda e, p=project, plf=platform, cat=category, b=cell:
+                                      self.show_context_menu(e, p, plf, cat, b))
+                            row_cells[col - 1] = (project, platform, category, cell)
+                        except KeyError:
+                            cell = tk.Frame(
+                                month_projects_frame,
+                                bg=self.status_colors["Not Uploaded"],
+                                width=20,
+                                height=20
+                            )
+                            cell.grid(row=project_row, column=col, sticky="nsew", padx=1, pady=1)
+                        col += 1
+                else:
+                    platform_status = self.get_platform_status(project, platform)
 
-                project_row += 1
+                    if self.status_filter_var.get() != "All" and platform_status != self.status_filter_var.get():
+                        cell = tk.Frame(month_projects_frame, width=20, height=20)
+                        cell.grid(row=project_row, column=col, sticky="nsew", padx=1, pady=1)
+                        col += 1
+                        continue
+
+                    cell = tk.Frame(
+                        month_projects_frame,
+                        bg=self.status_colors[platform_status] if metric is None else metric_color(
+                            self.metrics.platform_value(project, platform, metric), metric_max),
+                        width=20,
+                        height=20,
+                        **self.cell_border
+                    )
+                    cell.grid(row=project_row, column=col, sticky="nsew", padx=1, pady=1)
+                    cell.bind("<Button-1>",
+                              lambda e, p=project, plf=platform, b=cell:
+                              self.cycle_platform_status(p, plf, b))
+                    row_cells[col - 1] = (project, platform, None, cell)
+                    col += 1
+            else:
+                if is_expanded:
+                    col += len(self.platform_categories[platform])
+                else:
+                    col += 1
+        return row_cells
 
     def create_matrix_headers(self, parent_frame, year, month):
         # Очистка существующих заголовков
@@ -544,9 +3236,7 @@ class ProjectTracker:
 
         for platform in self.platform_categories.keys():
             platform_categories = self.platform_categories[platform]
-            key = (year, month, platform)
-            is_expanded = self.platform_states.get(key, tk.BooleanVar(value=True))
-            self.platform_states[key] = is_expanded
+            is_expanded = self.platform_state(year, month, platform)
             platform_span = len(platform_categories) if is_expanded.get() else 1
 
             for i in range(platform_span):
@@ -572,15 +3262,14 @@ class ProjectTracker:
             self.create_tooltip(platform_label, tooltip_text)
 
             def toggle_platform(event=None, p=platform, s=platform_symbol_label, y=year, m=month):
-                key = (y, m, p)
-                is_expanded = self.platform_states.get(key, tk.BooleanVar(value=True))
-                self.platform_states[key] = is_expanded
+                is_expanded = self.platform_state(y, m, p)
                 is_expanded.set(not is_expanded.get())
                 s.config(text="▼" if is_expanded.get() else "▶")
                 # Обновляем заголовки и проекты
                 month_frame = self.month_frames[(y, m)]
                 self.create_matrix_headers(month_frame, y, m)
                 self.populate_projects(month_frame, y, m, month_frame.projects_data)
+                self.rebuild_cell_grid()
 
             platform_frame.bind("<Button-1>", toggle_platform)
             platform_symbol_label.bind("<Button-1>", toggle_platform)
@@ -615,21 +3304,27 @@ class ProjectTracker:
                 col += 1
 
     def cycle_platform_status(self, project, platform, button):
+        self.focus_cell(project, platform, None)
         statuses = list(self.status_colors.keys())
-        current_statuses = [self.get_status(project, platform, category)
-                            for category in self.platform_categories[platform]]
-        current_status = current_statuses[0]
+        current_status = self.get_platform_status(project, platform)
         next_status = statuses[(statuses.index(current_status) + 1) % len(statuses)]
 
         for category in self.platform_categories[platform]:
-            self.projects[project][platform][category] = {
-                "status": next_status,
-                "date": datetime.now().strftime("%Y-%m-%d")
-            }
-
-        button.configure(bg=self.status_colors[next_status])
-        self.save_data()
-        self.update_statistics()
+            self._set_cell_status(project, platform, category, next_status)
+
+        button.configure(bg=self.cell_color(project, platform, None, next_status))
+        self.schedule_persist()
+
+    def cell_color(self, project, platform, category, status):
+        # category=None — свёрнутая платформа
+        metric = VIEW_MODES.get(self.view_mode_var.get())
+        if metric is None:
+            return self.status_colors[status]
+        if category is None:
+            value = self.metrics.platform_value(project, platform, metric)
+        else:
+            value = self.metrics.cell_value(project, platform, category, metric)
+        return metric_color(value, self.metrics.max_value(metric))
 
     def add_project(self):
         name = self.project_name.get().strip()
@@ -643,8 +3338,27 @@ class ProjectTracker:
             return
 
         year = self.year_var.get()
-        month = self.month_var.get()
+        month = parse_month(self.month_var.get())
+        if month is None:
+            messagebox.showwarning("Ошибка ввода", "Неверный месяц.")
+            return
 
+        if name in self.projects:
+            if not messagebox.askyesno("Проект существует",
+                                       f"Проект '{name}' уже существует. Заменить его вместе со всеми статусами?"):
+                return
+        else:
+            similar = self.name_index.similar(name)
+            if similar and not messagebox.askyesno(
+                    "Похожие проекты",
+                    "Уже есть похожие проекты:\n" + "\n".join(f"{other} ({score:.0%})" for other, score in similar)
+                    + "\n\nВсё равно добавить?"):
+                return
+
+        previous = self.projects.get(name, {})
+        if name in self.projects:
+            self._touch_project(name)
+            self.month_index.remove(name, self.projects[name].get('year'), self.projects[name].get('month'))
         self.projects[name] = {
             'year': year,
             'month': month
@@ -657,6 +3371,13 @@ class ProjectTracker:
                 }
                 for category in self.platform_categories[platform]
             }
+            # Замена существующего проекта сбрасывает статусы: сброс попадает в историю
+            for category in self.platform_categories[platform]:
+                self._record_transition(name, platform, category,
+                                        previous.get(platform, {}).get(category, {}).get('status'), "Not Uploaded")
+        self.month_index.add(name, year, month)
+        self.name_index.add(name)
+        self.refresh_project_summaries(name)
 
         self.save_data()
         self.update_matrix()
@@ -686,9 +3407,9 @@ class ProjectTracker:
 
         # Месяц
         ttk.Label(edit_window, text="Месяц:").pack(fill=tk.X)
-        month_var = tk.StringVar(value=project_data.get('month', datetime.now().strftime("%B")))
+        month_var = tk.StringVar(value=month_name(project_data.get('month') or datetime.now().month))
         month_cb = ttk.Combobox(edit_window, textvariable=month_var,
-                                values=[datetime(2000, m, 1).strftime('%B') for m in range(1, 13)], width=10)
+                                values=[month_name(m) for m in range(1, 13)], width=10)
         month_cb.pack(fill=tk.X, padx=5, pady=2)
 
         platforms_frame = ttk.LabelFrame(edit_window, text="Платформы")
@@ -705,8 +3426,15 @@ class ProjectTracker:
         buttons_frame.pack(fill=tk.X, padx=5, pady=5)
 
         def save_changes():
+            month = parse_month(month_var.get())
+            if month is None:
+                messagebox.showwarning("Ошибка ввода", "Неверный месяц.", parent=edit_window)
+                return
+            self._touch_project(name)
+            self.month_index.remove(name, self.projects[name].get('year'), self.projects[name].get('month'))
             self.projects[name]['year'] = year_var.get()
-            self.projects[name]['month'] = month_var.get()
+            self.projects[name]['month'] = month
+            self.month_index.add(name, self.projects[name]['year'], month)
 
             for platform, var in platform_vars.items():
                 if var.get():
@@ -718,9 +3446,12 @@ class ProjectTracker:
                             }
                             for category in self.platform_categories[platform]
                         }
+                        for category in self.platform_categories[platform]:
+                            self._record_transition(name, platform, category, None, "Not Uploaded")
                 else:
                     if platform in self.projects[name]:
                         del self.projects[name][platform]
+            self.refresh_project_summaries(name)
 
             self.save_data()
             self.update_matrix()
@@ -735,7 +3466,13 @@ class ProjectTracker:
         if name in self.projects:
             confirm = messagebox.askyesno("Подтвердите удаление", f"Вы уверены, что хотите удалить проект '{name}'?")
             if confirm:
+                self._touch_project(name)
+                self.month_index.remove(name, self.projects[name].get('year'), self.projects[name].get('month'))
+                self.name_index.remove(name)
                 del self.projects[name]
+                self.refresh_project_summaries(name)
+                self.metrics.remove_project(name)
+                self.metrics.save()
                 self.save_data()
                 self.update_matrix()
                 self.update_statistics()
@@ -755,17 +3492,11 @@ class ProjectTracker:
         status_filter = self.status_filter_var.get()
         if status_filter != "All":
             project_has_status = False
-            for platform in self.projects[project]:
-                if platform in ['year', 'month']:
-                    continue
+            for platform, summary in self.status_cache.get(project, {}).items():
                 if platform_filter != "All" and platform != platform_filter:
                     continue
-                for category in self.projects[project][platform]:
-                    status = self.get_status(project, platform, category)
-                    if status == status_filter:
-                        project_has_status = True
-                        break
-                if project_has_status:
+                if summary[1][status_filter]:
+                    project_has_status = True
                     break
             if not project_has_status:
                 return False
@@ -779,18 +3510,285 @@ class ProjectTracker:
             return "Not Uploaded"
 
     def cycle_status(self, project, platform, category, button):
+        self.focus_cell(project, platform, category)
         statuses = list(self.status_colors.keys())
         current = self.get_status(project, platform, category)
         current_index = statuses.index(current)
         next_status = statuses[(current_index + 1) % len(statuses)]
-        self.projects[project][platform][category] = {
-            "status": next_status,
-            "date": datetime.now().strftime("%Y-%m-%d")
+        self._set_cell_status(project, platform, category, next_status)
+        button.configure(bg=self.cell_color(project, platform, category, next_status))
+        self.schedule_persist()
+
+    def _set_cell_status(self, project, platform, category, status, date=None):
+        # Единая точка изменения статуса ячейки: все переходы попадают в историю
+        categories = self.projects[project].setdefault(platform, {})
+        previous = categories.get(category, {}).get('status')
+        categories[category] = {
+            "status": status,
+            "date": date or datetime.now().strftime("%Y-%m-%d")
         }
-        button.configure(bg=self.status_colors[next_status])
+        self._record_transition(project, platform, category, previous, status, date)
+        self._touch_project(project)
+        self._refresh_summary(project, platform)
+        self.aging_index.update(project, platform, category, status, categories[category]["date"])
+        self.month_order.update_project(project, self.projects[project])
+
+    def _record_transition(self, project, platform, category, previous, status, date=None):
+        # Переход датируется переданной датой ячейки (импорт, объединение), иначе — текущим временем
+        if previous == status:
+            return
+        timestamp = None
+        if date:
+            try:
+                timestamp = datetime.strptime(date, "%Y-%m-%d").timestamp()
+            except ValueError:
+                pass
+        self.status_history.record(project, platform, category, previous, status, timestamp)
+
+    def show_status_history(self):
+        history_window = tk.Toplevel(self.root)
+        history_window.title("История статусов")
+
+        text = tk.Text(history_window, width=70, height=30, font=("Courier", 9))
+        text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        text.insert(tk.END, "Время в статусе Pending (дни):\n")
+        for platform in self.platform_categories.keys():
+            durations = self.status_history.time_in_status("Pending", platform=platform) / 86400
+            if len(durations):
+                text.insert(tk.END, f"  {platform:<16} медиана {np.median(durations):6.1f}  "
+                                    f"среднее {durations.mean():6.1f}  макс {durations.max():6.1f}  "
+                                    f"({len(durations)})\n")
+
+        text.insert(tk.END, "\nПереходы по неделям (все / Uploaded / Rejected):\n")
+        total = self.status_history.transitions_per_week()
+        uploaded = self.status_history.transitions_per_week("Uploaded")
+        rejected = self.status_history.transitions_per_week("Rejected")
+        for week in sorted(total, reverse=True)[:26]:
+            text.insert(tk.END, f"  {week}  {total[week]:5}  {uploaded.get(week, 0):5}  {rejected.get(week, 0):5}\n")
+        text.config(state=tk.DISABLED)
+
+    def schedule_persist(self, delay=500):
+        # Серия изменений (клики, автоповтор клавиш) сохраняется одним отложенным вызовом
+        if self.persist_job is not None:
+            self.root.after_cancel(self.persist_job)
+        self.persist_job = self.root.after(delay, self.flush_persist)
+
+    def flush_persist(self):
+        if self.persist_job is None:
+            return
+        self.root.after_cancel(self.persist_job)
+        self.persist_job = None
         self.save_data()
         self.update_statistics()
 
+    def bind_matrix_keys(self):
+        moves = {
+            "<Up>": lambda: self.move_focus(-1, 0), "<Down>": lambda: self.move_focus(1, 0),
+            "<Left>": lambda: self.move_focus(0, -1), "<Right>": lambda: self.move_focus(0, 1),
+            "<Prior>": lambda: self.jump_month(-1), "<Next>": lambda: self.jump_month(1),
+            "<Control-Left>": lambda: self.jump_platform(-1), "<Control-Right>": lambda: self.jump_platform(1),
+            "<Home>": lambda: self.jump_row_edge(False), "<End>": lambda: self.jump_row_edge(True),
+            "<space>": self.cycle_focused_status, "<Escape>": lambda: self.set_focus(None),
+        }
+        for status_index in range(len(self.status_colors)):
+            moves[f"<Key-{status_index + 1}>"] = lambda i=status_index: self.set_focused_status(i)
+        for sequence, action in moves.items():
+            self.root.bind(sequence, lambda event, a=action: self._on_matrix_key(event, a))
+
+    def _on_matrix_key(self, event, action):
+        # Поля ввода, списки и кнопки обрабатывают клавиши сами
+        if event.widget.winfo_class() in ("Entry", "TEntry", "TSpinbox", "Spinbox", "TCombobox", "Text", "Listbox",
+                                          "TButton", "Button", "TCheckbutton", "Checkbutton"):
+            return None
+        if event.widget.winfo_toplevel() is not self.root:
+            return None
+        action()
+        return "break"
+
+    def rebuild_cell_grid(self):
+        # Плотная таблица (строка, столбец) -> (проект, платформа, категория, виджет) в порядке отрисовки
+        self.cell_grid = []
+        self.grid_months = []
+        for year in self.month_index.years():
+            for month in self.month_index.months(year):
+                cells = self.month_cells.get((year, month))
+                if cells is None:
+                    continue
+                for row in cells['rows']:
+                    self.cell_grid.append(row)
+                    self.grid_months.append((year, month))
+        self.cell_positions = {}
+        for r, row in enumerate(self.cell_grid):
+            for c, entry in enumerate(row):
+                if entry is not None:
+                    self.cell_positions[entry[:3]] = (r, c)
+
+        focused = self.focused_cell
+        self.focused_cell = self.focused_widget = None
+        if focused is not None and focused in self.cell_positions:
+            self.set_focus(self.cell_positions[focused])
+
+    def _row_visible(self, row):
+        year, month = self.grid_months[row]
+        year_state = self.year_states.get(year)
+        month_state = self.month_states.get((year, month))
+        return not (year_state and year_state.get()) and not (month_state and month_state.get())
+
+    def _nearest_in_row(self, row, column):
+        cells = self.cell_grid[row]
+        for offset in range(len(cells)):
+            for candidate in (column - offset, column + offset):
+                if 0 <= candidate < len(cells) and cells[candidate] is not None:
+                    return candidate
+        return None
+
+    def set_focus(self, position):
+        if self.focused_widget is not None and self.focused_widget.winfo_exists():
+            self.focused_widget.configure(highlightbackground=self.cell_border_color,
+                                          highlightcolor=self.cell_border_color)
+        self.focused_cell = self.focused_widget = None
+        if position is None:
+            return
+        row, column = position
+        project, platform, category, widget = self.cell_grid[row][column]
+        self.focused_cell = (project, platform, category)
+        self.focused_widget = widget
+        widget.configure(highlightbackground="#000000", highlightcolor="#000000")
+        self.canvas.focus_set()
+        # Поле названия подсказывается только пустым, чтобы не стереть набираемый текст
+        if not self.project_name.get():
+            self.project_name.insert(0, project)
+        self.scroll_into_view(widget)
+
+    def focus_cell(self, project, platform, category):
+        position = self.cell_positions.get((project, platform, category))
+        if position is not None and position != self.focus_position():
+            self.set_focus(position)
+
+    def focus_position(self):
+        if self.focused_cell is None:
+            return None
+        return self.cell_positions.get(self.focused_cell)
+
+    def scroll_into_view(self, widget):
+        # Прокрутка откладывается до простоя: при автоповторе клавиш позиция берётся из уже
+        # рассчитанной геометрии, без принудительной перекладки окна на каждое нажатие
+        self.scroll_target = widget
+        if self.scroll_job is None:
+            self.scroll_job = self.root.after_idle(self._scroll_to_target)
+
+    def _scroll_to_target(self):
+        self.scroll_job = None
+        widget, self.scroll_target = self.scroll_target, None
+        if widget is None or not widget.winfo_exists():
+            return
+        total_height = self.scrollable_frame.winfo_height()
+        if total_height <= 0:
+            return
+        top = widget.winfo_rooty() - self.scrollable_frame.winfo_rooty()
+        view_top, view_bottom = self.canvas.yview()
+        if top < view_top * total_height or top + widget.winfo_height() > view_bottom * total_height:
+            self.canvas.yview_moveto(max(top - self.canvas.winfo_height() / 2, 0) / total_height)
+
+    def move_focus(self, row_step, column_step):
+        if not self.cell_grid:
+            return
+        position = self.focus_position()
+        if position is None:
+            row = next((r for r in range(len(self.cell_grid)) if self._row_visible(r)), None)
+            column = self._nearest_in_row(row, 0) if row is not None else None
+            if column is not None:
+                self.set_focus((row, column))
+            return
+        row, column = position
+        if column_step:
+            cells = self.cell_grid[row]
+            candidate = column + column_step
+            while 0 <= candidate < len(cells) and cells[candidate] is None:
+                candidate += column_step
+            if 0 <= candidate < len(cells):
+                self.set_focus((row, candidate))
+            return
+        candidate = row + row_step
+        while 0 <= candidate < len(self.cell_grid):
+            if self._row_visible(candidate):
+                target = self._nearest_in_row(candidate, column)
+                if target is not None:
+                    self.set_focus((candidate, target))
+                    return
+            candidate += row_step
+
+    def jump_month(self, step):
+        position = self.focus_position()
+        if position is None:
+            self.move_focus(0, 0)
+            return
+        row, column = position
+        current_month = self.grid_months[row]
+        candidate = row
+        # Переходим к первой строке соседнего видимого месяца
+        while 0 <= candidate < len(self.cell_grid) and self.grid_months[candidate] == current_month:
+            candidate += step
+        if step < 0 and 0 <= candidate:
+            target_month = self.grid_months[candidate]
+            while candidate > 0 and self.grid_months[candidate - 1] == target_month:
+                candidate -= 1
+        while 0 <= candidate < len(self.cell_grid):
+            if self._row_visible(candidate):
+                target = self._nearest_in_row(candidate, column)
+                if target is not None:
+                    self.set_focus((candidate, target))
+                    return
+            candidate += step
+
+    def jump_platform(self, step):
+        position = self.focus_position()
+        if position is None:
+            return
+        row, column = position
+        starts = self.month_cells[self.grid_months[row]]['platform_starts']
+        platform_index = bisect.bisect_right(starts, column) - 1 + step
+        cells = self.cell_grid[row]
+        while 0 <= platform_index < len(starts):
+            end = starts[platform_index + 1] if platform_index + 1 < len(starts) else len(cells)
+            target = next((c for c in range(starts[platform_index], end) if cells[c] is not None), None)
+            if target is not None:
+                self.set_focus((row, target))
+                return
+            platform_index += step
+
+    def jump_row_edge(self, to_end):
+        position = self.focus_position()
+        if position is None:
+            return
+        row, _ = position
+        cells = self.cell_grid[row]
+        columns = range(len(cells) - 1, -1, -1) if to_end else range(len(cells))
+        target = next((c for c in columns if cells[c] is not None), None)
+        if target is not None:
+            self.set_focus((row, target))
+
+    def set_focused_status(self, status_index):
+        if self.focused_cell is None:
+            return
+        project, platform, category = self.focused_cell
+        status = list(self.status_colors.keys())[status_index]
+        categories = self.platform_categories[platform] if category is None else [category]
+        for item in categories:
+            self._set_cell_status(project, platform, item, status)
+        self.focused_widget.configure(bg=self.cell_color(project, platform, category, status))
+        self.schedule_persist()
+
+    def cycle_focused_status(self):
+        if self.focused_cell is None:
+            return
+        project, platform, category = self.focused_cell
+        if category is None:
+            self.cycle_platform_status(project, platform, self.focused_widget)
+        else:
+            self.cycle_status(project, platform, category, self.focused_widget)
+
     def show_context_menu(self, event, project, platform, category, cell):
         current_status = self.get_status(project, platform, category)
         menu = tk.Menu(self.root, tearoff=0)
@@ -803,13 +3801,9 @@ class ProjectTracker:
         menu.tk_popup(event.x_root, event.y_root)
 
     def set_status(self, project, platform, category, status, cell):
-        self.projects[project][platform][category] = {
-            "status": status,
-            "date": datetime.now().strftime("%Y-%m-%d")
-        }
-        cell.configure(bg=self.status_colors[status])
-        self.save_data()
-        self.update_statistics()
+        self._set_cell_status(project, platform, category, status)
+        cell.configure(bg=self.cell_color(project, platform, category, status))
+        self.schedule_persist()
 
     def filter_projects(self, *args):
         pass
@@ -819,56 +3813,628 @@ class ProjectTracker:
         if not file_path:
             return
 
-        with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Project', 'Year', 'Month', 'Platform', 'Category', 'Status', 'Date']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        # Строки собираются сейчас, файл пишется в фоне
+        rows = []
+        for project_name, project_data in self.projects.items():
+            year = project_data.get('year')
+            month = project_data.get('month')
+            for platform, categories in project_data.items():
+                if platform in ['year', 'month']:
+                    continue
+                for category, details in categories.items():
+                    rows.append({
+                        'Project': project_name,
+                        'Year': year,
+                        'Month': month,
+                        'Platform': platform,
+                        'Category': category,
+                        'Status': details.get('status'),
+                        'Date': details.get('date')
+                    })
+
+        def write(task):
+            temp_path = file_path + ".tmp"
+            try:
+                with open(temp_path, 'w', newline='', encoding='utf-8') as csvfile:
+                    fieldnames = ['Project', 'Year', 'Month', 'Platform', 'Category', 'Status', 'Date']
+                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                    writer.writeheader()
+                    for start in range(0, len(rows), 1000):
+                        task.check_cancelled()
+                        writer.writerows(rows[start:start + 1000])
+                os.replace(temp_path, file_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+        self.io_executor.submit(write, lane=file_path, cancellable=True, description="Экспорт CSV")
+
+    def export_to_json(self):
+        file_path = fd.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if not file_path:
+            return
 
-            writer.writeheader()
-            for project_name, project_data in self.projects.items():
-                year = project_data.get('year')
-                month = project_data.get('month')
-                for platform, categories in project_data.items():
-                    if platform in ['year', 'month']:
-                        continue
-                    for category, details in categories.items():
-                        writer.writerow({
-                            'Project': project_name,
-                            'Year': year,
-                            'Month': month,
-                            'Platform': platform,
-                            'Category': category,
-                            'Status': details.get('status'),
-                            'Date': details.get('date')
-                        })
+        data = json.dumps(self.projects, ensure_ascii=False, indent=4).encode('utf-8')
+        self.io_executor.submit(lambda task: write_file_atomic(file_path, data), lane=file_path,
+                                description="Экспорт JSON")
 
     def import_from_csv(self):
         file_path = fd.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if not file_path:
             return
 
-        with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                name = row['Project']
-                year = int(row['Year'])
-                month = row['Month']
-                platform = row['Platform']
-                category = row['Category']
-                status = row['Status']
-                date = row['Date']
+        # Файл читается в фоне, изменения применяются в потоке интерфейса
+        workspace_dir = self.workspace_dir
+        self.io_executor.submit(lambda task: read_projects_csv(file_path, task.check_cancelled),
+                                on_done=lambda result: self.apply_imported_rows(*result, workspace_dir),
+                                on_error=lambda e: messagebox.showwarning("Импорт", f"Не удалось прочитать файл: {e}"),
+                                cancellable=True, description="Импорт CSV")
+
+    def apply_imported_rows(self, rows, rejected, workspace_dir):
+        if workspace_dir != self.workspace_dir:
+            messagebox.showwarning("Импорт", "Рабочее пространство сменилось во время чтения файла, импорт отменён.")
+            return
+        # Точка восстановления перед массовым изменением
+        self.backup_snapshot(force=True)
+        similar = {}
+        for name, year, month, platform, category, status, date in rows:
+            if name not in self.projects:
+                found = self.name_index.similar(name, limit=1)
+                if found:
+                    similar[name] = found[0]
+                self.projects[name] = {'year': year, 'month': month}
+                self.month_index.add(name, year, month)
+                self.name_index.add(name)
+
+            self._set_cell_status(name, platform, category, status, date)
+
+        self.save_data()
+        self.update_matrix()
+        self.update_statistics()
+        if rejected:
+            lines = [f"строка {line}: {reason}" for line, reason in rejected[:20]]
+            if len(rejected) > 20:
+                lines.append(f"… и ещё {len(rejected) - 20}")
+            messagebox.showwarning("Импорт", f"Пропущено строк: {len(rejected)}\n" + "\n".join(lines))
+        if similar:
+            lines = [f"{name} ≈ {other} ({score:.0%})" for name, (other, score) in sorted(similar.items())]
+            if len(lines) > 20:
+                lines = lines[:20] + [f"… и ещё {len(lines) - 20}"]
+            messagebox.showwarning("Похожие проекты",
+                                   "Импортированы проекты, похожие на существующие:\n" + "\n".join(lines)
+                                   + "\n\nОбъединить их можно в окне «Дубликаты».")
+
+    def reconcile_marketplace(self):
+        # Профили читаются в фоне, окно открывается, когда они готовы
+        path = self.data_path("reconcile_profiles.json")
+        workspace_dir = self.workspace_dir
+        self.io_executor.submit(lambda task: load_reconcile_profiles(path), lane=path,
+                                on_done=lambda profiles: self.show_reconcile_window(profiles, workspace_dir),
+                                description="Чтение профилей сверки")
+
+    def show_reconcile_window(self, profiles, workspace_dir):
+        if workspace_dir != self.workspace_dir:
+            return
+        platforms = [platform for platform in self.platform_categories.keys() if platform in profiles]
+        if not platforms:
+            messagebox.showwarning("Сверка", "Нет профилей сверки для текущих платформ.")
+            return
 
-                if name not in self.projects:
-                    self.projects[name] = {'year': year, 'month': month}
+        reconcile_window = tk.Toplevel(self.root)
+        reconcile_window.title("Сверка с выгрузкой маркетплейса")
+
+        options_frame = ttk.Frame(reconcile_window)
+        options_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(options_frame, text="Платформа:").pack(side=tk.LEFT)
+        platform_var = tk.StringVar(value=platforms[0])
+        ttk.Combobox(options_frame, textvariable=platform_var, values=platforms,
+                     state="readonly", width=16).pack(side=tk.LEFT, padx=5)
+        ttk.Label(options_frame, text="Порог сходства:").pack(side=tk.LEFT)
+        threshold_var = tk.DoubleVar(value=0.8)
+        ttk.Spinbox(options_frame, from_=0.5, to=1.0, increment=0.05, textvariable=threshold_var,
+                    width=5).pack(side=tk.LEFT, padx=5)
+
+        columns = ("project", "category", "current", "new", "title", "score")
+        tree = ttk.Treeview(reconcile_window, columns=columns, show="headings", height=20)
+        for column, heading, width in zip(columns, ("Проект", "Категория", "Было", "Станет", "В файле", "Сходство"),
+                                          (200, 70, 90, 90, 200, 70)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width)
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        summary_label = ttk.Label(reconcile_window, text="Выберите файл выгрузки")
+        summary_label.pack(fill=tk.X, padx=5)
+
+        state = {'platform': None, 'changes': []}
+
+        def open_export():
+            file_path = fd.askopenfilename(parent=reconcile_window, filetypes=[("CSV files", "*.csv")])
+            if not file_path:
+                return
+            platform = platform_var.get()
+            self.io_executor.submit(lambda task: read_marketplace_export(file_path, profiles[platform]),
+                                    on_done=lambda rows: show_proposals(platform, rows),
+                                    on_error=lambda e: messagebox.showwarning(
+                                        "Сверка", f"Не удалось прочитать файл: {e}", parent=reconcile_window),
+                                    cancellable=True, description="Чтение выгрузки")
+
+        def show_proposals(platform, rows):
+            if not reconcile_window.winfo_exists():
+                return
+            reconciler = Reconciler(self.projects, self.platform_categories, profiles[platform])
+            changes, unmatched = reconciler.propose(platform, rows, threshold=threshold_var.get())
+            state['platform'] = platform
+            state['changes'] = changes
+
+            tree.delete(*tree.get_children())
+            for i, (project, category, current, new, title, score) in enumerate(changes):
+                tree.insert("", tk.END, iid=str(i),
+                            values=(project, category, current or "—", new, title, f"{score:.2f}"))
+            summary_label.config(text=f"Строк: {len(rows)}, изменений: {len(changes)}, "
+                                      f"не сопоставлено: {len(unmatched)}")
+
+        def apply_changes(selected_only):
+            items = tree.selection() if selected_only else tree.get_children()
+            if not items:
+                return
+            platform = state['platform']
+            self.backup_snapshot(force=True)
+            for item in items:
+                project, category, _, new, _, _ = state['changes'][int(item)]
+                self._set_cell_status(project, platform, category, new)
+            self.save_data()
+            self.update_matrix()
+            reconcile_window.destroy()
 
-                if platform not in self.projects[name]:
-                    self.projects[name][platform] = {}
+        buttons_frame = ttk.Frame(reconcile_window)
+        buttons_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Открыть выгрузку", command=open_export).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Применить выбранные",
+                   command=lambda: apply_changes(True)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Применить все",
+                   command=lambda: apply_changes(False)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Отмена", command=reconcile_window.destroy).pack(side=tk.LEFT, padx=5)
+
+    def generate_reports(self):
+        output_dir = fd.askdirectory(title="Папка для отчётов")
+        if not output_dir:
+            return
 
-                self.projects[name][platform][category] = {'status': status, 'date': date}
+        # Снимок данных делается в главном потоке; генерация идёт в фоне и не держит интерфейс
+        months = {
+            key: json.loads(json.dumps({name: self.projects[name] for name in names}))
+            for key, names in self.month_index.projects.items()
+        }
+        platform_categories = {platform: list(categories) for platform, categories in self.platform_categories.items()}
+        status_colors = dict(self.status_colors)
+
+        def on_done(result):
+            rendered, total, errors = result
+            if errors:
+                messagebox.showwarning("Отчёты", f"Обновлено {rendered} из {total} месяцев. Ошибки:\n"
+                                       + "\n".join(f"{key}: {error}" for key, error in errors[:20]))
+            else:
+                messagebox.showinfo("Отчёты", f"Готово: обновлено {rendered} из {total} месяцев.")
+
+        self.io_executor.submit(lambda task: generate_reports(months, platform_categories, status_colors, output_dir),
+                                on_done=on_done,
+                                on_error=lambda e: messagebox.showwarning("Отчёты", f"Ошибка генерации отчётов: {e}"),
+                                description="Генерация отчётов")
 
+    def merge_projects(self, target, sources):
+        # Ячейки источников переносятся в target; при совпадении побеждает более свежая дата.
+        # Дерево дубликатов может устареть: исчезнувшие проекты пропускаются
+        if target not in self.projects:
+            return
+        for source in sources:
+            if source == target or source not in self.projects:
+                continue
+            for platform, categories in self.projects[source].items():
+                if platform in ['year', 'month']:
+                    continue
+                for category, cell in categories.items():
+                    current = self.projects[target].get(platform, {}).get(category)
+                    if current is None or (cell.get('date') or '') > (current.get('date') or ''):
+                        self._set_cell_status(target, platform, category, cell['status'], cell.get('date'))
+            self._touch_project(source)
+            self.month_index.remove(source, self.projects[source].get('year'), self.projects[source].get('month'))
+            self.name_index.remove(source)
+            del self.projects[source]
+            self.refresh_project_summaries(source)
+            self.metrics.merge_project(source, target)
+        self.metrics.save()
         self.save_data()
         self.update_matrix()
         self.update_statistics()
 
+    def find_duplicates(self):
+        duplicates_window = tk.Toplevel(self.root)
+        duplicates_window.title("Дубликаты проектов")
+
+        options_frame = ttk.Frame(duplicates_window)
+        options_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(options_frame, text="Порог сходства:").pack(side=tk.LEFT)
+        threshold_var = tk.DoubleVar(value=0.75)
+        ttk.Spinbox(options_frame, from_=0.5, to=1.0, increment=0.05, textvariable=threshold_var,
+                    width=5).pack(side=tk.LEFT, padx=5)
+
+        columns = ("month", "cells", "score")
+        tree = ttk.Treeview(duplicates_window, columns=columns, show="tree headings", height=20)
+        tree.heading("#0", text="Проект")
+        tree.column("#0", width=280)
+        for column, heading, width in zip(columns, ("Месяц", "Ячеек", "Сходство"), (110, 60, 80)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width)
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        summary_label = ttk.Label(duplicates_window, text="")
+        summary_label.pack(fill=tk.X, padx=5)
+
+        def show(groups):
+            tree.delete(*tree.get_children())
+            for names, pairs in groups:
+                names = [name for name in names if name in self.projects]
+                if len(names) < 2:
+                    continue
+                group = tree.insert("", tk.END, text=f"Группа {len(tree.get_children()) + 1}", open=True,
+                                    values=("", "", f"{max(pairs.values()):.2f}"))
+                for name in names:
+                    project_data = self.projects[name]
+                    month = project_data.get('month')
+                    cells = sum(len(categories) for platform, categories in project_data.items()
+                                if platform not in ['year', 'month'])
+                    best = max(score for pair, score in pairs.items() if name in pair)
+                    tree.insert(group, tk.END, text=name,
+                                values=(f"{month_name(month)} {project_data.get('year')}" if month else "—",
+                                        cells, f"{best:.2f}"))
+            summary_label.config(text=f"Групп: {len(tree.get_children())}")
+
+        def search():
+            # Поиск идёт в фоне по копии индекса, чтобы не держать интерфейс на больших базах
+            names = list(self.projects)
+            threshold = threshold_var.get()
+            summary_label.config(text="Поиск…")
+
+            def on_done(groups):
+                if duplicates_window.winfo_exists():
+                    show(groups)
+
+            self.io_executor.submit(lambda task: NameIndex(names).duplicates(threshold), on_done=on_done,
+                                    description="Поиск дубликатов")
+
+        def merge():
+            selection = tree.selection()
+            parent = tree.parent(selection[0]) if selection else ""
+            if not parent:
+                messagebox.showwarning("Дубликаты", "Выберите проект, в который объединить группу.",
+                                       parent=duplicates_window)
+                return
+            target = tree.item(selection[0], "text")
+            sources = [tree.item(item, "text") for item in tree.get_children(parent) if item != selection[0]]
+            if not messagebox.askyesno("Объединение", f"Объединить {len(sources)} проект(ов) в '{target}'?\n"
+                                       + "\n".join(sources), parent=duplicates_window):
+                return
+            self.backup_snapshot(force=True)
+            self.merge_projects(target, sources)
+            tree.delete(parent)
+            summary_label.config(text=f"Групп: {len(tree.get_children())}")
+
+        def ignore():
+            selection = tree.selection()
+            if selection:
+                tree.delete(tree.parent(selection[0]) or selection[0])
+
+        ttk.Button(options_frame, text="Найти", command=search).pack(side=tk.LEFT, padx=5)
+        buttons_frame = ttk.Frame(duplicates_window)
+        buttons_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Объединить в выбранный", command=merge).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Пропустить группу", command=ignore).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Закрыть", command=duplicates_window.destroy).pack(side=tk.LEFT, padx=2)
+        search()
+
+    def show_metrics(self):
+        metrics_window = tk.Toplevel(self.root)
+        metrics_window.title("Метрики продаж")
+
+        text = tk.Text(metrics_window, width=60, height=32, font=("Courier", 9))
+
+        def refresh():
+            text.config(state=tk.NORMAL)
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, f"Записей: {len(self.metrics)}\n")
+            sections = [("Платформа", "platform"), ("Категория", "category"), ("Месяц", "month")]
+            for title, by in sections:
+                sales = self.metrics.aggregate("sales", by, self.projects)
+                revenue = self.metrics.aggregate("revenue", by, self.projects)
+                text.insert(tk.END, f"\n{title:<20} {'Продажи':>10} {'Выручка':>12}\n")
+                keys = sorted(set(sales) | set(revenue), reverse=by == "month")
+                for key in keys:
+                    label = f"{month_name(key[1])} {key[0]}" if by == "month" else (key or "—")
+                    text.insert(tk.END, f"{label:<20} {sales.get(key, 0):>10.0f} {revenue.get(key, 0):>12.2f}\n")
+            text.config(state=tk.DISABLED)
+
+        def import_metrics():
+            file_path = fd.askopenfilename(parent=metrics_window, filetypes=[("CSV files", "*.csv")])
+            if not file_path:
+                return
+            metrics = self.metrics
+
+            def on_done(result):
+                rows, rejected = result
+                imported = metrics.import_rows(rows)
+                metrics.save()
+                if metrics is not self.metrics or not metrics_window.winfo_exists():
+                    return
+                refresh()
+                if VIEW_MODES.get(self.view_mode_var.get()):
+                    self.update_matrix()
+                message = f"Импортировано строк: {imported}"
+                if rejected:
+                    lines = [f"строка {line}: {reason}" for line, reason in rejected[:20]]
+                    if len(rejected) > 20:
+                        lines.append(f"… и ещё {len(rejected) - 20}")
+                    message += f"\nПропущено строк: {len(rejected)}\n" + "\n".join(lines)
+                messagebox.showinfo("Метрики", message, parent=metrics_window)
+
+            def on_error(e):
+                messagebox.showwarning("Метрики", f"Не удалось импортировать файл: {e}")
+
+            self.io_executor.submit(lambda task: MetricsStore.read_csv(file_path, task.check_cancelled),
+                                    on_done=on_done, on_error=on_error, cancellable=True,
+                                    description="Импорт метрик")
+
+        buttons_frame = ttk.Frame(metrics_window)
+        buttons_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Импорт CSV", command=import_metrics).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Закрыть", command=metrics_window.destroy).pack(side=tk.LEFT, padx=5)
+        text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        refresh()
+
+    DIAGNOSTICS_INTERVAL = 5 * 60 * 1000
+
+    def sample_diagnostics(self):
+        try:
+            self.diagnostics.sample()
+        except tk.TclError:
+            return
+        self.root.after(self.DIAGNOSTICS_INTERVAL, self.sample_diagnostics)
+
+    def show_diagnostics(self):
+        diagnostics_window = tk.Toplevel(self.root)
+        diagnostics_window.title("Диагностика ресурсов")
+
+        text = tk.Text(diagnostics_window, width=96, height=40, font=("Courier", 9))
+
+        def refresh(sample=True):
+            if sample:
+                self.diagnostics.sample()
+            samples = list(self.diagnostics.samples)
+            current = samples[-1]
+            text.config(state=tk.NORMAL)
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, f"Виджетов: {current['widgets']}  окон Toplevel: {current['toplevels']}\n"
+                                f"Команд Tcl: {current['commands']}  переменных Tcl: {current['variables']}\n"
+                                f"Объектов Python: {current['python_objects']}  "
+                                f"tracemalloc: {'%d КБ' % current['traced_kb'] if tracemalloc.is_tracing() else 'выкл.'}\n")
+
+            text.insert(tk.END, "\nДинамика (изменение к предыдущему замеру)\n")
+            text.insert(tk.END, f"{'Время':<9}{'Виджеты':>14}{'Toplevel':>12}{'Команды':>14}"
+                                f"{'Перем.':>12}{'Объекты':>16}{'КБ':>12}\n")
+            for previous, sample in zip([None] + samples[-20:-1], samples[-20:]):
+                cells = []
+                for metric, width in zip(Diagnostics.METRICS, (14, 12, 14, 12, 16, 12)):
+                    delta = f" {sample[metric] - previous[metric]:+d}" if previous else ""
+                    cells.append(f"{str(sample[metric]) + delta:>{width}}")
+                text.insert(tk.END, f"{sample['time']:<9}" + "".join(cells) + "\n")
+            growth = self.diagnostics.growth()
+            text.insert(tk.END, "За сессию: " + ", ".join(f"{metric} {value:+d}" for metric, value in growth.items()) + "\n")
+
+            text.insert(tk.END, "\nКлассы виджетов\n")
+            for widget_class, count in current["classes"].most_common(12):
+                text.insert(tk.END, f"  {widget_class:<20} {count:>8}\n")
+
+            allocations = self.diagnostics.top_allocations()
+            if allocations:
+                text.insert(tk.END, "\ntracemalloc: крупнейшие выделения" +
+                            (" (прирост)" if hasattr(allocations[0], "size_diff") else "") + "\n")
+                for stat in allocations:
+                    frame = stat.traceback[0]
+                    diff = f" {stat.size_diff / 1024:+.1f} КБ" if hasattr(stat, "size_diff") else ""
+                    text.insert(tk.END, f"  {os.path.basename(frame.filename)}:{frame.lineno:<6}"
+                                        f"{stat.size / 1024:>10.1f} КБ{diff}  ×{stat.count}\n")
+            text.config(state=tk.DISABLED)
+
+        def toggle_tracemalloc():
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+                self.diagnostics.previous_snapshot = None
+            else:
+                tracemalloc.start()
+            refresh()
+
+        def collect():
+            gc.collect()
+            refresh()
+
+        buttons_frame = ttk.Frame(diagnostics_window)
+        buttons_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Замер", command=refresh).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="tracemalloc вкл/выкл", command=toggle_tracemalloc).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Сборка мусора", command=collect).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Закрыть", command=diagnostics_window.destroy).pack(side=tk.LEFT, padx=2)
+        text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        refresh()
+
+    def replace_workspace_data(self, projects, platform_data):
+        # Полная замена данных (восстановление из копии) с перестройкой индексов
+        self.projects = projects
+        self.platform_categories = platform_data['platform_categories']
+        self.platform_colors = platform_data['platform_colors']
+        self.month_index.rebuild(self.projects)
+        self.rebuild_status_cache()
+        self.set_focus(None)
+        self.update_platform_checkboxes()
+        self.update_platform_filter()
+        self.save_platform_data()
+        self.save_data()
+        self.update_matrix()
+
+    def show_backups(self):
+        backups_window = tk.Toplevel(self.root)
+        backups_window.title("Резервные копии")
+
+        columns = ("timestamp", "changed")
+        tree = ttk.Treeview(backups_window, columns=columns, show="headings", height=16)
+        tree.heading("timestamp", text="Время")
+        tree.heading("changed", text="Изменено шардов")
+        tree.column("timestamp", width=180)
+        tree.column("changed", width=120)
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        # Имена точек последнего прочитанного списка, по возрастанию — для поиска «на момент»
+        point_names = []
+
+        def warn(title, message):
+            messagebox.showwarning(title, message, parent=backups_window if backups_window.winfo_exists() else None)
+
+        def refresh():
+            # Список читается в фоне в полосе копий, то есть после ещё не записанных точек восстановления
+            backups = self.backups
+            self.io_executor.submit(lambda task: backups.list_points(), lane=backups.directory,
+                                    on_done=show_points, description="Чтение резервных копий")
+
+        def show_points(points):
+            if not backups_window.winfo_exists():
+                return
+            point_names[:] = sorted(name for name, _, _ in points)
+            tree.delete(*tree.get_children())
+            for name, timestamp, changed in points:
+                tree.insert("", tk.END, iid=name, values=(timestamp.replace("T", " "), changed))
+
+        def read_point(read, apply):
+            # Копия читается в фоне; если пока шло чтение сменилось рабочее пространство, она не применяется
+            backups = self.backups
+
+            def on_done(result):
+                if backups is not self.backups:
+                    warn("Восстановление", "Рабочее пространство сменилось, восстановление отменено.")
+                    return
+                apply(result)
+
+            self.io_executor.submit(lambda task: read(backups), lane=backups.directory, on_done=on_done,
+                                    on_error=lambda e: warn("Восстановление", f"Не удалось прочитать копию: {e}"),
+                                    description="Чтение резервной копии")
+
+        def selected_point():
+            selection = tree.selection()
+            if not selection:
+                messagebox.showwarning("Резервные копии", "Выберите точку восстановления.", parent=backups_window)
+                return None
+            return selection[0]
+
+        def restore_all():
+            name = selected_point()
+            if name is None or not messagebox.askyesno(
+                    "Восстановление", "Заменить все данные состоянием из выбранной копии?\n\n"
+                                      "История статусов и метрики не откатываются.", parent=backups_window):
+                return
+
+            def apply(result):
+                projects, platform_data = result
+                self.backup_snapshot(force=True)
+                self.replace_workspace_data(projects, platform_data)
+                refresh()
+
+            read_point(lambda backups: backups.restore(name), apply)
+
+        def restore_project():
+            name = selected_point()
+            if name is None:
+                return
+            project = sd.askstring("Восстановить проект", "Название проекта:",
+                                   initialvalue=self.project_name.get().strip(), parent=backups_window)
+            if not project:
+                return
+
+            def apply(project_data):
+                if project_data is None:
+                    warn("Восстановление", f"В копии нет проекта '{project}'.")
+                    return
+                self.backup_snapshot(force=True)
+                if project in self.projects:
+                    self._touch_project(project)
+                    self.month_index.remove(project, self.projects[project].get('year'),
+                                            self.projects[project].get('month'))
+                self.projects[project] = project_data
+                self.month_index.add(project, project_data.get('year'), project_data.get('month'))
+                self.name_index.add(project)
+                self.refresh_project_summaries(project)
+                self.save_data()
+                self.update_matrix()
+                refresh()
+
+            read_point(lambda backups: backups.restore_project(name, project), apply)
+
+        def create_point():
+            self.backup_snapshot(force=True)
+            refresh()
+
+        def select_at_time():
+            value = sd.askstring("Копия на момент", "Дата и время (ГГГГ-ММ-ДД ЧЧ:ММ или ГГГГ-ММ-ДД):",
+                                 initialvalue=datetime.now().strftime("%Y-%m-%d %H:%M"), parent=backups_window)
+            if not value:
+                return
+            try:
+                moment = datetime.strptime(value.strip(), "%Y-%m-%d %H:%M")
+            except ValueError:
+                try:
+                    # Для одной даты берётся состояние на конец дня
+                    moment = datetime.strptime(value.strip(), "%Y-%m-%d") + timedelta(days=1, microseconds=-1)
+                except ValueError:
+                    messagebox.showwarning("Копия на момент", f"Неверная дата: {value}", parent=backups_window)
+                    return
+            name = self.backups.find_point(moment, point_names)
+            if name is None or not tree.exists(name):
+                messagebox.showwarning("Копия на момент", "Нет копий до этого момента.", parent=backups_window)
+                return
+            tree.selection_set(name)
+            tree.see(name)
+
+        retention_frame = ttk.Frame(backups_window)
+        retention_frame.pack(fill=tk.X, padx=5, pady=2)
+        retention_vars = {}
+        for key, label in (("keep_last", "Хранить последних:"), ("keep_days", "Дней по одной:"),
+                           ("interval", "Интервал, с:")):
+            ttk.Label(retention_frame, text=label).pack(side=tk.LEFT)
+            retention_vars[key] = tk.IntVar(value=self.backups.config[key])
+            ttk.Spinbox(retention_frame, from_=0, to=100000, textvariable=retention_vars[key],
+                        width=6).pack(side=tk.LEFT, padx=2)
+
+        def save_retention():
+            try:
+                values = {key: var.get() for key, var in retention_vars.items()}
+            except tk.TclError as e:
+                messagebox.showwarning("Резервные копии", f"Не удалось сохранить настройки: {e}",
+                                       parent=backups_window)
+                return
+            # Настройки действуют сразу, файл пишется в фоне
+            backups = self.backups
+            backups.config.update(values)
+            config = dict(backups.config)
+            self.io_executor.submit(lambda task: backups.write_config(config), lane=backups.config_path, key="save",
+                                    on_error=lambda e: warn("Резервные копии", f"Не удалось сохранить настройки: {e}"),
+                                    description="Сохранение настроек копий")
+
+        buttons_frame = ttk.Frame(backups_window)
+        buttons_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Создать копию", command=create_point).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="На момент…", command=select_at_time).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Восстановить всё", command=restore_all).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Восстановить проект", command=restore_project).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Сохранить хранение", command=save_retention).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="Закрыть", command=backups_window.destroy).pack(side=tk.LEFT, padx=2)
+        refresh()
+
     def add_platform(self):
         platform_window = tk.Toplevel(self.root)
         platform_window.title("Добавить платформу")
@@ -904,33 +4470,190 @@ class ProjectTracker:
         ttk.Button(buttons_frame, text="Отмена", command=platform_window.destroy).pack(side=tk.LEFT, padx=5)
 
     def save_new_platform(self, platform_name, category_vars, platform_color, window):
-        platform_name = platform_name.strip()
-        if not platform_name:
-            messagebox.showwarning("Ошибка ввода", "Название платформы не может быть пустым.")
-            return
-        if platform_name in self.platform_categories:
-            messagebox.showwarning("Дубликат платформы", "Платформа уже существует.")
-            return
         selected_categories = [cat for cat, var in category_vars.items() if var.get()]
-        if not selected_categories:
-            messagebox.showwarning("Ошибка ввода", "Необходимо выбрать хотя бы одну категорию.")
-            return
         try:
             self.root.winfo_rgb(platform_color)
         except:
             messagebox.showwarning("Ошибка ввода", "Неверный код цвета.")
             return
-        self.platform_categories[platform_name] = selected_categories
-        self.platform_colors[platform_name] = platform_color
+        migration = SchemaMigration(self.platform_categories, self.platform_colors)
+        try:
+            migration.add_platform(platform_name.strip(), selected_categories, platform_color)
+        except ValueError as e:
+            messagebox.showwarning("Ошибка ввода", str(e))
+            return
+        self.apply_schema_migration(migration)
+        window.destroy()
+
+    def apply_schema_migration(self, migration):
+        self.backup_snapshot(force=True)
+        original_platforms = list(self.platform_categories)
+        mapping = migration.platform_mapping()
+        # Новые данные строятся целиком до замены, поэтому ошибка не оставит их в промежуточном состоянии
+        added = []
+        projects = migration.apply_to_projects(self.projects, original_platforms, added)
+        platform_states = {}
+        for (year, month, platform), state in self.platform_states.items():
+            if platform in mapping:
+                platform_states[(year, month, mapping[platform])] = state
+
+        self.projects = projects
+        self.platform_categories = migration.platform_categories
+        self.platform_colors = migration.platform_colors
+        self.platform_states = platform_states
+        renames = {origin: platform for origin, platform in mapping.items() if origin != platform}
+        # Данные удалённых платформ убираются тем же проходом, иначе они слились бы
+        # с платформой, которая позже получит освободившееся имя
+        renames.update((platform, None) for platform in migration.removed_platforms(original_platforms))
+        if renames:
+            self.status_history.rename_platforms(renames)
+            self.metrics.rename_platforms(renames)
+        # Добавленные схемой ячейки появляются в истории, как и созданные вручную
+        for project, platform, category in added:
+            self._record_transition(project, platform, category, None, "Not Uploaded")
+        self.metrics.save()
+        if self.platform_filter_var.get() in mapping:
+            self.platform_filter_var.set(mapping[self.platform_filter_var.get()])
+
+        self.rebuild_status_cache()
 
         self.update_platform_checkboxes()
         self.update_platform_filter()
-
         self.save_platform_data()
-
-        window.destroy()
+        self.save_data()
         self.update_matrix()
-        self.update_statistics()
+
+    def edit_platform_schema(self):
+        migration = SchemaMigration(self.platform_categories, self.platform_colors)
+
+        schema_window = tk.Toplevel(self.root)
+        schema_window.title("Схема платформ")
+        schema_window.grab_set()
+
+        lists_frame = ttk.Frame(schema_window)
+        lists_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        platforms_frame = ttk.LabelFrame(lists_frame, text="Платформы")
+        platforms_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2)
+        platforms_list = tk.Listbox(platforms_frame, exportselection=False, height=14)
+        platforms_list.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
+
+        categories_frame = ttk.LabelFrame(lists_frame, text="Категории")
+        categories_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2)
+        categories_list = tk.Listbox(categories_frame, exportselection=False, height=14)
+        categories_list.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
+
+        operations_label = ttk.Label(schema_window, text="Изменений нет", wraplength=400)
+        operations_label.pack(fill=tk.X, padx=5, pady=2)
+
+        def selected_platform():
+            selection = platforms_list.curselection()
+            return platforms_list.get(selection[0]) if selection else None
+
+        def refresh(select=None):
+            platforms_list.delete(0, tk.END)
+            for platform in migration.platform_categories:
+                platforms_list.insert(tk.END, platform)
+                platforms_list.itemconfig(tk.END, bg=migration.platform_colors.get(platform, "#FFFFFF"))
+            if select in migration.platform_categories:
+                index = list(migration.platform_categories).index(select)
+                platforms_list.selection_set(index)
+                platforms_list.see(index)
+            refresh_categories()
+            operations_label.config(text="; ".join(migration.operations) or "Изменений нет")
+
+        def refresh_categories(event=None):
+            categories_list.delete(0, tk.END)
+            platform = selected_platform()
+            if platform:
+                for category in migration.platform_categories[platform]:
+                    categories_list.insert(tk.END, f"{category} - {self.category_full_names.get(category, '')}")
+                available = [category for category in self.category_full_names
+                             if category not in migration.platform_categories[platform]]
+                new_category_cb.config(values=available)
+                new_category_var.set(available[0] if available else "")
+
+        def run(operation, *args):
+            platform = selected_platform()
+            if platform is None:
+                return
+            try:
+                operation(platform, *args)
+            except ValueError as e:
+                messagebox.showwarning("Схема платформ", str(e), parent=schema_window)
+                return
+            refresh(select=args[0] if operation == migration.rename_platform else platform)
+
+        def rename():
+            platform = selected_platform()
+            if platform is None:
+                return
+            new_name = sd.askstring("Переименовать", "Новое название платформы:",
+                                    initialvalue=platform, parent=schema_window)
+            if new_name and new_name.strip() != platform:
+                run(migration.rename_platform, new_name.strip())
+
+        def recolor():
+            platform = selected_platform()
+            if platform is None:
+                return
+            color = sd.askstring("Цвет платформы", "Цвет платформы (hex):",
+                                 initialvalue=migration.platform_colors.get(platform, "#FFFFFF"), parent=schema_window)
+            if not color:
+                return
+            try:
+                self.root.winfo_rgb(color)
+            except tk.TclError:
+                messagebox.showwarning("Ошибка ввода", "Неверный код цвета.", parent=schema_window)
+                return
+            run(migration.set_color, color)
+
+        def remove():
+            platform = selected_platform()
+            if platform and messagebox.askyesno("Удалить платформу",
+                                                f"Удалить платформу '{platform}' из всех проектов?",
+                                                parent=schema_window):
+                run(migration.remove_platform)
+
+        def remove_category():
+            selection = categories_list.curselection()
+            if selection:
+                category = categories_list.get(selection[0]).split(" - ")[0]
+                run(migration.remove_category, category)
+
+        def apply():
+            if migration.operations:
+                self.apply_schema_migration(migration)
+            schema_window.destroy()
+
+        platforms_list.bind("<<ListboxSelect>>", refresh_categories)
+
+        platform_buttons = ttk.Frame(platforms_frame)
+        platform_buttons.pack(fill=tk.X)
+        ttk.Button(platform_buttons, text="▲", width=3,
+                   command=lambda: run(migration.move_platform, -1)).pack(side=tk.LEFT, padx=1)
+        ttk.Button(platform_buttons, text="▼", width=3,
+                   command=lambda: run(migration.move_platform, 1)).pack(side=tk.LEFT, padx=1)
+        ttk.Button(platform_buttons, text="Переименовать", command=rename).pack(side=tk.LEFT, padx=1)
+        ttk.Button(platform_buttons, text="Цвет", command=recolor).pack(side=tk.LEFT, padx=1)
+        ttk.Button(platform_buttons, text="Удалить", command=remove).pack(side=tk.LEFT, padx=1)
+
+        category_buttons = ttk.Frame(categories_frame)
+        category_buttons.pack(fill=tk.X)
+        new_category_var = tk.StringVar()
+        new_category_cb = ttk.Combobox(category_buttons, textvariable=new_category_var, state="readonly", width=6)
+        new_category_cb.pack(side=tk.LEFT, padx=1)
+        ttk.Button(category_buttons, text="Добавить",
+                   command=lambda: new_category_var.get() and run(migration.add_category, new_category_var.get())
+                   ).pack(side=tk.LEFT, padx=1)
+        ttk.Button(category_buttons, text="Удалить", command=remove_category).pack(side=tk.LEFT, padx=1)
+
+        buttons_frame = ttk.Frame(schema_window)
+        buttons_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Применить", command=apply).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Отмена", command=schema_window.destroy).pack(side=tk.LEFT, padx=5)
+
+        refresh()
 
     def update_platform_checkboxes(self):
         for widget in self.platform_checkboxes_frame.winfo_children():
@@ -943,76 +4666,214 @@ class ProjectTracker:
 
     def update_platform_filter(self):
         platform_values = ["All"] + list(self.platform_categories.keys())
-        self.platform_filter_var.set("All")
-
-    def load_data(self):
+        self.platform_filter_cb.config(values=platform_values)
+        if self.platform_filter_var.get() not in platform_values:
+            self.platform_filter_var.set("All")
+        self.attention_platform_cb.config(values=platform_values)
+        if self.attention_platform_var.get() not in platform_values:
+            self.attention_platform_var.set("All")
+
+    @staticmethod
+    def read_projects_files(directory, backups):
+        # Чтение проектов пространства с запасными источниками; только диск, без Tk, поэтому
+        # для неактивного пространства выполняется в рабочем потоке. Результат применяет load_data
+        projects = {}
+        loaded = False
+        snapshot_error = None
+        corrupt_path = None
+        snapshot_path = os.path.join(directory, "projects_data.bin")
         try:
-            if os.path.exists("projects_data.json"):
-                with open("projects_data.json", "r", encoding='utf-8') as file:
-                    self.projects = json.load(file)
+            if os.path.exists(snapshot_path):
+                with ProjectSnapshot(snapshot_path) as snapshot:
+                    projects = snapshot.to_projects()
+                loaded = True
         except Exception as e:
-            print(f"Ошибка загрузки данных: {e}")
-            self.projects = {}
+            print(f"Ошибка загрузки снимка данных: {e}")
+            # Повреждённый снимок сохраняется рядом, а автосохранение отключается, чтобы
+            # данные из запасного источника не перезаписали его молча
+            snapshot_error = e
+            corrupt_path = snapshot_path + ".corrupt"
+            try:
+                os.replace(snapshot_path, corrupt_path)
+            except OSError as rename_error:
+                print(f"Не удалось переименовать снимок данных: {rename_error}")
+                corrupt_path = snapshot_path
+
+        source = None
+        if snapshot_error is not None:
+            # projects_data.json после перехода на снимок не обновляется, поэтому сначала
+            # берётся последняя точка восстановления — она отстаёт не больше чем на интервал копий
+            try:
+                points = backups.list_points()
+                if points:
+                    name, timestamp, _ = points[0]
+                    projects = backups.restore(name)[0]
+                    loaded = True
+                    source = f"резервная копия от {timestamp.replace('T', ' ')}"
+            except Exception as e:
+                print(f"Ошибка чтения резервной копии: {e}")
+
+        # JSON читается, если снимка ещё нет (первый запуск после обновления) или он повреждён
+        if not loaded:
+            json_path = os.path.join(directory, "projects_data.json")
+            try:
+                if os.path.exists(json_path):
+                    with open(json_path, "r", encoding='utf-8') as file:
+                        projects = json.load(file)
+                    modified = datetime.fromtimestamp(os.path.getmtime(json_path))
+                    source = f"projects_data.json от {modified:%Y-%m-%d %H:%M} (может быть сильно устаревшим)"
+            except Exception as e:
+                print(f"Ошибка загрузки данных: {e}")
+                projects = {}
+        return {'projects': projects, 'loaded': loaded, 'snapshot_error': snapshot_error,
+                'corrupt_path': corrupt_path, 'source': source}
+
+    def load_data(self, files=None):
+        # files — результат read_projects_files, уже прочитанный в фоне
+        files = files or self.read_projects_files(self.workspace_dir, self.backups)
+        self.projects = files['projects']
+        loaded = files['loaded']
+        snapshot_error = files['snapshot_error']
+        corrupt_path = files['corrupt_path']
+        source = files['source']
+        if snapshot_error is not None:
+            messagebox.showwarning(
+                "Ошибка загрузки данных",
+                f"Файл данных повреждён: {snapshot_error}\n\nОн сохранён как {corrupt_path}. "
+                f"Загружено: {source or 'нет данных'}. Данные не будут сохранены автоматически, "
+                f"пока вы их не измените; другую точку можно выбрать в окне резервных копий.")
+
+        migrated, unparsed = migrate_months(self.projects)
+        if unparsed:
+            # Исходные значения сохраняются рядом с данными, чтобы их можно было восстановить вручную
+            path = self.data_path("unparsed_months.json")
+            self.io_executor.submit(lambda task: update_json_file(path, unparsed), lane=path,
+                                    description="Сохранение нераспознанных месяцев")
+            lines = [f"{name}: '{month}'" for name, month in list(unparsed.items())[:20]]
+            if len(unparsed) > 20:
+                lines.append(f"… и ещё {len(unparsed) - 20}")
+            messagebox.showwarning(
+                "Загрузка данных",
+                f"Не удалось распознать месяц у проектов ({len(unparsed)}), месяц у них сброшен:\n"
+                + "\n".join(lines) + "\n\nИсходные значения сохранены в unparsed_months.json.")
+        self.month_index.rebuild(self.projects)
+        self.rebuild_status_cache()
+        if snapshot_error is None and (migrated or (not loaded and self.projects)):
+            self.save_data()
 
     def save_data(self):
+        # Снимок кодируется сразу, а пишется в фоне; ещё не записанный прошлый снимок заменяется
+        path = self.data_path("projects_data.bin")
         try:
-            with open("projects_data.json", "w", encoding='utf-8') as file:
-                json.dump(self.projects, file, ensure_ascii=False, indent=4)
+            data = ProjectSnapshot.encode(self.projects)
         except Exception as e:
             print(f"Ошибка сохранения данных: {e}")
+        else:
+            self.io_executor.submit(lambda task: write_file_atomic(path, data), lane=path, key="save",
+                                    description="Сохранение данных")
+        self.status_history.flush()
+        self.backup_snapshot()
+
+    def backup_snapshot(self, force=False, state=None):
+        # state — данные неактивного рабочего пространства
+        state = state or self._capture_workspace_state()
+        platform_data = {'platform_categories': state['platform_categories'],
+                         'platform_colors': state['platform_colors']}
+        backups = state['backups']
+        try:
+            plan = backups.prepare(state['projects'], state['month_index'], platform_data, force=force)
+        except Exception as e:
+            print(f"Ошибка резервного копирования: {e}")
+            return
+        if plan:
+            self.io_executor.submit(lambda task: backups.commit(plan), lane=backups.directory,
+                                    description="Резервное копирование")
 
     def save_platform_data(self):
         platform_data = {
             'platform_categories': self.platform_categories,
             'platform_colors': self.platform_colors
         }
-        try:
-            with open("platforms_data.json", "w", encoding='utf-8') as file:
-                json.dump(platform_data, file, ensure_ascii=False, indent=4)
-        except Exception as e:
-            print(f"Ошибка сохранения данных платформ: {e}")
+        path = self.data_path("platforms_data.json")
+        data = json.dumps(platform_data, ensure_ascii=False, indent=4).encode('utf-8')
+        self.io_executor.submit(lambda task: write_file_atomic(path, data), lane=path, key="save",
+                                description="Сохранение платформ")
 
-    def load_platform_data(self):
+    def load_platform_data(self, platform_data=None):
+        # platform_data — уже прочитанный в фоне файл, пустой — если файла нет
         try:
-            if os.path.exists("platforms_data.json"):
-                with open("platforms_data.json", "r", encoding='utf-8') as file:
-                    platform_data = json.load(file)
-                    self.platform_categories = platform_data['platform_categories']
-                    self.platform_colors = platform_data['platform_colors']
+            if platform_data is None:
+                platform_data = read_json_file(self.data_path("platforms_data.json"))
+            if platform_data:
+                self.platform_categories = platform_data['platform_categories']
+                self.platform_colors = platform_data['platform_colors']
         except Exception as e:
             print(f"Ошибка загрузки данных платформ: {e}")
 
     def load_settings(self):
         try:
-            if os.path.exists("settings.json"):
-                with open("settings.json", "r", encoding='utf-8') as file:
-                    settings = json.load(file)
-                    # Восстановление фильтров
-                    self.status_filter_var.set(settings.get('status_filter', 'All'))
-                    self.platform_filter_var.set(settings.get('platform_filter', 'All'))
-                    # Восстановление состояний сворачивания/разворачивания
-                    platform_states = settings.get('platform_states', {})
-                    for key_str, value in platform_states.items():
-                        key_tuple = ast.literal_eval(key_str)
-                        self.platform_states[key_tuple] = tk.BooleanVar(value=value)
-                    year_states = settings.get('year_states', {})
-                    for key_str, value in year_states.items():
-                        self.year_states[int(key_str)] = tk.BooleanVar(value=value)
-                    month_states = settings.get('month_states', {})
-                    for key_str, value in month_states.items():
-                        key_tuple = ast.literal_eval(key_str)
-                        self.month_states[key_tuple] = tk.BooleanVar(value=value)
-                    # Установка размеров окна
-                    self.root.geometry(settings.get('window_geometry', '1400x800'))
-                    # Установка позиций разделителей
-                    sash_positions = settings.get('paned_window_sash_positions', [])
-                    if sash_positions:
-                        self.root.update_idletasks()
-                        for i, pos in enumerate(sash_positions):
-                            self.main_paned.sashpos(i, pos)
+            settings = read_json_file(self.app_settings_path)
+            # Восстановление фильтров
+            self.status_filter_var.set(settings.get('status_filter', 'All'))
+            self.platform_filter_var.set(settings.get('platform_filter', 'All'))
+            self.month_sort_var.set(settings.get('month_sort', 'Название'))
+            self.page_size_var.set(settings.get('page_size', 50))
+            # Список рабочих пространств
+            for path in settings.get('workspaces', []):
+                if path not in self.known_workspaces and os.path.isdir(path):
+                    self.known_workspaces.append(path)
+            self.workspace_cb.config(values=self.known_workspaces)
+            # Установка размеров окна
+            self.root.geometry(settings.get('window_geometry', '1400x800'))
+            # Установка позиций разделителей
+            sash_positions = settings.get('paned_window_sash_positions', [])
+            if sash_positions:
+                self.root.update_idletasks()
+                for i, pos in enumerate(sash_positions):
+                    self.main_paned.sashpos(i, pos)
+        except Exception as e:
+            print(f"Ошибка загрузки настроек: {e}")
+            settings = {}
+
+        self.load_view_states()
+        self.update_matrix()
+        # Сохранённое пространство открывается в фоне и заменит текущее, когда будет прочитано
+        active = settings.get('active_workspace')
+        if active and os.path.isdir(active) and os.path.abspath(active) != self.workspace_dir:
+            self.switch_workspace(active)
+
+    def load_view_states(self, settings=None):
+        # Состояния сворачивания/разворачивания хранятся в settings.json рабочего пространства;
+        # settings — уже прочитанный в фоне файл
+        try:
+            if settings is None:
+                settings = read_json_file(self.data_path("settings.json"))
+            platform_states = settings.get('platform_states', {})
+            for key_str, value in platform_states.items():
+                year, month, platform = ast.literal_eval(key_str)
+                key_tuple = (year, parse_month(month), platform)
+                self.platform_states[key_tuple] = tk.BooleanVar(value=value)
+            year_states = settings.get('year_states', {})
+            for key_str, value in year_states.items():
+                self.year_states[int(key_str)] = tk.BooleanVar(value=value)
+            month_states = settings.get('month_states', {})
+            for key_str, value in month_states.items():
+                year, month = ast.literal_eval(key_str)
+                key_tuple = (year, parse_month(month))
+                self.month_states[key_tuple] = tk.BooleanVar(value=value)
         except Exception as e:
             print(f"Ошибка загрузки настроек: {e}")
 
+    def save_view_states(self, directory, platform_states, year_states, month_states):
+        path = os.path.join(directory, "settings.json")
+        updates = {
+            'platform_states': {repr(k): v.get() for k, v in platform_states.items()},
+            'year_states': {str(k): v.get() for k, v in year_states.items()},
+            'month_states': {repr(k): v.get() for k, v in month_states.items()}
+        }
+        self.io_executor.submit(lambda task: update_json_file(path, updates), lane=path,
+                                description="Сохранение настроек")
+
     def save_settings(self):
         try:
             settings = {}
@@ -1024,24 +4885,138 @@ class ProjectTracker:
             # Сохранение фильтров
             settings['status_filter'] = self.status_filter_var.get()
             settings['platform_filter'] = self.platform_filter_var.get()
-            # Сохранение состояний сворачивания/разворачивания
-            settings['platform_states'] = {repr(k): v.get() for k, v in self.platform_states.items()}
-            settings['year_states'] = {str(k): v.get() for k, v in self.year_states.items()}
-            settings['month_states'] = {repr(k): v.get() for k, v in self.month_states.items()}
-            with open("settings.json", "w", encoding='utf-8') as file:
-                json.dump(settings, file, ensure_ascii=False, indent=4)
+            settings['month_sort'] = self.month_sort_var.get()
+            settings['page_size'] = self.page_size()
+            # Рабочие пространства
+            settings['workspaces'] = list(self.known_workspaces)
+            settings['active_workspace'] = self.workspace_dir
         except Exception as e:
             print(f"Ошибка сохранения настроек: {e}")
+        else:
+            # Тот же файл может быть settings.json пространства — общая полоса сохраняет порядок записей
+            self.io_executor.submit(lambda task: update_json_file(self.app_settings_path, settings),
+                                    lane=self.app_settings_path, description="Сохранение настроек")
+
+        # Сохранение состояний сворачивания/разворачивания всех открытых пространств
+        self.save_view_states(self.workspace_dir, self.platform_states, self.year_states, self.month_states)
+        for workspace in self.workspaces.cache.values():
+            if workspace is not self.workspaces.active:
+                self._close_workspace(workspace)
 
     def on_closing(self):
+        self.flush_persist()
+        self.backup_snapshot(force=True)
         self.save_settings()
+        # Окно закрывается только после того, как всё дописано на диск
+        self.io_executor.shutdown()
         self.root.destroy()
 
     def on_window_resize(self, event):
         # Обновление размеров при изменении размера окна
         pass
 
+def prepare_soak_directory():
+    # Копия активного рабочего пространства во временной папке, которая становится текущей.
+    # Всё, что приложение пишет при запуске, миграции, перерисовках и по таймерам,
+    # попадает в копию; другие пространства в копии настроек не упоминаются
+    source = os.getcwd()
+    settings = read_json_file(os.path.join(source, "settings.json"))
+    active = settings.get('active_workspace')
+    workspace = os.path.abspath(active) if active and os.path.isdir(active) else source
+    directory = tempfile.mkdtemp(prefix="tracker-soak-")
+    for name in os.listdir(workspace):
+        path = os.path.join(workspace, name)
+        if os.path.isfile(path):
+            shutil.copy2(path, directory)
+    app_settings = {key: value for key, value in settings.items()
+                    if key not in ('platform_states', 'year_states', 'month_states')}
+    update_json_file(os.path.join(directory, "settings.json"),
+                     {**app_settings, 'workspaces': [], 'active_workspace': None})
+    os.chdir(directory)
+    return directory
+
+
+def run_soak(app, iterations, warmup=3):
+    # Нагрузочный прогон: сворачивание платформ, фильтры, режимы отображения и перерисовки
+    # с подсказками под курсором. Каждая итерация заканчивается одинаковым состоянием экрана,
+    # так что после разогрева число виджетов, команд и переменных Tcl расти не должно.
+    # Приложение для прогона запускается на копии данных (prepare_soak_directory).
+    statuses = ["All"] + list(app.status_colors.keys())
+    view_modes = list(VIEW_MODES.keys())
+    diagnostics = app.diagnostics
+    baseline = None
+    for i in range(iterations):
+        for _ in range(2):
+            for (year, month), frame in list(app.month_frames.items()):
+                if not frame.winfo_exists():
+                    continue
+                for platform in app.platform_categories:
+                    state = app.platform_state(year, month, platform)
+                    state.set(not state.get())
+                app.create_matrix_headers(frame, year, month)
+                app.populate_projects(frame, year, month, frame.projects_data)
+            app.rebuild_cell_grid()
+        app.status_filter_var.set(statuses[i % len(statuses)])
+        app.view_mode_var.set(view_modes[i % len(view_modes)])
+        app.filter_vars['search'].set("a")
+        app.update_matrix()
+        for frame in list(app.month_frames.values()):
+            if frame.winfo_exists():
+                for widget in frame.winfo_children()[:10]:
+                    widget.event_generate("<Enter>", x=1, y=1)
+        app.root.update()
+
+        app.status_filter_var.set("All")
+        app.view_mode_var.set(view_modes[0])
+        app.filter_vars['search'].set("")
+        app.update_matrix()
+        app.root.update()
+        gc.collect()
+        sample = diagnostics.sample()
+        print(f"{i + 1:>4}  " + "  ".join(f"{metric}={sample[metric]}" for metric in Diagnostics.METRICS))
+        if i + 1 == warmup:
+            baseline = sample
+            diagnostics.top_allocations()
+
+    if baseline is None:
+        print("Слишком мало итераций для оценки роста")
+        return True
+    growth = diagnostics.growth(baseline, diagnostics.samples[-1])
+    # Допуски: структура Tk должна вернуться к базовой точно, память — в пределах 1 МБ
+    # (команды Tcl — с небольшим запасом на ожидающие вызовы after)
+    limits = {"widgets": 0, "toplevels": 0, "commands": 10, "variables": 0, "traced_kb": 1024}
+    failures = [f"{metric}: {growth[metric]:+d} (допуск {limit})"
+                for metric, limit in limits.items() if growth[metric] > limit]
+    for stat in diagnostics.top_allocations(5):
+        frame = stat.traceback[0]
+        print(f"  {os.path.basename(frame.filename)}:{frame.lineno}  {stat.size_diff / 1024:+.1f} КБ")
+    if failures:
+        print("Обнаружен рост ресурсов:\n  " + "\n  ".join(failures))
+        return False
+    print("Рост ресурсов в пределах допуска")
+    return True
+
+
 if __name__ == "__main__":
+    # python main.py --soak N — нагрузочный прогон на копии данных текущей папки
+    soak = sys.argv.index("--soak") if "--soak" in sys.argv else None
+    if soak is not None:
+        original_dir = os.getcwd()
+        soak_dir = prepare_soak_directory()
+        tracemalloc.start()
     root = tk.Tk()
     app = ProjectTracker(root)
-    root.mainloop()
+    if soak is None:
+        root.mainloop()
+    else:
+        iterations = int(sys.argv[soak + 1]) if len(sys.argv) > soak + 1 else 20
+        # Дожидаемся отложенной загрузки настроек, чтобы она не попала в замеры
+        started = datetime.now()
+        while (datetime.now() - started).total_seconds() < 0.5:
+            root.update()
+        passed = run_soak(app, iterations)
+        app.io_executor.shutdown()
+        root.destroy()
+        os.chdir(original_dir)
+        shutil.rmtree(soak_dir, ignore_errors=True)
+        sys.exit(0 if passed else 1)
@@ -0,0 +1,71 @@
+import sys
+from datetime import date
+
+import pytest
+
+from main import AgingIndex
+
+TODAY = date(2024, 3, 1)
+
+
+def cell(status, day):
+    return {"status": status, "date": day}
+
+
+def stale(index, status="Pending", days=30, platform=None):
+    return index.older_than(status, days, platform, today=TODAY)
+
+
+def test_rebuild_and_stale_query():
+    projects = {
+        "A": {"year": 2024, "month": 1, "Envato": {"AET": cell("Pending", "2024-01-05"),
+                                                   "PPT": cell("Pending", "2024-02-20")}},
+        "B": {"year": 2024, "month": 1, "Pond5": {"AET": cell("Pending", "2023-12-01")},
+              "Envato": {"AET": cell("Uploaded", "2023-01-01")}},
+    }
+    index = AgingIndex().rebuild(projects)
+    assert stale(index) == [("2023-12-01", "B", "Pond5", "AET"), ("2024-01-05", "A", "Envato", "AET")]
+    assert stale(index, platform="Envato") == [("2024-01-05", "A", "Envato", "AET")]
+    assert index.count_older_than("Pending", 30, today=TODAY) == 2
+    assert stale(index, "Uploaded") == []
+
+
+def test_insert_update_and_delete():
+    index = AgingIndex()
+    index.update("A", "Envato", "AET", "Pending", "2024-01-05")
+    index.update("B", "Envato", "AET", "Rejected", "2024-01-10")
+    assert stale(index) == [("2024-01-05", "A", "Envato", "AET")]
+
+    # Смена статуса переносит ячейку, неотслеживаемый статус убирает её
+    index.update("A", "Envato", "AET", "Rejected", "2024-01-06")
+    assert stale(index) == []
+    assert stale(index, "Rejected") == [("2024-01-06", "A", "Envato", "AET"), ("2024-01-10", "B", "Envato", "AET")]
+    index.update("B", "Envato", "AET", "Uploaded", "2024-02-01")
+    assert stale(index, "Rejected") == [("2024-01-06", "A", "Envato", "AET")]
+
+    # Удаление проекта
+    index.update_project("A", None)
+    assert stale(index, "Rejected") == []
+    assert index.count_older_than("Rejected", 0, today=TODAY) == 0
+
+
+def test_invalid_dates_are_not_indexed():
+    index = AgingIndex()
+    for category, day in (("a", None), ("b", ""), ("c", "2024-13-01"), ("d", "вчера"), ("e", 20240105)):
+        index.update("A", "Envato", category, "Pending", day)
+    assert stale(index, days=0) == []
+    assert index.locations == {}
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="базовый формат ISO принимается с Python 3.11")
+def test_basic_format_dates_are_normalized():
+    index = AgingIndex()
+    index.update("A", "Envato", "AET", "Pending", "20240105")
+    index.update("B", "Envato", "AET", "Pending", "2024-02-25")
+    # Без нормализации "20240105" > "2024-01-31" как строка, и ячейка не попала бы в выборку
+    assert stale(index) == [("2024-01-05", "A", "Envato", "AET")]
+    index.update("A", "Envato", "AET", "Uploaded", "20240106")
+    assert stale(index, days=0) == [("2024-02-25", "B", "Envato", "AET")]
+
+    rebuilt = AgingIndex().rebuild({"A": {"Envato": {"AET": cell("Pending", "20240105")}}})
+    assert stale(rebuilt) == [("2024-01-05", "A", "Envato", "AET")]
@@ -0,0 +1,80 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from main import BackupStore, MonthIndex
+
+PLATFORMS = {"platform_categories": {"Envato": ["AET"]}, "platform_colors": {"Envato": "#FFFFFF"}}
+
+
+def project(status, month=1):
+    return {"year": 2024, "month": month, "Envato": {"AET": {"status": status, "date": "2024-01-01"}}}
+
+
+def snapshot(store, projects):
+    index = MonthIndex()
+    index.rebuild(projects)
+    return store.snapshot(projects, index, PLATFORMS, force=True)
+
+
+def chunk_files(store):
+    return {digest for _, _, files in os.walk(store.chunks_dir) for digest in files}
+
+
+def test_snapshot_and_restore(tmp_path):
+    store = BackupStore(str(tmp_path / "backups"))
+    projects = {"A": project("Uploaded"), "B": project("Pending", month=2), "C": {"year": None, "month": None}}
+    name = snapshot(store, projects)
+    assert store.restore(name) == (projects, PLATFORMS)
+    assert store.restore_project(name, "B") == projects["B"]
+    # Без изменений новая точка не создаётся
+    assert snapshot(store, projects) is None
+
+
+def test_failed_commit_rewrites_everything_next_time(tmp_path, monkeypatch):
+    store = BackupStore(str(tmp_path / "backups"))
+    projects = {"A": project("Uploaded"), "B": project("Pending", month=2)}
+    snapshot(store, projects)
+
+    projects["A"] = project("Rejected")
+    store.mark_dirty(2024, 1)
+
+    def fail(digest, data):
+        raise OSError("диск заполнен")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "_write_chunk", fail)
+        with pytest.raises(OSError):
+            snapshot(store, projects)
+    assert store.all_dirty
+
+    name = snapshot(store, projects)
+    assert store.restore(name)[0] == projects
+
+
+def test_find_point(tmp_path):
+    store = BackupStore(str(tmp_path / "backups"))
+    assert store.find_point(datetime.now()) is None
+    name = snapshot(store, {"A": project("Uploaded")})
+    assert store.find_point(datetime.now()) == name
+    assert store.find_point(datetime(2000, 1, 1)) is None
+
+
+def test_prune_keeps_latest_and_drops_unreferenced_chunks(tmp_path):
+    store = BackupStore(str(tmp_path / "backups"))
+    store.save_config(keep_last=2, keep_days=0)
+    projects = {"A": project("Uploaded"), "B": project("Pending", month=2)}
+    names = []
+    for status in ("Not Uploaded", "Pending", "Rejected", "Uploaded"):
+        projects["A"] = project(status)
+        store.mark_dirty(2024, 1)
+        names.append(snapshot(store, projects))
+    assert store.manifests() == names[-2:]
+    referenced = set()
+    for name in names[-2:]:
+        manifest = store._read_manifest(name)
+        referenced.update(manifest["shards"].values())
+        referenced.add(manifest["platforms"])
+    assert chunk_files(store) == referenced
+    assert store.restore(names[-2])[0]["A"] == project("Rejected")
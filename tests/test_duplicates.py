@@ -0,0 +1,34 @@
+from main import NameIndex
+
+
+def test_containment_scores_below_identical():
+    index = NameIndex()
+    assert index.duplicate_score("Logo Reveal", "logo reveal!") == 1.0
+    contained = index.duplicate_score("Glitch Logo", "Glitch Logo Reveal v2")
+    assert 0.75 <= contained < 1.0
+    assert index.duplicate_score("Logo Reveal", "Glitch Logo Reveal") > contained
+    # Однословные названия вложенностью не сравниваются
+    assert index.duplicate_score("Logo", "Logo Reveal") < 0.75
+
+
+def test_containment_does_not_chain_distinct_products():
+    names = ["Logo Reveal", "Glitch Logo Reveal", "Elegant Logo Reveal", "Gold Logo Reveal",
+             "Minimal Logo Reveal", "Logo Reveal 2"]
+    groups = NameIndex(names).duplicates(threshold=0.75)
+    assert all(len(group) == 2 for group, _ in groups)
+    grouped = [name for group, _ in groups for name in group]
+    assert len(grouped) == len(set(grouped))
+
+
+def test_groups_are_cliques():
+    names = ["Photo Slideshow", "Photo Slideshow v2", "Photo Slide Show", "Corporate Intro", "Corporate Intro 4K",
+             "Typography Pack"]
+    index = NameIndex(names)
+    groups = index.duplicates(threshold=0.75)
+    assert [group for group, _ in groups][-1] == ["Corporate Intro", "Corporate Intro 4K"]
+    for group, pairs in groups:
+        for i, a in enumerate(group):
+            for b in group[i + 1:]:
+                assert index.duplicate_score(a, b) >= 0.75
+                assert pairs[(a, b) if a < b else (b, a)] >= 0.75
+    assert "Typography Pack" not in [name for group, _ in groups for name in group]
@@ -0,0 +1,145 @@
+import threading
+
+from main import IOExecutor
+
+
+class FakeRoot:
+    # Вместо цикла Tk: отложенные вызовы выполняются явно
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+        return len(self.callbacks)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def make_executor():
+    root = FakeRoot()
+    return root, IOExecutor(root, max_workers=4)
+
+
+def test_lane_runs_in_order_and_coalesces_saves():
+    root, executor = make_executor()
+    gate = threading.Event()
+    written = []
+    executor.submit(lambda task: gate.wait(), lane="data.bin")
+    for i in range(5):
+        executor.submit(lambda task, i=i: written.append(i), lane="data.bin", key="save")
+    executor.submit(lambda task: written.append("last"), lane="data.bin")
+    gate.set()
+    executor.wait("data.bin")
+    # Из ещё не начатых сохранений с одним ключом выполняется только последнее
+    assert written == [4, "last"]
+    executor.shutdown()
+
+
+def test_wait_defers_other_callbacks():
+    root, executor = make_executor()
+    log = []
+    other_done = threading.Event()
+    executor.submit(lambda task: other_done.set(), lane="other/file", on_done=lambda value: log.append("other"))
+    executor.submit(lambda task: other_done.wait(), lane="workspace/file", on_done=lambda value: log.append("mine"))
+    executor.wait("workspace/")
+    assert log == ["mine"]
+    root.run_pending()
+    assert log == ["mine", "other"]
+    executor.shutdown()
+
+
+def test_wait_finds_results_deferred_by_an_earlier_wait():
+    root, executor = make_executor()
+    log = []
+    first_done = threading.Event()
+    executor.submit(lambda task: first_done.set(), lane="b/file", on_done=lambda value: log.append("b"))
+    executor.submit(lambda task: first_done.wait(), lane="a/file", on_done=lambda value: log.append("a"))
+    executor.wait("a/")
+    executor.wait("b/")
+    assert log == ["a", "b"]
+    executor.shutdown()
+
+
+def test_laneless_tasks_do_not_match_prefix():
+    root, executor = make_executor()
+    gate = threading.Event()
+    executor.submit(lambda task: gate.wait())
+    # Раньше полоса None превращалась в строку "None" и совпадала с префиксом "N"
+    executor.wait("N")
+    assert executor.tasks
+    gate.set()
+    executor.shutdown()
+    assert not executor.tasks
+
+
+def test_errors_are_reported_to_on_error():
+    root, executor = make_executor()
+    errors = []
+
+    def fail(task):
+        raise OSError("нет места")
+
+    executor.submit(fail, lane="x", on_error=errors.append, description="Сохранение")
+    executor.wait("x")
+    assert [str(e) for e in errors] == ["нет места"]
+    assert executor.error[0] == "Сохранение"
+    executor.shutdown()
+
+
+def test_failing_callbacks_do_not_stop_polling():
+    root, executor = make_executor()
+    log = []
+    errors = []
+
+    def broken(value):
+        raise RuntimeError("сломанный обработчик")
+
+    executor.submit(lambda task: 1, lane="a", on_done=broken, on_error=errors.append, description="Первая")
+    executor.submit(lambda task: 2, lane="b", on_done=broken, description="Вторая")
+    executor.submit(lambda task: 3, lane="c", on_done=log.append)
+    while executor.tasks:
+        assert root.callbacks, "poll не перезапланирован, хотя задачи остались"
+        root.run_pending()
+    assert log == [3]
+    assert [str(e) for e in errors] == ["сломанный обработчик"]
+    assert executor.error is not None
+
+    # Исключение вне обработчиков (строка состояния закрытого окна) тоже не останавливает опрос
+    executor.submit(lambda task: 4, lane="d", on_done=log.append)
+
+    def broken_status(*args, **kwargs):
+        raise RuntimeError("окно закрыто")
+
+    executor.on_status = broken_status
+    while executor.tasks:
+        assert root.callbacks
+        try:
+            root.run_pending()
+        except RuntimeError:
+            pass
+    assert log == [3, 4]
+    executor.on_status = None
+    executor.shutdown()
+
+
+def test_after_waits_for_earlier_writes_of_the_prefix():
+    root, executor = make_executor()
+    gate = threading.Event()
+    files = {}
+    seen = []
+    executor.submit(lambda task: gate.wait(), lane="ws/data.bin")
+    executor.submit(lambda task: files.update(data=1), lane="ws/data.bin", key="save")
+    executor.submit(lambda task: dict(files), on_done=seen.append, after="ws/")
+    # Ещё не начатое сохранение заменяется новым, и чтение ждёт уже его
+    executor.submit(lambda task: files.update(data=2), lane="ws/data.bin", key="save")
+    # Отложенное чтение не мешает задачам других полос
+    executor.submit(lambda task: "other", lane="other/file", on_done=seen.append)
+    executor.wait("other/")
+    assert seen == ["other"]
+    gate.set()
+    executor.shutdown()
+    assert seen == ["other", {"data": 2}]
+    assert not executor.held
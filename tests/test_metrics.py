@@ -0,0 +1,113 @@
+import pytest
+
+from main import MetricsStore
+
+
+def make_store(tmp_path):
+    return MetricsStore(str(tmp_path / "metrics_data.npz"))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1.234,50", 1234.5),
+    ("1,234.50", 1234.5),
+    ("120,50", 120.5),
+    ("1.234.567", 1234567.0),
+    ("1,234,567", 1234567.0),
+    ("$ 19.99", 19.99),
+    ("1 234,5 €", 1234.5),
+    ("", None),
+    (None, None),
+])
+def test_number_parses_separators(text, expected):
+    assert MetricsStore._number(text) == expected
+
+
+def test_number_rejects_text():
+    with pytest.raises(ValueError):
+        MetricsStore._number("abc")
+
+
+def test_read_csv_reports_bad_rows(tmp_path):
+    path = tmp_path / "metrics.csv"
+    path.write_text("Project,Platform,Category,Sales,Price\n"
+                    "A,Envato,AET,5,\"1.234,50\"\n"
+                    "B,Envato,AET,abc,10\n"
+                    "C,Envato,AET,2,3\n", encoding="utf-8")
+    rows, rejected = MetricsStore.read_csv(str(path))
+    assert [row[0] for row in rows] == ["A", "C"]
+    assert rows[0][3] == {"sales": 5.0, "revenue": None, "price": 1234.5}
+    assert rejected == [(3, "неверное значение sales 'abc'")]
+
+
+def test_rename_platforms_swap(tmp_path):
+    store = make_store(tmp_path)
+    store.set("P", "Envato", "AET", sales=5)
+    store.set("P", "Pond5", "AET", sales=2)
+    store.set("P", "Motion Array", "AET", sales=7)
+    store.rename_platforms({"Envato": "Pond5", "Pond5": "Envato"})
+    assert store.cell_value("P", "Pond5", "AET", "sales") == 5.0
+    assert store.cell_value("P", "Envato", "AET", "sales") == 2.0
+    assert store.aggregate("sales", "platform") == {"Pond5": 5.0, "Envato": 2.0, "Motion Array": 7.0}
+
+    # Цепочка с объединением в уже существующее имя
+    store.rename_platforms({"Envato": "Motion Array", "Motion Array": "Storyblocks"})
+    assert store.aggregate("sales", "platform") == {"Pond5": 5.0, "Motion Array": 2.0, "Storyblocks": 7.0}
+    assert store.platform_value("P", "Storyblocks", "sales") == 7.0
+
+    store.save()
+    reloaded = make_store(tmp_path)
+    assert reloaded.cell_value("P", "Motion Array", "AET", "sales") == 2.0
+
+
+def test_platform_value_averages_price(tmp_path):
+    store = make_store(tmp_path)
+    store.set("P", "Envato", "AET", sales=3, price=20)
+    store.set("P", "Envato", "PPT", sales=1, price=10)
+    store.set("P", "Envato", "MGT", sales=1)
+    assert store.platform_value("P", "Envato", "price") == 15.0
+    assert store.platform_value("P", "Envato", "sales") == 5.0
+    assert store.max_value("price") == 20.0
+
+
+def test_platform_level_row_wins_over_categories(tmp_path):
+    store = make_store(tmp_path)
+    store.set("P", "Envato", "AET", sales=3, price=10)
+    store.set("P", "Envato", "PPT", sales=4, price=20)
+    assert store.platform_value("P", "Envato", "sales") == 7.0
+    assert store.platform_value("P", "Envato", "price") == 15.0
+
+    # Строка уровня платформы с заданными продажами — итог платформы; незаданная цена берётся из категорий
+    store.set("P", "Envato", None, sales=10)
+    store.set("Q", "Envato", "AET", sales=1)
+    assert store.platform_value("P", "Envato", "sales") == 10.0
+    assert store.platform_value("P", "Envato", "price") == 15.0
+    assert store.aggregate("sales", "platform") == {"Envato": 11.0}
+    assert store.aggregate("sales", "project") == {"P": 10.0, "Q": 1.0}
+    assert store.aggregate("sales", "category") == {"AET": 4.0, "PPT": 4.0, "": 10.0}
+    assert store.max_value("sales") == 10.0
+
+
+def test_remove_and_merge_project(tmp_path):
+    store = make_store(tmp_path)
+    store.set("A", "Envato", "AET", sales=5, item_id="a-1")
+    store.set("A", "Pond5", "AET", sales=2, price=9)
+    store.set("B", "Envato", "AET", sales=1, price=3, item_id="b-1")
+    store.set("C", "Envato", "AET", sales=8)
+
+    # A объединяется в B: значения B сохраняются, A заполняет незаданные
+    store.merge_project("A", "B")
+    assert store.cell_value("B", "Envato", "AET", "sales") == 1.0
+    assert store.cell_value("B", "Envato", "AET", "price") == 3.0
+    assert store.item_ids[store.rows[("B", "Envato", "AET")]] == "b-1"
+    assert store.cell_value("B", "Pond5", "AET", "price") == 9.0
+    assert not [key for key in store.rows if key[0] == "A"]
+    assert store.aggregate("sales", "project") == {"B": 3.0, "C": 8.0}
+
+    store.remove_project("B")
+    assert len(store) == 1
+    assert store.platform_value("C", "Envato", "sales") == 8.0
+    assert store.aggregate("sales", "platform") == {"Envato": 8.0}
+
+    store.save()
+    reloaded = make_store(tmp_path)
+    assert list(reloaded.rows) == [("C", "Envato", "AET")]
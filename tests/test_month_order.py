@@ -0,0 +1,49 @@
+import random
+
+from main import MonthOrder
+
+STATUSES = ["Uploaded", "Pending", "Not Uploaded", "Rejected"]
+
+
+def random_project(rng):
+    return {"year": rng.choice([2023, 2024]), "month": rng.choice([1, 2, None]),
+            "Envato": {category: {"status": rng.choice(STATUSES),
+                                  "date": rng.choice([f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}", None])}
+                       for category in rng.sample(["AET", "PPT", "MGT"], rng.randint(0, 3))}}
+
+
+def full_sort(projects, year, month, sort):
+    names = [name for name, data in projects.items() if (data.get('year'), data.get('month')) == (year, month)]
+    return sorted(names, key=lambda name: MonthOrder.sort_keys(name, projects[name])[sort])
+
+
+def check(order, projects):
+    for year in (2023, 2024):
+        for month in (1, 2):
+            for sort in MonthOrder.SORTS.values():
+                expected = full_sort(projects, year, month, sort)
+                assert order.page(year, month, sort, 0, 0) == (expected, len(expected))
+
+
+def test_incremental_updates_match_full_sort():
+    rng = random.Random(7)
+    projects = {f"P{i:03d}": random_project(rng) for i in range(200)}
+    order = MonthOrder().rebuild(projects)
+    check(order, projects)
+    for step in range(500):
+        name = f"P{rng.randrange(260):03d}"
+        if rng.random() < 0.1:
+            projects.pop(name, None)
+            order.update_project(name, None)
+        else:
+            projects[name] = random_project(rng)
+            order.update_project(name, projects[name])
+    check(order, projects)
+
+
+def test_page_slices_and_filters():
+    projects = {name: {"year": 2024, "month": 1} for name in "edcba"}
+    order = MonthOrder().rebuild(projects)
+    assert order.page(2024, 1, "name", 2, 2) == (["c", "d"], 5)
+    assert order.page(2024, 1, "name", 0, 2, predicate=lambda name: name in "bde") == (["b", "d"], 3)
+    assert order.page(2024, 2, "name", 0, 2) == ([], 0)
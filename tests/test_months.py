@@ -0,0 +1,56 @@
+import main
+
+
+def test_parse_month_accepts_numbers_and_names():
+    assert main.parse_month("3") == 3
+    assert main.parse_month(12) == 12
+    assert main.parse_month("March") == 3
+    assert main.parse_month("март") == 3
+    assert main.parse_month("13") is None
+    assert main.parse_month("") is None
+    assert main.parse_month(None) is None
+
+
+def test_month_index_orders_years_and_months_descending():
+    index = main.MonthIndex()
+    index.rebuild({
+        "a": {"year": 2023, "month": 5},
+        "b": {"year": 2024, "month": 1},
+        "c": {"year": 2024, "month": 11},
+        "d": {"year": 2024, "month": None},
+    })
+    assert index.years() == [2024, 2023]
+    assert index.months(2024) == [11, 1]
+    assert index.projects[(2024, 1)] == {"b"}
+
+    index.remove("b", 2024, 1)
+    assert index.months(2024) == [11]
+    index.add("e", 2023, 5)
+    assert index.projects[(2023, 5)] == {"a", "e"}
+
+
+def test_read_projects_csv_rejects_rows_without_month(tmp_path):
+    path = tmp_path / "import.csv"
+    path.write_text(
+        "Project,Year,Month,Platform,Category,Status,Date\n"
+        "Good,2024,March,Envato,AET,Uploaded,2024-03-01\n"
+        "BadMonth,2024,Smarch,Envato,AET,Pending,2024-03-01\n"
+        "BadYear,20x4,3,Envato,AET,Pending,2024-03-01\n",
+        encoding="utf-8")
+    rows, rejected = main.read_projects_csv(str(path))
+    assert rows == [("Good", 2024, 3, "Envato", "AET", "Uploaded", "2024-03-01")]
+    assert [line for line, _ in rejected] == [3, 4]
+
+
+def test_migrate_months_reports_unparsed_values():
+    projects = {
+        "a": {"year": 2024, "month": "March"},
+        "b": {"year": 2024, "month": "Smarch"},
+        "c": {"year": 2024, "month": 4},
+        "d": {"year": 2024, "month": "мартт"},
+    }
+    migrated, unparsed = main.migrate_months(projects)
+    assert migrated
+    assert unparsed == {"b": "Smarch", "d": "мартт"}
+    assert [projects[name]["month"] for name in "abcd"] == [3, None, 4, None]
+    assert main.migrate_months(projects) == (False, {})
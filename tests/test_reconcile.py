@@ -0,0 +1,51 @@
+from main import RECONCILE_PROFILES, NameIndex, Reconciler, normalize_name
+
+PLATFORMS = {"Adobe Stock": ["AET", "PPT", "MGT"], "Envato": ["AET", "PPT"]}
+
+
+def cell(status):
+    return {"status": status, "date": "2024-01-01"}
+
+
+def test_normalize_name_ignores_case_accents_and_punctuation():
+    assert normalize_name("Café — Logo_Reveal!") == "cafe logo reveal"
+
+
+def test_lookup_exact_then_fuzzy():
+    index = NameIndex(["Logo Reveal", "Glitch Titles", "Photo Slideshow"])
+    assert index.lookup("logo reveal") == [("Logo Reveal", 1.0)]
+    name, score = index.lookup("Glitch Title", threshold=0.6)[0]
+    assert name == "Glitch Titles" and score < 1.0
+    assert index.lookup("Something Else") == []
+    index.remove("Logo Reveal")
+    assert index.lookup("Logo Reveal") == []
+
+
+def test_empty_category_needs_a_single_working_cell():
+    projects = {
+        "Logo Reveal": {"year": 2024, "month": 1,
+                        "Adobe Stock": {"AET": cell("Not Uploaded"), "PPT": cell("Not Uploaded"),
+                                        "MGT": cell("Not Uploaded")}},
+        "Glitch Titles": {"year": 2024, "month": 1,
+                          "Adobe Stock": {"MGT": cell("Pending"), "AET": cell("Disabled")}},
+    }
+    reconciler = Reconciler(projects, PLATFORMS, RECONCILE_PROFILES["Adobe Stock"])
+    changes, unmatched = reconciler.propose("Adobe Stock", [("Logo Reveal", "Approved", ""),
+                                                            ("Glitch Titles", "Approved", "")])
+    # Для трёх ячеек строка неоднозначна; у второго проекта рабочая ячейка одна
+    assert changes == [("Glitch Titles", "MGT", "Pending", "Uploaded", "Glitch Titles", 1.0)]
+    assert unmatched == ["Logo Reveal"]
+
+
+def test_missing_cells_are_not_proposed():
+    projects = {
+        "Logo Reveal": {"year": 2024, "month": 1, "Envato": {"AET": cell("Pending")}},
+        "Glitch Titles": {"year": 2024, "month": 1},
+    }
+    reconciler = Reconciler(projects, PLATFORMS, RECONCILE_PROFILES["Envato"])
+    changes, unmatched = reconciler.propose("Envato", [("Logo Reveal", "Approved", "Premiere Pro"),
+                                                       ("Logo Reveal", "Approved", "After Effects"),
+                                                       ("Glitch Titles", "Approved", "After Effects"),
+                                                       ("Unknown", "Approved", "After Effects")])
+    assert changes == [("Logo Reveal", "AET", "Pending", "Uploaded", "Logo Reveal", 1.0)]
+    assert unmatched == ["Unknown"]
@@ -0,0 +1,36 @@
+import json
+
+from main import generate_reports, report_hash
+
+STATUS_COLORS = {"Uploaded": "#90EE90", "Not Uploaded": "#FFB6C1"}
+
+
+def month(status):
+    return {"P": {"year": 2024, "month": 1, "Envato": {"AET": {"status": status, "date": "2024-01-01"}},
+                  "Pond5": {"AET": {"status": status, "date": "2024-01-01"}}}}
+
+
+def test_report_hash_depends_on_platform_order():
+    projects = month("Uploaded")
+    forward = report_hash(projects, {"Envato": ["AET"], "Pond5": ["AET"]}, STATUS_COLORS)
+    backward = report_hash(projects, {"Pond5": ["AET"], "Envato": ["AET"]}, STATUS_COLORS)
+    assert forward != backward
+    assert forward == report_hash(month("Uploaded"), {"Envato": ["AET"], "Pond5": ["AET"]}, STATUS_COLORS)
+
+
+def test_failed_month_keeps_finished_work(tmp_path):
+    platforms = {"Envato": ["AET"], "Pond5": ["AET"]}
+    # Платформа без словаря категорий ломает отрисовку только своего месяца
+    broken = {"Q": {"year": 2024, "month": 2, "Envato": None}}
+    months = {(2024, 1): month("Uploaded"), (2024, 2): broken}
+    rendered, total, errors = generate_reports(months, platforms, STATUS_COLORS, str(tmp_path), max_workers=2)
+    assert (rendered, total) == (1, 2)
+    assert [key for key, _ in errors] == ["2024-02"]
+    cache = json.loads((tmp_path / "report_cache.json").read_text(encoding="utf-8"))
+    assert list(cache) == ["2024-01"]
+    assert (tmp_path / "2024-01.html").exists()
+
+    # Неизменённый месяц берётся из кэша, упавший пробуется снова
+    months[(2024, 2)] = month("Not Uploaded")
+    rendered, total, errors = generate_reports(months, platforms, STATUS_COLORS, str(tmp_path), max_workers=2)
+    assert (rendered, total, errors) == (1, 2, [])
@@ -0,0 +1,93 @@
+from main import MetricsStore, SchemaMigration, StatusHistory
+
+
+def cell(status):
+    return {"status": status, "date": "2024-01-01"}
+
+
+def swap(migration):
+    # Envato → X, Pond5 → Envato, X → Pond5
+    migration.rename_platform("Envato", "X")
+    migration.rename_platform("Pond5", "Envato")
+    migration.rename_platform("X", "Pond5")
+
+
+def test_swap_mapping_and_projects():
+    migration = SchemaMigration({"Envato": ["AET"], "Pond5": ["AET"]}, {"Envato": "#111111", "Pond5": "#222222"})
+    swap(migration)
+    assert migration.platform_mapping() == {"Envato": "Pond5", "Pond5": "Envato"}
+    assert list(migration.platform_categories) == ["Pond5", "Envato"]
+    assert migration.platform_colors == {"Pond5": "#111111", "Envato": "#222222"}
+    projects = {"P": {"year": 2024, "month": 1, "Envato": {"AET": cell("Uploaded")},
+                      "Pond5": {"AET": cell("Rejected")}}}
+    migrated = migration.apply_to_projects(projects, ["Envato", "Pond5"])
+    assert migrated["P"]["Pond5"]["AET"]["status"] == "Uploaded"
+    assert migrated["P"]["Envato"]["AET"]["status"] == "Rejected"
+
+
+def test_chained_rename_removal_and_categories():
+    migration = SchemaMigration({"A": ["AET"], "B": ["AET", "PPT"], "C": ["MGT"]}, {})
+    migration.rename_platform("B", "D")
+    migration.rename_platform("A", "B")
+    migration.remove_platform("C")
+    migration.remove_category("D", "PPT")
+    migration.add_category("B", "MGT")
+    assert migration.platform_mapping() == {"A": "B", "B": "D"}
+    projects = {"P": {"year": 2024, "month": 1, "A": {"AET": cell("Uploaded")},
+                      "B": {"AET": cell("Pending"), "PPT": cell("Pending")}, "C": {"MGT": cell("Uploaded")}}}
+    migrated = migration.apply_to_projects(projects, ["A", "B", "C"])["P"]
+    assert set(migrated) == {"year", "month", "B", "D"}
+    assert migrated["B"]["AET"]["status"] == "Uploaded"
+    assert migrated["B"]["MGT"]["status"] == "Not Uploaded"
+    assert migrated["D"] == {"AET": cell("Pending")}
+
+
+def test_status_history_rename_platforms_swap_and_chain(tmp_path):
+    history = StatusHistory(str(tmp_path / "history.bin"), str(tmp_path / "names.jsonl"))
+    history.record("P", "Envato", "AET", None, "Uploaded", 100)
+    history.record("P", "Pond5", "AET", None, "Rejected", 200)
+    history.record("P", "Motion Array", "AET", None, "Pending", 300)
+    history.rename_platforms({"Envato": "Pond5", "Pond5": "Envato"})
+    assert [status for _, status, _ in history.cell_history("P", "Pond5", "AET")] == ["Uploaded"]
+    assert [status for _, status, _ in history.cell_history("P", "Envato", "AET")] == ["Rejected"]
+
+    history.rename_platforms({"Envato": "Motion Array", "Motion Array": "Storyblocks"})
+    assert [status for _, status, _ in history.cell_history("P", "Motion Array", "AET")] == ["Rejected"]
+    assert [status for _, status, _ in history.cell_history("P", "Storyblocks", "AET")] == ["Pending"]
+
+    reloaded = StatusHistory(history.path, history.names_path)
+    assert sorted(reloaded.cells) == [("P", "Motion Array", "AET"), ("P", "Pond5", "AET"),
+                                      ("P", "Storyblocks", "AET")]
+
+
+def test_removed_platform_data_does_not_reappear_under_reused_name(tmp_path):
+    # Envato удаляется, затем Pond5 переименовывается в освободившееся имя Envato
+    migration = SchemaMigration({"Envato": ["AET"], "Pond5": ["AET"]}, {})
+    migration.remove_platform("Envato")
+    migration.rename_platform("Pond5", "Envato")
+    renames = {origin: name for origin, name in migration.platform_mapping().items() if origin != name}
+    renames.update((platform, None) for platform in migration.removed_platforms(["Envato", "Pond5"]))
+    assert renames == {"Pond5": "Envato", "Envato": None}
+
+    history = StatusHistory(str(tmp_path / "history.bin"), str(tmp_path / "names.jsonl"))
+    history.record("P", "Envato", "AET", None, "Uploaded", 100)
+    history.record("P", "Pond5", "AET", None, "Rejected", 200)
+    metrics = MetricsStore(str(tmp_path / "metrics.npz"))
+    metrics.set("P", "Envato", "AET", sales=5, revenue=50)
+    metrics.set("P", "Pond5", "AET", sales=2, revenue=20)
+    metrics.set("Q", "Pond5", "", sales=1)
+
+    history.rename_platforms(renames)
+    metrics.rename_platforms(renames)
+
+    assert [status for _, status, _ in history.cell_history("P", "Envato", "AET")] == ["Rejected"]
+    assert metrics.aggregate("sales", "platform") == {"Envato": 3.0}
+    assert metrics.cell_value("P", "Envato", "AET", "revenue") == 20.0
+    assert metrics.platform_value("Q", "Envato", "sales") == 1.0
+    assert len(metrics) == 2
+
+    history.flush()
+    metrics.save()
+    reloaded = StatusHistory(history.path, history.names_path)
+    assert [status for _, status, _ in reloaded.cell_history("P", "Envato", "AET")] == ["Rejected"]
+    assert MetricsStore(metrics.path).aggregate("sales", "platform") == {"Envato": 3.0}
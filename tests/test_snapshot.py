@@ -0,0 +1,127 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from main import ProjectSnapshot
+
+
+def sample_projects():
+    return {
+        "Logo Reveal": {
+            "year": 2024, "month": 3,
+            "Envato": {"AET": {"status": "Uploaded", "date": "2024-03-02"},
+                       "PPT": {"status": None, "date": None}},
+            "Pond5": {},
+        },
+        "Слайдшоу": {"year": None, "month": None, "Envato": {"AET": {"status": "Pending", "date": "2024-01-05"}}},
+    }
+
+
+def read(path):
+    with ProjectSnapshot(str(path)) as snapshot:
+        return snapshot.to_projects()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "projects_data.bin"
+    ProjectSnapshot.write(str(path), sample_projects())
+    assert read(path) == sample_projects()
+
+
+def test_many_distinct_dates(tmp_path):
+    # Даты хранятся в отдельной таблице и не упираются в 16-битные коды строк
+    projects = {f"P{i}": {"year": 2024, "month": 1,
+                          "Envato": {"AET": {"status": "Uploaded", "date": f"{i:08d}"}}}
+                for i in range(70000)}
+    path = tmp_path / "projects_data.bin"
+    ProjectSnapshot.write(str(path), projects)
+    assert read(path) == projects
+
+
+def test_corrupted_payload_is_rejected(tmp_path):
+    path = tmp_path / "projects_data.bin"
+    data = bytearray(ProjectSnapshot.encode(sample_projects()))
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="Контрольная сумма"):
+        ProjectSnapshot(str(path))
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = tmp_path / "projects_data.bin"
+    path.write_bytes(ProjectSnapshot.encode(sample_projects())[:-5])
+    with pytest.raises(ValueError, match="обрезан"):
+        ProjectSnapshot(str(path))
+
+
+def test_reads_version_1(tmp_path):
+    # Версия 1: даты в общей таблице строк, ячейки по 8 байт
+    symbols = [b"Envato", b"AET", b"Uploaded", b"2024-03-02"]
+    names = ["Logo Reveal".encode()]
+    projects = np.zeros(1, dtype=ProjectSnapshot.PROJECT_DTYPE)
+    projects[0] = (2024, 3, 0, 0, 1)
+    cells = np.array([(0, 1, 2, 3)], dtype=ProjectSnapshot.CELL_DTYPES[1])
+    name_offsets = np.array([0, len(names[0])], dtype='<u4')
+    symbol_offsets = np.concatenate([[0], np.cumsum([len(s) for s in symbols])]).astype('<u4')
+    payload = b''.join([struct.pack('<IIII', 1, len(symbols), 1, 1), name_offsets.tobytes(),
+                        symbol_offsets.tobytes(), projects.tobytes(), cells.tobytes(),
+                        b''.join(names), b''.join(symbols)])
+    path = tmp_path / "projects_data.bin"
+    path.write_bytes(struct.pack('<4sHHII', b'STPS', 1, 0, len(payload), zlib.crc32(payload)) + payload)
+    assert read(path) == {"Logo Reveal": {"year": 2024, "month": 3,
+                                          "Envato": {"AET": {"status": "Uploaded", "date": "2024-03-02"}}}}
+
+
+def make_tracker(tmp_path):
+    from types import SimpleNamespace
+
+    from main import BackupStore, MonthIndex, ProjectTracker
+
+    saves = []
+    tracker = SimpleNamespace(
+        projects={}, month_index=MonthIndex(), backups=BackupStore(str(tmp_path / "backups")),
+        data_path=lambda filename: str(tmp_path / filename), rebuild_status_cache=lambda: None,
+        save_data=lambda: saves.append(True), io_executor=None, workspace_dir=str(tmp_path),
+        read_projects_files=ProjectTracker.read_projects_files)
+    return tracker, saves
+
+
+def test_corrupt_snapshot_falls_back_to_latest_backup(tmp_path, monkeypatch):
+    import json
+
+    import main
+
+    warnings = []
+    monkeypatch.setattr(main.messagebox, "showwarning", lambda title, message: warnings.append(message))
+    tracker, saves = make_tracker(tmp_path)
+    current = sample_projects()
+    index = main.MonthIndex()
+    index.rebuild(current)
+    tracker.backups.snapshot(current, index, {"platform_categories": {}, "platform_colors": {}}, force=True)
+    (tmp_path / "projects_data.json").write_text(json.dumps({"Old": {"year": 2020, "month": 1}}), encoding="utf-8")
+    (tmp_path / "projects_data.bin").write_bytes(b"STPS broken")
+
+    main.ProjectTracker.load_data(tracker)
+    assert tracker.projects == current
+    assert (tmp_path / "projects_data.bin.corrupt").exists()
+    assert not saves
+    assert "резервная копия" in warnings[0]
+
+
+def test_corrupt_snapshot_without_backups_warns_about_stale_json(tmp_path, monkeypatch):
+    import json
+
+    import main
+
+    warnings = []
+    monkeypatch.setattr(main.messagebox, "showwarning", lambda title, message: warnings.append(message))
+    tracker, saves = make_tracker(tmp_path)
+    (tmp_path / "projects_data.json").write_text(json.dumps({"Old": {"year": 2020, "month": 1}}), encoding="utf-8")
+    (tmp_path / "projects_data.bin").write_bytes(b"STPS broken")
+
+    main.ProjectTracker.load_data(tracker)
+    assert list(tracker.projects) == ["Old"]
+    assert not saves
+    assert "устаревшим" in warnings[0]
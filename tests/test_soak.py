@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import sys
+import time
+import tkinter as tk
+
+import pytest
+
+from main import ProjectTracker, prepare_soak_directory, run_soak
+
+
+def test_soak_runs_on_a_copy_of_the_active_workspace(tmp_path, monkeypatch):
+    app_dir = tmp_path / "app"
+    workspace = tmp_path / "client"
+    (workspace / "backups").mkdir(parents=True)
+    app_dir.mkdir()
+    (workspace / "projects_data.bin").write_bytes(b"data")
+    (workspace / "settings.json").write_text(json.dumps({"year_states": {"2024": True}}), encoding="utf-8")
+    app_settings = {"status_filter": "Pending", "workspaces": [str(app_dir), str(workspace)],
+                    "active_workspace": str(workspace), "year_states": {"2023": False}}
+    (app_dir / "settings.json").write_text(json.dumps(app_settings), encoding="utf-8")
+    monkeypatch.chdir(app_dir)
+
+    directory = prepare_soak_directory()
+    try:
+        assert os.getcwd() == directory
+        assert sorted(os.listdir(directory)) == ["projects_data.bin", "settings.json"]
+        with open(os.path.join(directory, "settings.json"), encoding="utf-8") as file:
+            settings = json.load(file)
+        assert settings == {"year_states": {"2024": True}, "status_filter": "Pending",
+                            "workspaces": [], "active_workspace": None}
+        # Исходные файлы не изменились
+        assert json.loads((app_dir / "settings.json").read_text(encoding="utf-8")) == app_settings
+    finally:
+        os.chdir(tmp_path)
+        shutil.rmtree(directory)
+
+
+def test_soak_iterations_keep_tcl_counts_flat(tmp_path, monkeypatch):
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("нет дисплея для Tk")
+    cell = {"status": "Pending", "date": "2024-01-05"}
+    projects = {f"Project {i}": {"year": 2024, "month": 1 + i % 2, "Envato": {"AET": dict(cell), "PPT": dict(cell)},
+                                 "Pond5": {"AET": dict(cell, status="Uploaded")}}
+                for i in range(6)}
+    (tmp_path / "projects_data.json").write_text(json.dumps(projects), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    directory = prepare_soak_directory()
+    try:
+        app = ProjectTracker(root)
+        # Отложенная загрузка настроек не должна попасть в замеры
+        started = time.monotonic()
+        while time.monotonic() - started < 0.5:
+            root.update()
+
+        # Учитываются только замеры самого прогона, а не периодические замеры окна диагностики
+        samples = []
+        sample = app.diagnostics.sample
+
+        def record():
+            result = sample()
+            if sys._getframe(1).f_code is run_soak.__code__:
+                samples.append(result)
+            return result
+
+        monkeypatch.setattr(app.diagnostics, "sample", record)
+        warmup = 2
+        assert run_soak(app, 5, warmup=warmup)
+        after_warmup = samples[warmup - 1:]
+        for metric in ("widgets", "toplevels", "variables"):
+            assert {sample[metric] for sample in after_warmup} == {after_warmup[0][metric]}, metric
+        # Команды Tcl — с тем же запасом на ожидающие вызовы after, что и в run_soak
+        commands = [sample["commands"] for sample in after_warmup]
+        assert max(commands) - commands[0] <= 10
+        app.io_executor.shutdown()
+    finally:
+        root.destroy()
+        os.chdir(tmp_path)
+        shutil.rmtree(directory, ignore_errors=True)
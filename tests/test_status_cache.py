@@ -0,0 +1,108 @@
+from collections import Counter
+from types import MethodType, SimpleNamespace
+
+from main import (AgingIndex, BackupStore, MetricsStore, MonthIndex, MonthOrder, NameIndex, ProjectTracker,
+                  StatusHistory)
+
+PLATFORMS = {"Envato": ["AET", "PPT"], "Pond5": ["AET"]}
+
+
+def cell(status, date="2024-01-01"):
+    return {"status": status, "date": date}
+
+
+def make_tracker(tmp_path, projects):
+    tracker = SimpleNamespace(
+        projects=projects, platform_categories=PLATFORMS, status_cache={}, status_totals=Counter(),
+        status_history=StatusHistory(str(tmp_path / "history.bin"), str(tmp_path / "names.jsonl")),
+        aging_index=AgingIndex(), month_order=MonthOrder(), month_index=MonthIndex(), name_index=NameIndex(),
+        backups=BackupStore(str(tmp_path / "backups")), metrics=MetricsStore(str(tmp_path / "metrics.npz")),
+        save_data=lambda: None, update_matrix=lambda: None, update_statistics=lambda: None)
+    for name in ("_refresh_summary", "refresh_project_summaries", "rebuild_status_cache", "_touch_project",
+                 "_set_cell_status", "_record_transition", "merge_projects", "get_platform_status"):
+        setattr(tracker, name, MethodType(getattr(ProjectTracker, name), tracker))
+    for name, data in projects.items():
+        tracker.month_index.add(name, data.get('year'), data.get('month'))
+    tracker.rebuild_status_cache()
+    return tracker
+
+
+def baseline_status(statuses):
+    # Правила сводного статуса до появления кэша
+    if all(status == "Uploaded" for status in statuses):
+        return "Uploaded"
+    if any(status == "Rejected" for status in statuses):
+        return "Rejected"
+    if any(status == "Pending" for status in statuses):
+        return "Pending"
+    if all(status == "Disabled" for status in statuses):
+        return "Disabled"
+    return "Not Uploaded"
+
+
+def assert_matches_recount(tracker):
+    totals = Counter()
+    for project, project_data in tracker.projects.items():
+        for platform, categories in project_data.items():
+            if platform in ['year', 'month']:
+                continue
+            counts = Counter(details['status'] for details in categories.values())
+            totals.update(counts)
+            summary = tracker.status_cache[project][platform]
+            assert +summary[1] == counts
+            if platform in PLATFORMS:
+                statuses = [categories.get(category, {}).get('status', "Not Uploaded")
+                            for category in PLATFORMS[platform]]
+                assert summary[0] == baseline_status(statuses)
+        assert set(tracker.status_cache.get(project, {})) == set(project_data) - {'year', 'month'}
+    assert set(tracker.status_cache) <= set(tracker.projects)
+    assert +tracker.status_totals == totals
+
+
+def test_cache_counts_stored_cells_only(tmp_path):
+    # Недостающая категория делает сводный статус "Not Uploaded", но в итоги не попадает;
+    # категории и платформы вне схемы учитываются в итогах
+    projects = {"A": {"year": 2024, "month": 1, "Envato": {"AET": cell("Uploaded"), "Old": cell("Rejected")},
+                      "Legacy": {"X": cell("Pending")}}}
+    tracker = make_tracker(tmp_path, projects)
+    assert +tracker.status_totals == Counter({"Uploaded": 1, "Rejected": 1, "Pending": 1})
+    assert tracker.get_platform_status("A", "Envato") == "Not Uploaded"
+    assert_matches_recount(tracker)
+
+
+def test_cache_matches_recount_after_add_edit_delete_and_merge(tmp_path):
+    tracker = make_tracker(tmp_path, {})
+
+    # Добавление проекта с платформой вне схемы
+    tracker.projects["A"] = {"year": 2024, "month": 1, "Legacy": {"X": cell("Pending")},
+                             "Envato": {"AET": cell("Uploaded"), "PPT": cell("Uploaded")}}
+    tracker.refresh_project_summaries("A")
+    assert tracker.get_platform_status("A", "Envato") == "Uploaded"
+    assert_matches_recount(tracker)
+
+    # Перезапись при добавлении: платформа вне схемы исчезает
+    tracker.projects["A"] = {"year": 2024, "month": 1, "Envato": {"AET": cell("Not Uploaded")}}
+    tracker.refresh_project_summaries("A")
+    assert_matches_recount(tracker)
+
+    # Редактирование: новая платформа, у Envato добавлена категория
+    tracker.projects["A"]["Pond5"] = {"AET": cell("Rejected")}
+    tracker.projects["A"]["Envato"]["PPT"] = cell("Pending")
+    tracker.refresh_project_summaries("A")
+    assert_matches_recount(tracker)
+
+    # Объединение: ячейки B переносятся в A, B удаляется вместе с платформой вне схемы
+    tracker.projects["B"] = {"year": 2024, "month": 1, "Legacy": {"X": cell("Uploaded", "2024-02-01")},
+                             "Envato": {"AET": cell("Uploaded", "2024-02-01")}}
+    tracker.month_index.add("B", 2024, 1)
+    tracker.refresh_project_summaries("B")
+    tracker.merge_projects("A", ["B"])
+    assert "B" not in tracker.status_cache
+    assert tracker.projects["A"]["Envato"]["AET"]["status"] == "Uploaded"
+    assert_matches_recount(tracker)
+
+    # Удаление
+    del tracker.projects["A"]
+    tracker.refresh_project_summaries("A")
+    assert tracker.status_cache == {}
+    assert +tracker.status_totals == Counter()
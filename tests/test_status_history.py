@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import numpy as np
+
+from main import StatusHistory
+
+
+def make_history(tmp_path):
+    return StatusHistory(str(tmp_path / "history.bin"), str(tmp_path / "names.jsonl"))
+
+
+def ts(day, hour=0):
+    return datetime(2024, 1, day, hour).timestamp()
+
+
+def test_backdated_records_keep_their_time(tmp_path):
+    history = make_history(tmp_path)
+    history.record("A", "Steam", "Store", None, "Pending", ts(10))
+    history.record("A", "Steam", "Store", "Pending", "Uploaded", ts(3))
+    times = [when for _, _, when in history.cell_history("A", "Steam", "Store")]
+    assert times == [datetime(2024, 1, 3), datetime(2024, 1, 10)]
+
+
+def test_transitions_per_week_with_out_of_order_records(tmp_path):
+    history = make_history(tmp_path)
+    history.record("A", "Steam", "Store", None, "Pending", ts(20))
+    history.record("B", "Steam", "Store", None, "Pending", ts(2))
+    history.record("C", "Steam", "Store", None, "Pending", ts(22))
+    weeks = history.transitions_per_week(start=datetime(2024, 1, 15))
+    assert sum(weeks.values()) == 2
+
+
+def test_time_in_status_orders_by_time_and_closes_open_intervals(tmp_path):
+    history = make_history(tmp_path)
+    # Переход записан раньше, чем вход в статус, но по времени он позже
+    history.record("A", "Steam", "Store", "Pending", "Uploaded", ts(5))
+    history.record("A", "Steam", "Store", None, "Pending", ts(1))
+    history.record("B", "Steam", "Store", None, "Pending", ts(2))
+    durations = history.time_in_status("Pending", now=datetime(2024, 1, 9))
+    assert sorted(durations // 86400) == [4, 7]
+
+
+def test_time_in_status_filters_platform(tmp_path):
+    history = make_history(tmp_path)
+    history.record("A", "Steam", "Store", None, "Pending", ts(1))
+    history.record("A", "Itch", "Store", None, "Pending", ts(1))
+    durations = history.time_in_status("Pending", platform="Itch", now=datetime(2024, 1, 2))
+    assert list(durations) == [86400]
+
+
+def test_flush_and_reload(tmp_path):
+    history = make_history(tmp_path)
+    history.record("A", "Steam", "Store", None, "Pending", ts(4))
+    history.record("A", "Steam", "Store", "Pending", "Uploaded", ts(1))
+    history.flush()
+    reloaded = make_history(tmp_path)
+    assert len(reloaded.records) == 2
+    assert np.array_equal(reloaded.records, history._columns())
+    assert [status for _, status, _ in reloaded.cell_history("A", "Steam", "Store")] == ["Uploaded", "Pending"]
+
+
+def test_tracker_records_resets_and_backfills(tmp_path):
+    from types import SimpleNamespace
+
+    from main import ProjectTracker, SchemaMigration
+
+    tracker = SimpleNamespace(status_history=make_history(tmp_path))
+    # Замена проекта: Uploaded -> Not Uploaded; без изменения статуса записи нет
+    ProjectTracker._record_transition(tracker, "A", "Steam", "Store", "Uploaded", "Not Uploaded")
+    ProjectTracker._record_transition(tracker, "A", "Steam", "Bundle", "Not Uploaded", "Not Uploaded")
+    ProjectTracker._record_transition(tracker, "A", "Itch", "Store", None, "Pending", "2024-01-03")
+    assert [(old, new) for old, new, _ in tracker.status_history.cell_history("A", "Steam", "Store")] == \
+        [("Uploaded", "Not Uploaded")]
+    assert tracker.status_history.cell_history("A", "Steam", "Bundle") == []
+    assert tracker.status_history.cell_history("A", "Itch", "Store")[0][2] == datetime(2024, 1, 3)
+
+    # Схема сообщает, какие ячейки она добавила
+    migration = SchemaMigration({"Steam": ["Store"]}, {})
+    migration.add_category("Steam", "Bundle")
+    added = []
+    migration.apply_to_projects({"A": {"year": 2024, "month": 1, "Steam": {"Store": {"status": "Uploaded"}}}},
+                                ["Steam"], added)
+    assert added == [("A", "Steam", "Bundle")]
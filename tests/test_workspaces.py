@@ -0,0 +1,46 @@
+import os
+from collections import Counter
+
+from main import MergedProjectsView, WorkspaceManager, workspace_labels
+
+
+def fake_loader(loaded):
+    def loader(workspace):
+        loaded.append(workspace.path)
+        name = os.path.basename(os.path.dirname(workspace.path))
+        workspace.state = {'projects': {f"{name} project": {"year": 2024, "month": 1}},
+                           'status_totals': Counter({"Uploaded": len(name)})}
+    return loader
+
+
+def test_workspace_labels_disambiguate_same_folder_names(tmp_path):
+    a, b, c = (str(tmp_path / "client" / "data"), str(tmp_path / "home" / "data"), str(tmp_path / "other"))
+    labels = workspace_labels([a, b, c])
+    assert labels == {a: os.path.join("client", "data"), b: os.path.join("home", "data"), c: "other"}
+
+
+def test_merged_view_keys_by_path(tmp_path):
+    loaded = []
+    manager = WorkspaceManager(fake_loader(loaded))
+    paths = [str(tmp_path / "client" / "data"), str(tmp_path / "home" / "data")]
+    view = manager.merged_view(paths)
+    assert len(view) == 2
+    assert sorted(view) == sorted([(paths[0], "client project"), (paths[1], "home project")])
+    assert view[(paths[1], "home project")]["year"] == 2024
+    totals = view.status_totals()
+    assert totals[paths[0]] == Counter({"Uploaded": 6}) and totals[paths[1]] == Counter({"Uploaded": 4})
+    assert totals[None] == Counter({"Uploaded": 10})
+    assert isinstance(view, MergedProjectsView)
+
+
+def test_merged_view_does_not_touch_the_cache(tmp_path):
+    loaded = []
+    manager = WorkspaceManager(fake_loader(loaded), capacity=2)
+    active = manager.get(str(tmp_path / "active" / "data"))
+    manager.active = active
+    recent = manager.get(str(tmp_path / "recent" / "data"))
+    order = list(manager.cache)
+    manager.merged_view([active.path, recent.path, str(tmp_path / "third" / "data")])
+    assert list(manager.cache) == order
+    # Уже открытые пространства не перечитываются
+    assert loaded.count(active.path) == 1 and loaded.count(recent.path) == 1